@@ -0,0 +1,266 @@
+"""
+ASGI Server Mode
+Serves the same /mcp/v1/tools, /mcp/v1/invoke and /mcp/v1/invoke/batch
+contract as the Flask app from an asyncio event loop. Tool handlers, which
+block on the synchronous LinkedIn client, run in a bounded thread pool so
+that many concurrent agent sessions share a fixed number of threads.
+
+Run with: python server.py --asgi  (or: uvicorn asgi:app --port 8080)
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import json_codec
+import server
+from metrics import CONTENT_TYPE
+from batch import BatchError, batch_item, batch_response, parse_batch_request, run_call
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_MAX_CONCURRENCY = 1000
+
+JSON_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"access-control-allow-origin", b"*"),
+]
+
+NDJSON_HEADERS = [
+    (b"content-type", b"application/x-ndjson"),
+    (b"access-control-allow-origin", b"*"),
+]
+
+# Methods flask_cors allows by default, answered to CORS preflight requests
+CORS_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+ROUTES = {
+    "/mcp/v1/tools": "GET",
+    "/mcp/v1/invoke": "POST",
+    "/mcp/v1/invoke/batch": "POST",
+    "/metrics": "GET",
+    "/metrics/slow_calls": "GET",
+    "/mcp/v1/prefetch": "GET",
+    "/mcp/v1/ready": "GET",
+}
+
+
+async def read_body(receive):
+    """Read the full HTTP request body from an ASGI receive channel"""
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def request_header(scope, name):
+    """Return a request header from an ASGI scope as a string, or None"""
+    name = name.lower().encode("latin-1")
+    for key, value in scope.get("headers", ()):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def send_body(send, body, status_code=200, accept_encoding=None):
+    """Send an already serialized JSON body, compressed when large and accepted"""
+    body, encoding = json_codec.encode_body(body, accept_encoding)
+    headers = JSON_HEADERS + [(b"content-length", str(len(body)).encode("ascii")), (b"vary", b"Accept-Encoding")]
+    if encoding:
+        headers.append((b"content-encoding", encoding.encode("ascii")))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_json(send, payload, status_code=200, accept_encoding=None):
+    """Send a complete JSON response on an ASGI send channel"""
+    await send_body(send, json_codec.dumps(payload), status_code, accept_encoding)
+
+
+async def send_preflight(scope, send, allowed_method):
+    """Answer an OPTIONS request with the CORS headers flask_cors sends"""
+    origin = request_header(scope, "origin")
+    headers = [
+        (b"allow", f"OPTIONS, {allowed_method}".encode("latin-1")),
+        (b"access-control-allow-origin", origin.encode("latin-1") if origin else b"*"),
+        (b"access-control-allow-methods", CORS_ALLOW_METHODS),
+        (b"content-length", b"0"),
+    ]
+    requested_headers = request_header(scope, "access-control-request-headers")
+    if requested_headers:
+        headers.append((b"access-control-allow-headers", requested_headers.encode("latin-1")))
+    if origin:
+        headers.append((b"vary", b"Origin"))
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class MCPAsgiApp:
+    """ASGI application exposing the MCP endpoints"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 run_startup=True):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.run_startup = run_startup
+        self._executor = None
+        self._semaphore = None
+
+    def _configure(self):
+        asgi_config = server.config.get("asgi") or {}
+        self.max_workers = asgi_config.get("max_workers", self.max_workers)
+        self.max_concurrency = asgi_config.get("max_concurrency", self.max_concurrency)
+
+    def _ensure_started(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="mcp-upstream")
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def run_tool(self, tool_name, parameters):
+        """Run a tool handler in the bounded executor and return (payload, status_code)"""
+        self._ensure_started()
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, server.dispatch_tool, tool_name, parameters)
+
+    async def iter_batch(self, calls, max_parallelism):
+        """Yield batch items in completion order, running at most max_parallelism calls at once"""
+        self._ensure_started()
+        limit = asyncio.Semaphore(max_parallelism)
+        loop = asyncio.get_running_loop()
+
+        async def run_one(index, call):
+            async with limit, self._semaphore:
+                payload, status_code = await loop.run_in_executor(
+                    self._executor, run_call, server.dispatch_tool, call)
+            return batch_item(index, call, payload, status_code)
+
+        tasks = [asyncio.ensure_future(run_one(index, call)) for index, call in enumerate(calls)]
+        for next_item in asyncio.as_completed(tasks):
+            yield await next_item
+
+    async def _get_tools(self, scope, send, accept_encoding):
+        manifest = server.TOOL_MANIFEST
+        headers = [(b"etag", manifest.etag.encode("ascii")), (b"cache-control", b"no-cache")]
+        if json_codec.etag_matches(request_header(scope, "if-none-match"), manifest.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        body, encoding = manifest.encoded(accept_encoding)
+        headers += [(b"content-length", str(len(body)).encode("ascii")), (b"vary", b"Accept-Encoding")]
+        if encoding:
+            headers.append((b"content-encoding", encoding.encode("ascii")))
+        await send({"type": "http.response.start", "status": 200, "headers": JSON_HEADERS + headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _invoke_batch(self, receive, send, accept_encoding=None):
+        try:
+            request_data = json_codec.loads(await read_body(receive))
+            calls, max_parallelism, stream = parse_batch_request(request_data, server.config.get("batch"))
+        except (ValueError, BatchError) as e:
+            await send_json(send, {"error": str(e), "status": "error"}, 400)
+            return
+
+        if not stream:
+            items = [item async for item in self.iter_batch(calls, max_parallelism)]
+            await send_json(send, batch_response(items), accept_encoding=accept_encoding)
+            return
+
+        await send({"type": "http.response.start", "status": 200, "headers": NDJSON_HEADERS})
+        async for item in self.iter_batch(calls, max_parallelism):
+            await send({"type": "http.response.body", "body": json_codec.dumps(item) + b"\n",
+                        "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _invoke_stream(self, send, tool_name, parameters):
+        self._ensure_started()
+        items, status_code = server.stream_tool(tool_name, parameters)
+        loop = asyncio.get_running_loop()
+        done = object()
+        await send({"type": "http.response.start", "status": status_code, "headers": NDJSON_HEADERS})
+        async with self._semaphore:
+            while True:
+                # Each item may wait on an upstream page, so pull it in the executor
+                item = await loop.run_in_executor(self._executor, next, items, done)
+                if item is done:
+                    break
+                await send({"type": "http.response.body", "body": json_codec.dumps(item) + b"\n",
+                            "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.run_startup:
+                    server.startup()
+                    self._configure()
+                self._ensure_started()
+                logger.info(f"ASGI server ready (max_workers={self.max_workers}, "
+                            f"max_concurrency={self.max_concurrency})")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"]
+        method = scope["method"]
+
+        accept_encoding = request_header(scope, "accept-encoding")
+
+        if method == "OPTIONS" and path in ROUTES:
+            await send_preflight(scope, send, ROUTES[path])
+        elif path == "/mcp/v1/tools" and method == "GET":
+            await self._get_tools(scope, send, accept_encoding)
+        elif path == "/mcp/v1/invoke" and method == "POST":
+            try:
+                request_data = json_codec.loads(await read_body(receive))
+            except ValueError:
+                await send_json(send, {"error": "Invalid JSON body", "status": "error"}, 400)
+                return
+            if not isinstance(request_data, dict):
+                await send_json(send, {"error": "Request body must be a JSON object", "status": "error"}, 400)
+                return
+            if request_data.get("stream"):
+                await self._invoke_stream(send, request_data.get("name"), request_data.get("parameters", {}))
+                return
+            payload, status_code = await self.run_tool(request_data.get("name"),
+                                                       request_data.get("parameters", {}))
+            await send_json(send, payload, status_code, accept_encoding)
+        elif path == "/mcp/v1/invoke/batch" and method == "POST":
+            await self._invoke_batch(receive, send, accept_encoding)
+        elif path == "/metrics" and method == "GET":
+            body = server.REGISTRY.render().encode("utf-8")
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", CONTENT_TYPE.encode("ascii"))]})
+            await send({"type": "http.response.body", "body": body})
+        elif path == "/metrics/slow_calls" and method == "GET":
+            await send_json(send, server.slow_call_payload())
+        elif path == "/mcp/v1/prefetch" and method == "GET":
+            await send_json(send, server.prefetch_status())
+        elif path == "/mcp/v1/ready" and method == "GET":
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            require = [name for value in query.get("require", ()) for name in value.split(",") if name]
+            payload, status_code = server.readiness_status(require)
+            await send_json(send, payload, status_code)
+        else:
+            await send_json(send, {"error": f"Not found: {method} {path}", "status": "error"}, 404)
+
+
+app = MCPAsgiApp()
@@ -0,0 +1,348 @@
+"""
+Audit Log
+Append-only write-ahead log of application attempts and their outcomes.
+Every record is framed with its length and CRC-32 and appended to numbered
+segment files that rotate by size. Concurrent appends are made durable
+together with one write and one fsync (group commit). Sealed segments are
+compacted to the last record of each attempt, and replay folds the log back
+into the final state of every attempt.
+"""
+
+import fcntl
+import logging
+import os
+import re
+import struct
+import threading
+import uuid
+import zlib
+from datetime import datetime
+
+import json_codec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIT_DIR = ".audit_log"
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_COMPACT_SEGMENTS = 4
+
+ATTEMPT = "attempt"
+OUTCOME = "outcome"
+
+# Little-endian payload length and CRC-32 of the payload
+_HEADER = struct.Struct("<II")
+
+# <number>-<writer>.log; every AuditLog instance writes its own segments
+_SEGMENT = re.compile(r"^(\d{8})-([0-9a-f]{8})\.log$")
+
+_COMPACT_LOCK = "compact.lock"
+
+
+class AuditLogError(Exception):
+    """Raised when a record could not be made durable"""
+
+
+def encode_record(record):
+    """Frame a record as length, checksum and JSON payload"""
+    payload = json_codec.dumps(record)
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_records(data):
+    """
+    Decode the framed records in data.
+
+    Returns (records, valid_bytes). Decoding stops at the first frame that
+    is cut short or fails its checksum, such as the torn tail of a write
+    interrupted by a crash; valid_bytes is where that frame starts.
+    """
+    records = []
+    view = memoryview(data)
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, checksum = _HEADER.unpack_from(view, offset)
+        start = offset + _HEADER.size
+        end = start + length
+        if end > len(data) or zlib.crc32(view[start:end]) != checksum:
+            break
+        try:
+            records.append(json_codec.loads(bytes(view[start:end])))
+        except ValueError:
+            break
+        offset = end
+    return records, offset
+
+
+def fold(records, attempts=None):
+    """
+    Fold records into the last record of each attempt, keyed by attempt id.
+
+    An outcome supersedes the attempt record and any earlier outcome; an
+    attempt record never replaces what is already known about the attempt.
+    """
+    attempts = {} if attempts is None else attempts
+    for record in records:
+        if record.get("type") == ATTEMPT:
+            attempts.setdefault(record["attempt_id"], record)
+        else:
+            attempts[record["attempt_id"]] = record
+    return attempts
+
+
+class _Batch:
+    __slots__ = ("frames", "done", "error")
+
+    def __init__(self):
+        self.frames = []
+        self.done = False
+        self.error = None
+
+
+class AuditLog:
+    """
+    Thread-safe, segmented write-ahead log.
+
+    append() returns once its record is on disk. The first caller to find no
+    write in progress becomes the leader: it writes every record queued so
+    far and fsyncs once, while callers arriving meanwhile queue their records
+    for the next batch. Throughput therefore grows with concurrency instead
+    of being capped at one fsync per application.
+
+    Each instance appends to its own segments and holds an exclusive flock on
+    the one it is writing, so several worker processes can share a directory
+    and compaction never touches a segment that is still being written.
+    """
+
+    def __init__(self, directory=DEFAULT_AUDIT_DIR, segment_bytes=DEFAULT_SEGMENT_BYTES, fsync=True,
+                 compact_segments=DEFAULT_COMPACT_SEGMENTS):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.compact_segments = compact_segments
+        self.writer = uuid.uuid4().hex[:8]
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._cond = threading.Condition()
+        self._batch = _Batch()
+        self._flushing = False
+        self._closed = False
+        self._file = None
+        self._size = 0
+        self._number = max((number for number, _ in self._segments()), default=0)
+        self._sealed_since_compaction = 0
+        self._compacting = threading.Lock()
+        self._stats = {"records": 0, "commits": 0, "bytes": 0, "segments": 0, "compactions": 0}
+
+    @classmethod
+    def from_config(cls, audit_config):
+        """Open the log configured in the optional 'audit' section of config.yaml; None if disabled"""
+        audit_config = audit_config or {}
+        if not audit_config.get("enabled", True):
+            return None
+        return cls(directory=audit_config.get("path", DEFAULT_AUDIT_DIR),
+                   segment_bytes=audit_config.get("segment_bytes", DEFAULT_SEGMENT_BYTES),
+                   fsync=audit_config.get("fsync", True),
+                   compact_segments=audit_config.get("compact_segments", DEFAULT_COMPACT_SEGMENTS))
+
+    def _segments(self):
+        """Return (number, file name) of every segment, in replay order"""
+        segments = []
+        for name in os.listdir(self.directory):
+            match = _SEGMENT.match(name)
+            if match:
+                segments.append((int(match.group(1)), name))
+        return sorted(segments)
+
+    def append(self, record):
+        """Append a record and return once it is durable"""
+        frame = encode_record(record)
+        with self._cond:
+            if self._closed:
+                raise AuditLogError("Audit log is closed")
+            batch = self._batch
+            batch.frames.append(frame)
+            while not batch.done:
+                if self._flushing:
+                    self._cond.wait()
+                else:
+                    self._commit()
+        if batch.error is not None:
+            raise AuditLogError(f"Failed to write the audit log: {batch.error}") from batch.error
+
+    def _commit(self):
+        # Called with the condition held; writes the open batch without it
+        batch, self._batch = self._batch, _Batch()
+        self._flushing = True
+        self._cond.release()
+        try:
+            self._write(b"".join(batch.frames), len(batch.frames))
+        except Exception as e:
+            batch.error = e
+            # The segment may end in a partial frame; later records go to a new one
+            self._seal()
+        finally:
+            self._cond.acquire()
+            batch.done = True
+            self._flushing = False
+            self._cond.notify_all()
+
+    def _write(self, data, count):
+        if self._file is not None and self._size and self._size + len(data) > self.segment_bytes:
+            self._seal()
+        if self._file is None:
+            self._open_segment()
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+        self._stats["records"] += count
+        self._stats["commits"] += 1
+        self._stats["bytes"] += len(data)
+
+    def _open_segment(self):
+        self._number += 1
+        name = f"{self._number:08d}-{self.writer}.log"
+        temp = os.path.join(self.directory, f".{name}.tmp")
+        fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND, 0o600)
+        file = os.fdopen(fd, "ab")
+        # Locked before it gets its final name, so compaction never sees it unlocked
+        fcntl.flock(file, fcntl.LOCK_EX)
+        os.rename(temp, os.path.join(self.directory, name))
+        self._fsync_directory()
+        self._file = file
+        self._size = 0
+        self._stats["segments"] += 1
+
+    def _seal(self, compact=True):
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError as e:
+            logger.error(f"Failed to close audit log segment: {e}")
+        self._file = None
+        self._sealed_since_compaction += 1
+        if compact and self.compact_segments and self._sealed_since_compaction >= self.compact_segments:
+            self._sealed_since_compaction = 0
+            threading.Thread(target=self._compact_in_background, name="audit-log-compact", daemon=True).start()
+
+    def _fsync_directory(self):
+        if not self.fsync:
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _compact_in_background(self):
+        try:
+            removed = self.compact()
+            if removed:
+                logger.info(f"Compacted {removed + 1} audit log segments into one")
+        except Exception as e:
+            logger.error(f"Failed to compact the audit log: {e}")
+
+    def compact(self):
+        """
+        Rewrite the sealed segments as one holding the last record of each attempt.
+
+        Segments still being written, by this or another process, are left
+        alone. Returns the number of segments removed.
+        """
+        if not self._compacting.acquire(blocking=False):
+            return 0
+        sealed = []
+        try:
+            with open(os.path.join(self.directory, _COMPACT_LOCK), "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                for _, name in self._segments():
+                    file = open(os.path.join(self.directory, name), "rb")
+                    try:
+                        fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        file.close()
+                        continue
+                    sealed.append((name, file))
+                if len(sealed) < 2:
+                    return 0
+                attempts = {}
+                for _, file in sealed:
+                    fold(decode_records(file.read())[0], attempts)
+                # The result takes the newest segment's name, so it replays before later segments
+                target = os.path.join(self.directory, sealed[-1][0])
+                temp = os.path.join(self.directory, f".{sealed[-1][0]}.compact")
+                with open(temp, "wb") as out:
+                    out.write(b"".join(encode_record(record) for record in attempts.values()))
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(temp, target)
+                # A crash before these are removed only replays records twice, which folds to the same state
+                for name, _ in sealed[:-1]:
+                    os.remove(os.path.join(self.directory, name))
+                self._fsync_directory()
+                self._stats["compactions"] += 1
+                return len(sealed) - 1
+        finally:
+            for _, file in sealed:
+                file.close()
+            self._compacting.release()
+
+    def replay(self):
+        """
+        Read every segment and fold it into the last record of each attempt.
+
+        Returns (attempts, summary). A segment whose tail is torn or fails its
+        checksum contributes the records before the damage.
+        """
+        attempts = {}
+        summary = {"segments": 0, "records": 0, "torn_segments": 0}
+        for _, name in self._segments():
+            try:
+                with open(os.path.join(self.directory, name), "rb") as file:
+                    data = file.read()
+            except FileNotFoundError:
+                # Removed by a compaction running in another process
+                continue
+            records, valid = decode_records(data)
+            summary["segments"] += 1
+            summary["records"] += len(records)
+            if valid < len(data):
+                summary["torn_segments"] += 1
+                logger.warning(f"Audit log segment {name} is damaged after byte {valid}; the rest is ignored")
+            fold(records, attempts)
+        return attempts, summary
+
+    def record_attempt(self, job_id, job_title=None, company=None):
+        """Durably record that an application is about to be sent; return its attempt id"""
+        attempt_id = uuid.uuid4().hex
+        self.append({
+            "type": ATTEMPT,
+            "attempt_id": attempt_id,
+            "job_id": job_id,
+            "job_title": job_title,
+            "company": company,
+            "at": datetime.now().isoformat(),
+        })
+        return attempt_id
+
+    def record_outcome(self, attempt_id, job_id, status, **details):
+        """Durably record the outcome of an attempt, such as 'applied' with its application"""
+        self.append(dict(details, type=OUTCOME, attempt_id=attempt_id, job_id=job_id, status=status,
+                         at=datetime.now().isoformat()))
+
+    def stats(self):
+        """Return counts of records, commits (one write and fsync each), bytes, segments and compactions"""
+        with self._cond:
+            return dict(self._stats)
+
+    def close(self):
+        """Write any queued records and close the current segment"""
+        with self._cond:
+            self._closed = True
+            while self._flushing or self._batch.frames:
+                if self._flushing:
+                    self._cond.wait()
+                else:
+                    self._commit()
+            self._seal(compact=False)
@@ -0,0 +1,95 @@
+"""
+Batch Invocation
+Runs a list of MCP tool calls with bounded parallelism and reports a result
+per call, so bulk agent flows need a single HTTP round-trip.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_MAX_PARALLELISM = 8
+DEFAULT_MAX_CALLS = 100
+
+
+class BatchError(ValueError):
+    """Raised when a batch request is malformed as a whole"""
+
+
+def parse_batch_request(request_data, batch_config=None):
+    """Validate a batch request body and return (calls, max_parallelism, stream)"""
+    batch_config = batch_config or {}
+    if not isinstance(request_data, dict):
+        raise BatchError("Batch request body must be a JSON object")
+
+    calls = request_data.get("calls")
+    if not isinstance(calls, list) or not calls:
+        raise BatchError("'calls' must be a non-empty list of tool calls")
+
+    max_calls = batch_config.get("max_calls", DEFAULT_MAX_CALLS)
+    if len(calls) > max_calls:
+        raise BatchError(f"Batch contains {len(calls)} calls; the limit is {max_calls}")
+
+    limit = batch_config.get("max_parallelism", DEFAULT_MAX_PARALLELISM)
+    max_parallelism = request_data.get("max_parallelism", limit)
+    if not isinstance(max_parallelism, int) or max_parallelism < 1:
+        raise BatchError("'max_parallelism' must be a positive integer")
+    max_parallelism = min(max_parallelism, limit)
+
+    if request_data.get("sequential"):
+        max_parallelism = 1
+
+    return calls, max_parallelism, bool(request_data.get("stream"))
+
+
+def call_id(call, index):
+    """Return the client-supplied id of a call, defaulting to its position"""
+    if isinstance(call, dict) and call.get("id") is not None:
+        return call["id"]
+    return index
+
+
+def run_call(dispatch, call):
+    """Dispatch one call, turning malformed calls and exceptions into error payloads"""
+    if not isinstance(call, dict):
+        return {"error": "Each call must be a JSON object", "status": "error"}, 400
+    try:
+        return dispatch(call.get("name"), call.get("parameters", {}))
+    except Exception as e:
+        return {"error": str(e), "status": "error"}, 500
+
+
+def batch_item(index, call, payload, status_code):
+    """Build the per-call entry of a batch response"""
+    return {
+        "id": call_id(call, index),
+        "index": index,
+        "name": call.get("name") if isinstance(call, dict) else None,
+        "status_code": status_code,
+        "result": payload,
+    }
+
+
+def iter_batch(dispatch, calls, max_parallelism):
+    """Run calls in a thread pool, yielding batch items in completion order"""
+    if max_parallelism == 1:
+        for index, call in enumerate(calls):
+            yield batch_item(index, call, *run_call(dispatch, call))
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_parallelism, len(calls)),
+                            thread_name_prefix="mcp-batch") as executor:
+        futures = {executor.submit(run_call, dispatch, call): index for index, call in enumerate(calls)}
+        for future in as_completed(futures):
+            index = futures[future]
+            yield batch_item(index, calls[index], *future.result())
+
+
+def batch_response(items):
+    """Assemble a complete batch response with items in request order"""
+    items = sorted(items, key=lambda item: item["index"])
+    errors = sum(1 for item in items if item["status_code"] >= 400)
+    return {
+        "results": items,
+        "count": len(items),
+        "errors": errors,
+        "status": "success" if errors == 0 else "partial" if errors < len(items) else "error",
+    }
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+ASGI vs Flask Benchmark
+Fires a burst of concurrent search_jobs invocations at the Flask app (one
+thread per request, as the threaded dev server does) and at the ASGI app
+(one coroutine per request over a bounded executor), with simulated upstream
+latency, and reports throughput, latency and peak thread count for each.
+Every request searches a different title, so concurrent requests are not
+coalesced into one upstream call and each occupies a worker for the latency.
+
+Usage: python benchmarks/bench_asgi.py [--requests 500] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asgi
+import server
+from linkedin_gateway import LinkedInGateway
+
+def request_body(i):
+    """Return the invocation of request i; distinct titles defeat request coalescing"""
+    return {"name": "search_jobs", "parameters": {"title": f"DevOps Engineer {i}"}}
+
+
+class ThreadSampler:
+    """Track the peak number of live threads while a benchmark runs"""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def summarize(name, latencies, elapsed, peak_threads):
+    latencies = sorted(latencies)
+    return {
+        "mode": name,
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 4),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "peak_threads": peak_threads,
+    }
+
+
+def bench_flask(total):
+    client = server.app.test_client()
+
+    def one(i):
+        start = time.perf_counter()
+        client.post("/mcp/v1/invoke", json=request_body(i))
+        return time.perf_counter() - start
+
+    with ThreadSampler() as sampler:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=total) as pool:
+            latencies = list(pool.map(one, range(total)))
+        elapsed = time.perf_counter() - start
+    return summarize("flask", latencies, elapsed, sampler.peak)
+
+
+def bench_asgi(total, max_workers):
+    app = asgi.MCPAsgiApp(max_workers=max_workers, run_startup=False)
+
+    async def one(i):
+        messages = [{"type": "http.request", "body": json.dumps(request_body(i)).encode()}]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            pass
+
+        start = time.perf_counter()
+        await app({"type": "http", "method": "POST", "path": "/mcp/v1/invoke"}, receive, send)
+        return time.perf_counter() - start
+
+    async def run():
+        return await asyncio.gather(*[one(i) for i in range(total)])
+
+    with ThreadSampler() as sampler:
+        start = time.perf_counter()
+        latencies = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+    return summarize("asgi", latencies, elapsed, sampler.peak)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated upstream latency in seconds")
+    parser.add_argument("--max-workers", type=int, default=asgi.DEFAULT_MAX_WORKERS)
+    args = parser.parse_args()
+
+    upstream = server._search_upstream
+
+    def slow_upstream(client, parameters):
+        time.sleep(args.latency)
+        return upstream(client, parameters)
+
+    # One session per request so the gateway pool is not the bottleneck
+    gateway = LinkedInGateway.from_clients([MagicMock() for _ in range(args.requests)],
+                                           requests_per_minute=1e9, burst=1e9)
+    server.logger.disabled = True
+    with patch("server.linkedin_client", gateway), patch("server._search_upstream", slow_upstream), \
+            patch("server.search_cache.get", return_value=None):
+        results = [bench_flask(args.requests), bench_asgi(args.requests, args.max_workers)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Audit Log Benchmark
+Applies to jobs through dispatch_tool against the fake LinkedIn backend,
+with concurrent callers, and reports applications per second with the
+audit log off, on without fsync, and on with fsync. Group commit shows up
+as records per commit above one once several applies run concurrently.
+Also times replaying the resulting log and restoring it into an empty
+history, as startup does after a crash.
+
+Usage: python benchmarks/bench_audit_log.py [--applications 400] [--concurrency 1,4,16] [--latency 0.005]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import server
+from audit_log import AuditLog
+from fake_linkedin import FakeLinkedIn, install, make_catalogue
+from history_store import HistoryStore
+from job_cache import JobCache
+
+MODES = {
+    "off": None,
+    "no_fsync": {"fsync": False},
+    "fsync": {"fsync": True},
+}
+
+
+def run_case(catalogue, applications, concurrency, latency, audit_config, directory):
+    """Apply to applications jobs from concurrency threads; return (applies per second, audit stats)"""
+    job_cache = JobCache(max_entries=len(catalogue) + 1, max_bytes=1 << 32)
+    for job in catalogue:
+        job_cache.put(job)
+    log = AuditLog(directory, **audit_config) if audit_config is not None else None
+    history = HistoryStore(os.path.join(directory, "history.db"))
+    job_ids = [job["job_id"] for job in catalogue]
+    counter = iter(range(applications))
+    lock = threading.Lock()
+    errors = []
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            _, status = server.dispatch_tool("apply_to_job", {"job_id": job_ids[i % len(job_ids)],
+                                                              "allow_duplicate": True})
+            if status != 200:
+                errors.append(status)
+
+    clients = [FakeLinkedIn(catalogue, latency=latency) for _ in range(concurrency)]
+    with patch.object(server, "job_cache", job_cache), patch.object(server, "application_history", history), \
+            patch.object(server, "audit_log", log), install(server, clients):
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    history.close()
+    stats = None
+    if log is not None:
+        log.close()
+        stats = log.stats()
+    if errors:
+        raise RuntimeError(f"{len(errors)} applications failed: {errors[:5]}")
+    return applications / elapsed, stats
+
+
+def time_replay(directory):
+    """Replay the log in directory into an empty history; return the timings"""
+    start = time.perf_counter()
+    attempts, summary = AuditLog(directory).replay()
+    replayed = time.perf_counter() - start
+    applications = [record["application"] for record in attempts.values() if record.get("application")]
+    history = HistoryStore()
+    start = time.perf_counter()
+    restored = history.restore(applications)
+    return {
+        "records": summary["records"],
+        "replay_ms": round(replayed * 1000, 1),
+        "records_per_second": round(summary["records"] / replayed) if replayed else None,
+        "restored": restored,
+        "restore_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=400, help="applications per case")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated numbers of concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated LinkedIn latency in seconds")
+    parser.add_argument("--dir", help="directory for the logs and history (default: a temporary directory)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    catalogue = make_catalogue(1000)
+    root = tempfile.mkdtemp(dir=args.dir)
+    results = {}
+    try:
+        for concurrency in (int(value) for value in args.concurrency.split(",")):
+            for mode, audit_config in MODES.items():
+                directory = os.path.join(root, f"{mode}-{concurrency}")
+                os.makedirs(directory)
+                per_second, stats = run_case(catalogue, args.applications, concurrency, args.latency,
+                                             audit_config, directory)
+                case = {"applies_per_second": round(per_second, 1)}
+                if stats is not None:
+                    case["records_per_commit"] = round(stats["records"] / stats["commits"], 2)
+                results[f"{mode}.c{concurrency}"] = case
+        results["replay"] = time_replay(os.path.join(root, f"fsync-{concurrency}"))
+    finally:
+        shutil.rmtree(root)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
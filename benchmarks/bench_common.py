@@ -0,0 +1,79 @@
+"""
+Benchmark Helpers
+Latency summaries, JSON result files and baseline comparison shared by the
+benchmark scripts.
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+
+
+def percentile(samples, fraction):
+    """Return the fraction percentile of samples (seconds), or 0.0 when empty"""
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def latency_summary(latencies, elapsed, errors=0):
+    """Summarize per-request latencies (seconds) measured over elapsed seconds"""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path, benchmark, settings, results):
+    """Save results as JSON together with the commit and environment they were measured on"""
+    document = {
+        "benchmark": benchmark,
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "settings": settings,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2)
+
+
+def compare(baseline_path, results, tolerance):
+    """
+    Print how results differ from a saved baseline and return the regressions.
+
+    A case regresses when its p99 latency grows, or its throughput drops, by
+    more than tolerance (a fraction) relative to the baseline.
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)["results"]
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        p99_change = (current["p99_ms"] - before["p99_ms"]) / before["p99_ms"] if before["p99_ms"] else 0.0
+        rps_change = ((current["requests_per_s"] - before["requests_per_s"]) / before["requests_per_s"]
+                      if before["requests_per_s"] else 0.0)
+        regressed = p99_change > tolerance or rps_change < -tolerance
+        print(f"{name:32} p99 {before['p99_ms']:9.3f} -> {current['p99_ms']:9.3f} ms ({p99_change:+.1%})  "
+              f"rps {before['requests_per_s']:9.1f} -> {current['requests_per_s']:9.1f} ({rps_change:+.1%})"
+              f"{'  REGRESSION' if regressed else ''}", file=sys.stderr)
+        if regressed:
+            regressions.append(name)
+    return regressions
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cover Letter Benchmark
+Compares rendering the setup_profile.py cover letter for many jobs by
+chained str.replace calls (one scan of the letter per placeholder) with the
+compiled template on its own, and through the renderer with its per-job
+cache disabled and warm.
+
+Usage: python benchmarks/bench_cover_letters.py [--jobs 500] [--rounds 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_search_index import make_job
+from cover_letter import CoverLetterRenderer
+
+LETTER = """
+Dear Hiring Manager,
+
+I am writing to express my interest in the [JOB_TITLE] position at [COMPANY_NAME]. With my background in DevOps engineering, cloud infrastructure, and automation, I believe I would be a valuable addition to your team.
+
+My experience includes:
+- Designing and implementing CI/CD pipelines
+- Managing Kubernetes clusters in production environments
+- Infrastructure as Code using Terraform and CloudFormation
+- Monitoring and observability solutions
+- Cloud security best practices
+
+I am particularly interested in [COMPANY_NAME] because of your innovative approach to technology. I am confident that my skills and enthusiasm would make me a strong candidate for this position.
+
+Thank you for considering my application. I look forward to the opportunity to discuss how I can contribute to your team.
+
+Sincerely,
+[YOUR_NAME]
+"""
+
+
+def replace_chain(job):
+    return (LETTER.replace("[JOB_TITLE]", job["title"])
+            .replace("[COMPANY_NAME]", job["company"])
+            .replace("[YOUR_NAME]", "Sam Doe"))
+
+
+def time_per_letter(fn, jobs, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for job in jobs:
+            fn(job)
+    return round((time.perf_counter() - start) / (rounds * len(jobs)) * 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    jobs = [make_job(i, rng) for i in range(args.jobs)]
+    config = {"default_cover_letter": LETTER, "personal_info": {"name": "Sam Doe"}}
+    renderer = CoverLetterRenderer.from_config(config)
+    assert renderer.render(jobs[0]) == replace_chain(jobs[0])
+
+    uncached = CoverLetterRenderer.from_config(dict(config, cover_letters={"cache_size": 0}))
+    cached = CoverLetterRenderer.from_config(config)
+    for job in jobs:
+        cached.render(job)
+    template = renderer.default
+    values = {id(job): {"JOB_TITLE": job["title"], "COMPANY_NAME": job["company"], "YOUR_NAME": "Sam Doe"}
+              for job in jobs}
+    results = {
+        "jobs": args.jobs,
+        "letter_chars": len(LETTER),
+        "us_per_letter": {
+            "str_replace_chain": time_per_letter(replace_chain, jobs, args.rounds),
+            "compiled_template": time_per_letter(lambda job: template.render(values[id(job)]), jobs, args.rounds),
+            "renderer_uncached": time_per_letter(uncached.render, jobs, args.rounds),
+            "renderer_cached": time_per_letter(cached.render, jobs, args.rounds),
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Duplicate Detection Benchmark
+Caches synthetic postings in which some roles are reposted or listed in
+several locations, with the description copied verbatim or lightly edited.
+Reports the cost of signing and grouping each posting, how well the groups
+match the true roles (pairwise precision and recall), how many descriptions
+the DetailStore keeps after exact deduplication, and how many results
+collapsing removes from a page of search results.
+
+Usage: python benchmarks/bench_dedup.py [--roles 5000] [--max-copies 3] [--edit-rate 0.3]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_search_index import LOCATIONS, SKILLS, make_job
+from dedup import DuplicateIndex
+from job_cache import JobCache
+
+
+def make_postings(roles, max_copies, edit_rate, rng):
+    """Return (postings, role of each job_id)"""
+    postings = []
+    role_of = {}
+    for role in range(roles):
+        base = make_job(role, rng)
+        sentences = [f"{base['company']} builds {rng.choice(SKILLS)} and {rng.choice(SKILLS)} systems for "
+                     f"team {rng.randrange(10 ** 6)}, shipping change {rng.randrange(10 ** 6)} every week."
+                     for _ in range(15)]
+        for copy in range(rng.randint(1, max_copies)):
+            job = dict(base, job_id=f"{role}-{copy}", location=rng.choice(LOCATIONS))
+            text = list(sentences)
+            if copy and rng.random() < edit_rate:
+                text[rng.randrange(len(text))] = "Applications close soon, so apply today."
+            job["full_description"] = " ".join(text)
+            postings.append(job)
+            role_of[job["job_id"]] = role
+    rng.shuffle(postings)
+    return postings, role_of
+
+
+def pair_counts(groups):
+    return sum(len(members) * (len(members) - 1) // 2 for members in groups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--roles", type=int, default=5000)
+    parser.add_argument("--max-copies", type=int, default=3)
+    parser.add_argument("--edit-rate", type=float, default=0.3, help="fraction of copies with an edited sentence")
+    parser.add_argument("--page", type=int, default=50, help="search results per collapsed page")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    postings, role_of = make_postings(args.roles, args.max_copies, args.edit_rate, rng)
+    plain = JobCache(max_entries=len(postings) + 1, max_bytes=2 ** 40)
+    start = time.perf_counter()
+    for job in postings:
+        plain.put(job)
+    baseline = time.perf_counter() - start
+
+    cache = JobCache(max_entries=len(postings) + 1, max_bytes=2 ** 40)
+    index = DuplicateIndex()
+    cache.subscribe(index)
+    start = time.perf_counter()
+    for job in postings:
+        cache.put(job)
+    elapsed = time.perf_counter() - start
+
+    found = defaultdict(list)
+    for job in postings:
+        found[tuple(sorted(index.duplicates(job["job_id"]) + [job["job_id"]]))].append(job["job_id"])
+    true_groups = defaultdict(list)
+    for job_id, role in role_of.items():
+        true_groups[role].append(job_id)
+    found_pairs = pair_counts(found)
+    true_pairs = pair_counts(true_groups.values())
+    correct = sum(pair_counts(list(members for members in _by_role(group, role_of).values()))
+                  for group in found)
+
+    # A page of results for a few roles, as a search for one title returns
+    page = sorted(role_of, key=role_of.get)[:args.page]
+    start = time.perf_counter()
+    kept = index.collapse(page)
+    collapse_us = (time.perf_counter() - start) * 1e6
+
+    details = cache.details.stats()
+    results = {
+        "postings": len(postings),
+        "roles": args.roles,
+        "us_per_put": round(baseline / len(postings) * 1e6, 1),
+        "us_per_put_with_dedup": round(elapsed / len(postings) * 1e6, 1),
+        "groups": index.stats()["groups"],
+        "pair_precision": round(correct / found_pairs, 4) if found_pairs else 1.0,
+        "pair_recall": round(correct / true_pairs, 4) if true_pairs else 1.0,
+        "distinct_descriptions": details["distinct_descriptions"],
+        "description_bytes": details["description_bytes"],
+        "collapsed_page": {"results": len(page), "kept": len(kept), "us": round(collapse_us, 1)},
+    }
+    print(json.dumps(results, indent=2))
+
+
+def _by_role(group, role_of):
+    roles = defaultdict(list)
+    for job_id in group:
+        roles[role_of[job_id]].append(job_id)
+    return roles
+
+
+if __name__ == "__main__":
+    main()
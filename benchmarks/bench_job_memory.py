@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Job Memory Benchmark
+Measures bytes per cached job for plain job dicts (the previous cache
+layout) and for JobRecords backed by a DetailStore. Every posting is decoded
+from its own JSON document, as upstream responses are, so repeated strings
+start out as separate objects; some postings share a description.
+
+Usage: python benchmarks/bench_job_memory.py [--jobs 20000] [--descriptions 500]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from collections import OrderedDict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_search_index import SKILLS, make_job
+from job_cache import JobCache
+
+
+def make_documents(count, descriptions, rng):
+    texts = [
+        " ".join(f"Paragraph {p} of description {d}: build and run {rng.choice(SKILLS)} platforms at scale."
+                 for p in range(12))
+        for d in range(descriptions)
+    ]
+    documents = []
+    for i in range(count):
+        job = make_job(i, rng)
+        job["full_description"] = rng.choice(texts)
+        job["skills_required"] = rng.sample(SKILLS, 6)
+        job["salary_range"] = f"£{rng.randrange(40, 120)},000 - £{rng.randrange(120, 200)},000"
+        documents.append(json.dumps(job))
+    return documents
+
+
+def measure(build, documents):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cache = build(documents)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del cache
+    return used
+
+
+def build_dicts(documents):
+    cache = OrderedDict()
+    for document in documents:
+        job = json.loads(document)
+        cache[job["job_id"]] = job
+    return cache
+
+
+def build_records(documents):
+    cache = JobCache(max_entries=len(documents), max_bytes=1 << 40)
+    for document in documents:
+        cache.put(json.loads(document))
+    return cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--descriptions", type=int, default=500, help="distinct description texts")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    documents = make_documents(args.jobs, args.descriptions, random.Random(args.seed))
+    dict_bytes = measure(build_dicts, documents)
+    record_bytes = measure(build_records, documents)
+    print(json.dumps({
+        "jobs": args.jobs,
+        "distinct_descriptions": args.descriptions,
+        "dict_bytes_per_job": round(dict_bytes / args.jobs),
+        "record_bytes_per_job": round(record_bytes / args.jobs),
+        "reduction": round(1 - record_bytes / dict_bytes, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+JSON Path Benchmark
+Compares the previous response path (manifest rebuilt and serialized by
+Flask's default JSON provider on every request) with the precomputed
+manifest, ETag revalidation and the json_codec encoders, and reports how
+much gzip shrinks typical payloads.
+
+Usage: python benchmarks/bench_json.py [--iterations 2000] [--jobs 100]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json_codec
+import server
+from bench_search_index import make_job
+from fake_linkedin import FakeLinkedIn
+from flask import Flask, jsonify
+
+
+def time_per_call(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round((time.perf_counter() - start) / iterations * 1e6, 2)
+
+
+def legacy_app():
+    """Flask app serving the manifest the way /mcp/v1/tools used to"""
+    app = Flask("legacy")
+
+    @app.route('/mcp/v1/tools')
+    def get_tools():
+        return jsonify({"tools": server.build_tool_manifest()})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=100, help="jobs in the search payload")
+    args = parser.parse_args()
+    n = args.iterations
+
+    rng = random.Random(3)
+    search_payload = {"jobs": [make_job(i, rng) for i in range(args.jobs)], "count": args.jobs, "status": "success"}
+    details_payload = {"job": dict(make_job(0, rng), **FakeLinkedIn([], latency=0).get_job("0")), "status": "success"}
+    request_body = json.dumps({"name": "search_jobs", "parameters": {"title": "DevOps Engineer", "limit": 10}})
+
+    # View functions are timed inside a request context; the full request
+    # cycle through the test client adds the same fixed cost to both
+    legacy = legacy_app()
+    etag = server.TOOL_MANIFEST.etag
+    results = {"codec": json_codec.codec, "manifest_us": {}}
+    for name, app, view, headers in (
+        ("legacy_rebuild_and_jsonify", legacy, legacy.view_functions["get_tools"], {}),
+        ("precomputed", server.app, server.get_tools, {}),
+        ("precomputed_gzip", server.app, server.get_tools, {"Accept-Encoding": "gzip"}),
+        ("not_modified", server.app, server.get_tools, {"If-None-Match": etag}),
+    ):
+        with app.test_request_context('/mcp/v1/tools', headers=headers):
+            results["manifest_us"][name] = time_per_call(view, n)
+    client = server.app.test_client()
+    results["manifest_request_us"] = {
+        "full": time_per_call(lambda: client.get('/mcp/v1/tools'), n // 4),
+        "not_modified": time_per_call(lambda: client.get('/mcp/v1/tools', headers={'If-None-Match': etag}), n // 4),
+    }
+
+    default_provider = legacy_app().json
+    for name, payload in (("search", search_payload), ("details", details_payload)):
+        encoded = json_codec.dumps(payload)
+        results[f"{name}_encode_us"] = {
+            "flask_default": time_per_call(lambda: default_provider.dumps(payload), n),
+            "json_codec": time_per_call(lambda: json_codec.dumps(payload), n),
+        }
+        results[f"{name}_bytes"] = {"plain": len(encoded), "gzip": len(gzip.compress(encoded))}
+    results["request_decode_us"] = {
+        "stdlib": time_per_call(lambda: json.loads(request_body), n),
+        "json_codec": time_per_call(lambda: json_codec.loads(request_body), n),
+    }
+    results["manifest_bytes"] = {"plain": len(server.TOOL_MANIFEST.body),
+                                 "gzip": len(gzip.compress(server.TOOL_MANIFEST.body))}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Relevance Ranking Benchmark
+Ranks a large cache of synthetic postings against a job_preferences profile
+and compares scoring every posting in a Python loop and sorting with the
+RankingIndex (precomputed feature columns, one vectorized score and a
+partial sort). Exits non-zero when the index's median top-k time exceeds
+--target-ms.
+
+Usage: python benchmarks/bench_ranking.py [--jobs 50000] [--k 10] [--rounds 20] [--target-ms 10]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_search_index import SKILLS, make_job
+from ranking import RankingIndex, RankingProfile
+
+PROFILE = RankingProfile(skills=["Kubernetes", "Terraform", "AWS", "Python", "Prometheus"],
+                         titles=["DevOps Engineer", "Site Reliability Engineer"],
+                         locations=["London, United Kingdom", "Remote"])
+
+
+def python_top_k(index, jobs, k):
+    """Score every posting from scratch in Python and sort, as a naive tool handler would"""
+    now = index._clock()
+    weights = index.weights
+    scored = []
+    for job in jobs:
+        skills, title, location = index.profile.features(job)
+        age_days = max(now - datetime.fromisoformat(job["date_posted"]).timestamp(), 0) / 86400
+        recency = 0.5 ** (age_days / index.half_life_days)
+        score = (weights["skills"] * skills + weights["title"] * title + weights["location"] * location
+                 + weights["recency"] * recency)
+        scored.append((score, job["job_id"]))
+    scored.sort(reverse=True)
+    return [job_id for _, job_id in scored[:k]]
+
+
+def median_ms(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, default=10.0, help="maximum median top-k time for the index")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    jobs = []
+    for i in range(args.jobs):
+        job = make_job(i, rng)
+        job["skills_required"] = rng.sample(SKILLS, 3)
+        jobs.append(job)
+
+    index = RankingIndex(PROFILE, clock=lambda: datetime(2026, 1, 1).timestamp())
+    start = time.perf_counter()
+    for job in jobs:
+        index.add(job)
+    build_s = time.perf_counter() - start
+    subset = [job["job_id"] for job in rng.sample(jobs, 500)]
+
+    top_ms = median_ms(lambda: index.top_k(args.k), args.rounds)
+    results = {
+        "jobs": args.jobs,
+        "k": args.k,
+        "index_build_us_per_job": round(build_s / args.jobs * 1e6, 2),
+        "ms": {
+            "python_loop_top_k": median_ms(lambda: python_top_k(index, jobs, args.k), max(1, args.rounds // 10)),
+            "index_top_k": top_ms,
+            "index_top_k_of_500": median_ms(lambda: index.top_k(args.k, subset), args.rounds),
+        },
+        "target_ms": args.target_ms,
+    }
+    print(json.dumps(results, indent=2))
+    if top_ms > args.target_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
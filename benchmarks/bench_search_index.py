@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Search Index Benchmark
+Builds the search index over synthetic postings and reports build time,
+incremental add/remove cost and query latency for typical search_jobs queries.
+
+Usage: python benchmarks/bench_search_index.py [--postings 100000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from search_index import SearchIndex
+
+TITLES = ["DevOps Engineer", "Site Reliability Engineer", "Cloud Engineer", "Platform Engineer",
+          "Software Engineer", "Data Engineer", "Engineering Manager", "Security Engineer",
+          "Backend Developer", "Frontend Developer", "Solutions Architect", "Infrastructure Lead"]
+SENIORITY = ["", "Senior ", "Junior ", "Lead ", "Principal ", "Staff "]
+LOCATIONS = ["London, United Kingdom", "Manchester, United Kingdom", "Remote", "Berlin, Germany",
+             "Dublin, Ireland", "New York, United States", "Amsterdam, Netherlands", "Edinburgh, United Kingdom"]
+SKILLS = ["AWS", "Kubernetes", "Docker", "Terraform", "Python", "Go", "Linux", "Jenkins", "GCP", "Azure",
+          "Ansible", "Prometheus", "Grafana", "Kafka", "PostgreSQL", "Java", "React", "CI/CD"]
+EXPERIENCE = ["Entry", "Mid-Senior", "Director+"]
+JOB_TYPES = ["Full-time", "Part-time", "Contract", "Temporary", "Internship"]
+
+QUERIES = {
+    "title": {"title": "DevOps Engineer"},
+    "title+location": {"title": "Site Reliability Engineer", "location": "London, UK"},
+    "title+facets": {"title": "Platform Engineer", "experience_level": "Mid-Senior",
+                     "job_type": "Full-time", "remote": True},
+    "rare_title": {"title": "Principal Solutions Architect", "location": "Dublin"},
+    "long_title": {"title": "Senior Staff Principal Lead DevOps Site Reliability Cloud Platform Engineer "
+                            "AWS Kubernetes Terraform"},
+    "facets_only": {"experience_level": "Director+", "job_type": "Contract"},
+}
+
+
+def make_job(i, rng):
+    skills = rng.sample(SKILLS, 4)
+    return {
+        "job_id": str(4000000000 + i),
+        "title": rng.choice(SENIORITY) + rng.choice(TITLES),
+        "company": f"Company {rng.randrange(5000)}",
+        "location": rng.choice(LOCATIONS),
+        "description_snippet": f"Work with {', '.join(skills)} to build reliable systems...",
+        "date_posted": f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+        "experience_level": rng.choice(EXPERIENCE),
+        "job_type": rng.choice(JOB_TYPES),
+        "remote": rng.random() < 0.3,
+        "url": f"https://www.linkedin.com/jobs/view/{4000000000 + i}",
+    }
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    jobs = [make_job(i, rng) for i in range(args.postings)]
+    index = SearchIndex()
+
+    start = time.perf_counter()
+    for job in jobs:
+        index.add(job)
+    build_s = time.perf_counter() - start
+
+    extra = [make_job(args.postings + i, rng) for i in range(1000)]
+    start = time.perf_counter()
+    for job in extra:
+        index.add(job)
+    add_us = (time.perf_counter() - start) / len(extra) * 1e6
+
+    start = time.perf_counter()
+    for job in extra:
+        index.remove(job["job_id"])
+    remove_us = (time.perf_counter() - start) / len(extra) * 1e6
+
+    results = {
+        "postings": args.postings,
+        "build_s": round(build_s, 3),
+        "add_us_per_posting": round(add_us, 1),
+        "remove_us_per_posting": round(remove_us, 1),
+        "queries": {},
+    }
+    for name, query in QUERIES.items():
+        timings = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            matches = index.search(limit=10, **query)
+            timings.append((time.perf_counter() - start) * 1000)
+        results["queries"][name] = {
+            "p50_ms": round(percentile(timings, 0.5), 3),
+            "p99_ms": round(percentile(timings, 0.99), 3),
+            "returned": len(matches),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Times initialize_linkedin with a cold session cache (every session logs in)
+and with a warm one (cached cookies are reused), using a stand-in client
+whose login sleeps for a simulated authentication latency. Also times a
+fresh process from interpreter start until it serves /mcp/v1/tools, with
+startup.warm_up lazy (the default) and eager.
+
+Usage: python benchmarks/bench_startup.py [--login-latency 1.5] [--sessions 2] [--rounds 3]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from requests.cookies import RequestsCookieJar
+
+
+def make_fake_linkedin(login_latency):
+    class FakeLinkedin:
+        def __init__(self, username, password, cookies=None, refresh_cookies=False):
+            self.client = MagicMock()
+            if cookies is None:
+                time.sleep(login_latency)
+                cookies = RequestsCookieJar()
+                cookies.set("JSESSIONID", '"ajax:0"', expires=time.time() + 86400)
+                cookies.set("li_at", "token", expires=time.time() + 86400)
+            self.client.session.cookies = cookies
+
+    return FakeLinkedin
+
+
+def time_startup(config):
+    server.config = config
+    start = time.perf_counter()
+    server.initialize_linkedin()
+    elapsed = time.perf_counter() - start
+    if server.session_refresher is not None:
+        server.session_refresher.stop()
+        server.session_refresher = None
+    return round(elapsed * 1000, 2)
+
+
+COLD_START = """
+import sys, time, types
+sys.path.insert(0, {repo!r})
+import server
+
+def Linkedin(username, password, **kwargs):
+    # Pay for the linkedin_api import and a simulated login, without the network
+    import linkedin_api
+    time.sleep({login_latency})
+    return types.SimpleNamespace()
+
+server.Linkedin = Linkedin
+server.startup()
+assert server.app.test_client().get("/mcp/v1/tools").status_code == 200
+"""
+
+COLD_START_CONFIG = """
+linkedin: {{username: bench@example.com, password: secret}}
+session_cache: {{enabled: false}}
+gateway: {{sessions_per_account: {sessions}}}
+prefetch: {{enabled: false}}
+config_reload: {{enabled: false}}
+startup: {{warm_up: {warm_up}}}
+"""
+
+
+def time_cold_start(warm_up, args):
+    """Median milliseconds for a new interpreter to import the server, start up and serve /mcp/v1/tools"""
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = COLD_START.format(repo=repo, login_latency=args.login_latency)
+    samples = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "config.yaml"), "w") as file:
+            file.write(COLD_START_CONFIG.format(sessions=args.sessions, warm_up=warm_up))
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", script], cwd=tmpdir, check=True, capture_output=True)
+            samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--login-latency", type=float, default=1.5, help="simulated login time in seconds")
+    parser.add_argument("--sessions", type=int, default=2, help="sessions per account")
+    parser.add_argument("--rounds", type=int, default=3, help="process starts per cold start mode")
+    args = parser.parse_args()
+
+    server.logger.disabled = True
+    logging.getLogger("session_cache").disabled = True
+    with tempfile.TemporaryDirectory() as tmpdir, \
+            patch("server.Linkedin", make_fake_linkedin(args.login_latency)):
+        config = {
+            "linkedin": {"username": "bench@example.com", "password": "secret"},
+            "gateway": {"sessions_per_account": args.sessions},
+            "session_cache": {"path": os.path.join(tmpdir, "sessions.json")},
+        }
+        results = {
+            "no_cache_ms": time_startup(dict(config, session_cache={"enabled": False})),
+            "cold_cache_ms": time_startup(config),
+            "warm_cache_ms": time_startup(config),
+        }
+    results["process_to_tools_ms"] = {mode: time_cold_start(mode, args) for mode in ("lazy", "eager")}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
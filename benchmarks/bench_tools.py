@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tool Micro-benchmarks
+Times search_jobs, get_job_details, apply_to_job and get_application_history
+through dispatch_tool against the fake LinkedIn backend, both when upstream
+is needed (cold) and when caches answer (warm).
+
+Usage: python benchmarks/bench_tools.py [--iterations 500] [--latency 0.0]
+                                        [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from bench_common import compare, latency_summary, write_results
+from bench_search_index import TITLES
+from fake_linkedin import FakeLinkedIn, install, make_catalogue
+from history_store import HistoryStore
+from job_cache import JobCache
+from search_cache import SearchResultCache
+from search_index import SearchIndex
+
+
+def run(name, iterations, make_call, before_each=None):
+    """Time iterations calls of dispatch_tool(*make_call(i))"""
+    latencies = []
+    errors = 0
+    total = 0.0
+    for i in range(iterations):
+        if before_each is not None:
+            before_each()
+        tool_name, parameters = make_call(i)
+        start = time.perf_counter()
+        _, status = server.dispatch_tool(tool_name, parameters)
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        latencies.append(elapsed)
+        errors += status >= 400
+    return name, latency_summary(latencies, total, errors)
+
+
+def fresh_state():
+    job_cache = JobCache(max_entries=100000, max_bytes=1 << 32)
+    search_index = SearchIndex()
+    job_cache.subscribe(search_index)
+    return [
+        patch.object(server, "job_cache", job_cache),
+        patch.object(server, "search_index", search_index),
+        patch.object(server, "search_cache", SearchResultCache()),
+        patch.object(server, "application_history", HistoryStore()),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated LinkedIn latency in seconds")
+    parser.add_argument("--catalogue", type=int, default=5000, help="postings served by the fake backend")
+    parser.add_argument("--history", type=int, default=10000, help="applications preloaded into the history")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression fraction")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(1)
+    catalogue = make_catalogue(args.catalogue)
+    n = args.iterations
+    results = {}
+
+    patches = fresh_state()
+    for p in patches:
+        p.start()
+    try:
+        with install(server, [FakeLinkedIn(catalogue, latency=args.latency)]):
+            def search(i):
+                return "search_jobs", {"title": rng.choice(TITLES), "limit": 10}
+
+            results.update([run("search_jobs.cold", n, search, server.search_cache.clear)])
+            results.update([run("search_jobs.warm", n, search)])
+
+            job_ids = [job_id for job_id in (job["job_id"] for job in catalogue) if job_id in server.job_cache]
+            results.update([run("get_job_details.cold", min(n, len(job_ids)),
+                                 lambda i: ("get_job_details", {"job_id": job_ids[i]}))])
+            results.update([run("get_job_details.warm", n,
+                                 lambda i: ("get_job_details", {"job_id": job_ids[i % len(job_ids)]}))])
+
+            results.update([run("apply_to_job", min(n, len(job_ids)),
+                                 lambda i: ("apply_to_job", {"job_id": job_ids[i], "allow_duplicate": True}))])
+
+            for i in range(args.history):
+                server.application_history.add({
+                    "job_id": str(i), "job_title": "DevOps Engineer", "company": f"Company {i % 500}",
+                    "applied_at": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00", "status": "applied",
+                })
+            results.update([run("get_application_history.page", n,
+                                 lambda i: ("get_application_history", {"limit": 10}))])
+            results.update([run("get_application_history.company", n,
+                                 lambda i: ("get_application_history",
+                                            {"limit": 10, "company": f"Company {i % 500}"}))])
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+    print(json.dumps(results, indent=2))
+    settings = {"iterations": n, "latency": args.latency, "catalogue": args.catalogue, "history": args.history}
+    if args.output:
+        write_results(args.output, "tools", settings, results)
+    if args.compare and compare(args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
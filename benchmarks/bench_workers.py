@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Multi-worker Throughput Benchmark
+Starts 1..N server worker processes that share state through the SQLite
+backend, each on its own port behind a round-robin client (standing in for
+a load balancer), and drives them with search -> details -> apply flows in
+which every step lands on a different worker than the step before. Reports
+throughput per worker count and the number of flows that failed because a
+worker did not know about a job another worker had cached.
+
+Usage: python benchmarks/bench_workers.py [--workers 1,2,4] [--concurrency 16] [--duration 5]
+                                          [--latency 0.02] [--backend sqlite|local]
+                                          [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from bench_common import compare, latency_summary, write_results
+from bench_search_index import TITLES
+from config_store import ConfigSnapshot
+from fake_linkedin import FakeLinkedIn, install, make_catalogue
+from load_test import Client
+
+
+def serve(directory, args, ports):
+    """Worker process: serve the Flask app backed by the chosen state backend and the fake LinkedIn"""
+    from werkzeug.serving import make_server
+
+    logging.disable(logging.WARNING)
+    server.config = ConfigSnapshot({
+        "state": {"backend": args.backend, "path": os.path.join(directory, "state.db")},
+        "storage": {"history_path": os.path.join(directory, "history.db")},
+    })
+    server.initialize_state()
+    server.initialize_cache()
+    server.initialize_history()
+    catalogue = make_catalogue(args.catalogue)
+    clients = [FakeLinkedIn(catalogue, latency=args.latency, seed=i) for i in range(args.sessions)]
+    with install(server, clients):
+        httpd = make_server("127.0.0.1", 0, server.app, threaded=True)
+        ports.put(httpd.server_port)
+        httpd.serve_forever()
+
+
+def drive(urls, concurrency, duration, seed):
+    """Run search -> details -> apply flows across the workers; return (summary, missing_jobs)"""
+    lock = threading.Lock()
+    samples = []
+    errors = [0]
+    missing = [0]
+    deadline = time.perf_counter() + duration
+
+    def flow(index):
+        rng = random.Random(seed * 1000 + index)
+        clients = [Client(url) for url in urls]
+        worker = index % len(urls)
+        local_samples, local_errors, local_missing = [], 0, 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, payload = clients[worker].invoke("search_jobs", {"title": rng.choice(TITLES), "limit": 10})
+            jobs = json.loads(payload).get("jobs") if status == 200 else None
+            if jobs:
+                job_id = rng.choice(jobs)["job_id"]
+                worker = (worker + 1) % len(urls)
+                status, _ = clients[worker].invoke("get_job_details", {"job_id": job_id})
+                local_missing += status == 404
+                worker = (worker + 1) % len(urls)
+                if status == 200:
+                    status, _ = clients[worker].invoke("apply_to_job", {"job_id": job_id, "allow_duplicate": True})
+                    local_missing += status == 404
+            local_samples.append(time.perf_counter() - start)
+            local_errors += status >= 400
+        with lock:
+            samples.extend(local_samples)
+            errors[0] += local_errors
+            missing[0] += local_missing
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=flow, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latency_summary(samples, time.perf_counter() - start, errors[0]), missing[0]
+
+
+def run(workers, args):
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as directory:
+        ports = context.Queue()
+        processes = [context.Process(target=serve, args=(directory, args, ports), daemon=True)
+                     for _ in range(workers)]
+        for process in processes:
+            process.start()
+        try:
+            urls = [f"http://127.0.0.1:{ports.get(timeout=30)}" for _ in processes]
+            summary, missing = drive(urls, args.concurrency, args.duration, args.seed)
+        finally:
+            for process in processes:
+                process.terminate()
+                process.join()
+    summary["flows_per_s"] = summary.pop("requests_per_s")
+    summary["flows"] = summary.pop("requests")
+    summary["missing_jobs"] = missing
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts to compare")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent client flows")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load per worker count")
+    parser.add_argument("--latency", type=float, default=0.02, help="fake LinkedIn latency in seconds")
+    parser.add_argument("--backend", default="sqlite", help="state.backend for the workers (sqlite or local)")
+    parser.add_argument("--sessions", type=int, default=8, help="fake LinkedIn sessions per worker")
+    parser.add_argument("--catalogue", type=int, default=2000, help="postings served by the fake backend")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression fraction")
+    args = parser.parse_args()
+
+    results = {"cpus": os.cpu_count()}
+    for workers in [int(count) for count in args.workers.split(",")]:
+        results[f"workers_{workers}"] = run(workers, args)
+    print(json.dumps(results, indent=2))
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    if args.output:
+        write_results(args.output, "workers", settings, results)
+    if args.compare and compare(args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Fake LinkedIn Backend
+Local stand-in for the LinkedIn API with configurable latency, jitter and
+error rate, serving a synthetic job catalogue. install() routes the
+server's upstream calls to it through a real LinkedInGateway, so pooling,
+rate limiting, retries and coalescing are all exercised.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_search_index import SKILLS, make_job
+from linkedin_gateway import LinkedInGateway
+
+
+class FakeLinkedInError(Exception):
+    """Injected upstream failure"""
+
+
+class FakeLinkedIn:
+    """
+    Simulated LinkedIn account.
+
+    Every call sleeps latency seconds plus up to jitter seconds and fails
+    with probability error_rate. Searches return up to page-size slices of a
+    catalogue of postings whose title contains the query.
+    """
+
+    def __init__(self, catalogue, latency=0.05, jitter=0.0, error_rate=0.0, seed=None):
+        self.catalogue = catalogue
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def _simulate(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + self._rng.random() * self.jitter
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeLinkedInError("injected LinkedIn failure")
+
+    def search_jobs(self, parameters, start=0, count=25):
+        self._simulate()
+        title = str(parameters.get("title") or "").lower()
+        matches = [job for job in self.catalogue if title in job["title"].lower()]
+        return [dict(job) for job in matches[start:start + count]]
+
+    def get_job(self, job_id):
+        self._simulate()
+        rng = random.Random(job_id)
+        return {
+            "full_description": f"About the role {job_id}: " + " ".join(rng.sample(SKILLS, 8)) * 20,
+            "skills_required": rng.sample(SKILLS, 6),
+            "salary_range": f"£{rng.randrange(40, 120)},000 - £{rng.randrange(120, 200)},000",
+        }
+
+    def apply(self, job_id, cover_letter, phone_number):
+        self._simulate()
+
+
+def make_catalogue(size, seed=7):
+    """Build a synthetic catalogue of size postings"""
+    rng = random.Random(seed)
+    return [make_job(i, rng) for i in range(size)]
+
+
+@contextmanager
+def install(server, clients, requests_per_minute=1e9, burst=1e9, max_retries=0, **gateway_kwargs):
+    """Route the server's upstream calls to the given FakeLinkedIn clients for the duration of the block"""
+    gateway = LinkedInGateway.from_clients(clients, requests_per_minute=requests_per_minute, burst=burst,
+                                           max_retries=max_retries, **gateway_kwargs)
+    with patch.object(server, "linkedin_client", gateway), \
+            patch.object(server, "_search_upstream",
+                         lambda client, parameters: client.search_jobs(parameters, 0, 25)), \
+            patch.object(server, "_search_upstream_page",
+                         lambda client, parameters, start, count: client.search_jobs(parameters, start, count)), \
+            patch.object(server, "_job_details_upstream", lambda client, job_id: client.get_job(job_id)), \
+            patch.object(server, "_apply_upstream",
+                         lambda client, job_id, cover_letter, phone_number:
+                         client.apply(job_id, cover_letter, phone_number)):
+        yield gateway
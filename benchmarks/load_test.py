@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Load Generator
+Drives /mcp/v1/invoke with a weighted mix of tool calls from concurrent
+keep-alive HTTP clients for a fixed duration and reports p50/p99 latency,
+throughput and errors per tool and overall.
+
+Without --url, the Flask app is started in-process on a free port with its
+upstream calls routed to the fake LinkedIn backend (--latency, --jitter,
+--error-rate). With --url, any running server (Flask or ASGI) is targeted.
+
+Usage: python benchmarks/load_test.py [--concurrency 32] [--duration 10]
+                                      [--mix search_jobs=60,get_job_details=25,apply_to_job=5,get_application_history=10]
+                                      [--url http://127.0.0.1:8080] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from bench_common import compare, latency_summary, write_results
+from bench_search_index import TITLES
+from fake_linkedin import FakeLinkedIn, install, make_catalogue
+from history_store import HistoryStore
+
+DEFAULT_MIX = "search_jobs=60,get_job_details=25,apply_to_job=5,get_application_history=10"
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+class Client:
+    """One keep-alive HTTP connection issuing tool invocations"""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._conn = None
+
+    def invoke(self, name, parameters):
+        body = json.dumps({"name": name, "parameters": parameters})
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self._host, self._port, timeout=60)
+            try:
+                self._conn.request("POST", "/mcp/v1/invoke", body, {"Content-Type": "application/json"})
+                response = self._conn.getresponse()
+                payload = response.read()
+                return response.status, payload
+            except (http.client.HTTPException, OSError):
+                self._conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+
+
+class LoadTest:
+    def __init__(self, base_url, weights, concurrency, duration, seed=1):
+        self.base_url = base_url
+        self.tools = list(weights)
+        self.weights = list(weights.values())
+        self.concurrency = concurrency
+        self.duration = duration
+        self.seed = seed
+        self.job_ids = []
+        self._lock = threading.Lock()
+        self._samples = {tool: [] for tool in self.tools}
+        self._errors = {tool: 0 for tool in self.tools}
+
+    def warm_up(self):
+        """Run one search per title so that job ids exist for the other tools"""
+        client = Client(self.base_url)
+        for title in TITLES:
+            status, payload = client.invoke("search_jobs", {"title": title, "limit": 50})
+            if status == 200:
+                self.job_ids.extend(job["job_id"] for job in json.loads(payload)["jobs"])
+        if not self.job_ids:
+            raise SystemExit("Warm-up searches returned no jobs; is the server configured?")
+
+    def parameters(self, tool, rng):
+        if tool == "search_jobs":
+            return {"title": rng.choice(TITLES), "limit": 10}
+        if tool == "get_job_details":
+            return {"job_id": rng.choice(self.job_ids)}
+        if tool == "apply_to_job":
+            return {"job_id": rng.choice(self.job_ids), "allow_duplicate": True}
+        return {"limit": 10}
+
+    def worker(self, index, deadline):
+        rng = random.Random(self.seed * 1000 + index)
+        client = Client(self.base_url)
+        samples = {tool: [] for tool in self.tools}
+        errors = {tool: 0 for tool in self.tools}
+        while time.perf_counter() < deadline:
+            tool = rng.choices(self.tools, self.weights)[0]
+            start = time.perf_counter()
+            try:
+                status, _ = client.invoke(tool, self.parameters(tool, rng))
+            except (http.client.HTTPException, OSError):
+                status = 599
+            samples[tool].append(time.perf_counter() - start)
+            errors[tool] += status >= 400
+        with self._lock:
+            for tool in self.tools:
+                self._samples[tool].extend(samples[tool])
+                self._errors[tool] += errors[tool]
+
+    def run(self):
+        self.warm_up()
+        deadline = time.perf_counter() + self.duration
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self.worker, args=(i, deadline)) for i in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        results = {tool: latency_summary(self._samples[tool], elapsed, self._errors[tool]) for tool in self.tools}
+        results["overall"] = latency_summary([s for samples in self._samples.values() for s in samples],
+                                             elapsed, sum(self._errors.values()))
+        return results
+
+
+def start_local_server(stack, args):
+    """Serve the Flask app on a free local port backed by the fake LinkedIn backend; return its URL"""
+    from werkzeug.serving import make_server
+
+    catalogue = make_catalogue(args.catalogue)
+    clients = [FakeLinkedIn(catalogue, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=i)
+               for i in range(args.sessions)]
+    stack.enter_context(install(server, clients))
+    server.application_history = HistoryStore()
+    httpd = make_server("127.0.0.1", 0, server.app, threaded=True)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    stack.callback(httpd.shutdown)
+    return f"http://127.0.0.1:{httpd.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server; default starts one in-process")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="comma-separated tool=weight pairs")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake LinkedIn latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="extra random fake LinkedIn latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of fake LinkedIn calls that fail")
+    parser.add_argument("--sessions", type=int, default=8, help="fake LinkedIn sessions in the gateway pool")
+    parser.add_argument("--catalogue", type=int, default=5000, help="postings served by the fake backend")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression fraction")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    with ExitStack() as stack:
+        base_url = args.url or start_local_server(stack, args)
+        results = LoadTest(base_url, parse_mix(args.mix), args.concurrency, args.duration, args.seed).run()
+
+    print(json.dumps(results, indent=2))
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    if args.output:
+        write_results(args.output, "load", settings, results)
+    if args.compare and compare(args.compare, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
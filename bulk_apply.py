@@ -0,0 +1,265 @@
+"""
+Bulk Apply
+Runs many job applications through a bounded worker pool and checkpoints
+every outcome to an append-only file, so an interrupted run can be resumed
+without re-applying to jobs that already have a final outcome.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = ".bulk_apply"
+DEFAULT_MAX_PARALLELISM = 4
+DEFAULT_MAX_JOBS = 100
+
+# Outcomes that are final; anything else is retried when a run resumes
+FINAL_OUTCOMES = frozenset(("applied", "duplicate", "not_found", "invalid"))
+
+_RUN_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class BulkApplyError(ValueError):
+    """Raised for an unknown or malformed run id"""
+
+
+class InvalidRunId(BulkApplyError):
+    """Raised when a run id is not one this store could have issued"""
+
+
+class RunInProgress(BulkApplyError):
+    """Raised when a run is resumed while it is still executing"""
+
+
+def classify(status_code):
+    """Map an apply_to_job HTTP status to a bulk apply outcome"""
+    if status_code == 200:
+        return "applied"
+    if status_code == 409:
+        return "duplicate"
+    if status_code == 404:
+        return "not_found"
+    if status_code == 400:
+        return "invalid"
+    return "failed"
+
+
+class BulkApplyRun:
+    """
+    One bulk apply run backed by a JSON-lines checkpoint file.
+
+    The first line records the jobs and options; each following line is one
+    job outcome. A trailing partial line left by a crash is ignored, and a
+    later outcome for the same job supersedes an earlier one.
+    """
+
+    def __init__(self, path, run_id, jobs, options, created_at, outcomes=None, finished=False):
+        self.path = path
+        self.run_id = run_id
+        self.jobs = jobs
+        self.options = options
+        self.created_at = created_at
+        self.outcomes = outcomes or {}
+        self.finished = finished
+        self._lock = threading.Lock()
+
+    def _append(self, record):
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            with open(self.path, "a") as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def record(self, outcome):
+        """Checkpoint the outcome of one job"""
+        self._append(outcome)
+        with self._lock:
+            self.outcomes[outcome["job_id"]] = outcome
+
+    def refresh(self, latest):
+        """Adopt the outcomes checkpointed since this run was loaded, from a fresh load of it"""
+        with self._lock:
+            self.outcomes = latest.outcomes
+            self.finished = latest.finished
+
+    def finish(self):
+        """Mark the run complete once every job has a final outcome"""
+        self._append({"finished": True})
+        self.finished = True
+
+    def pending(self):
+        """Return the jobs that still need an application attempt, in order"""
+        with self._lock:
+            return [job for job in self.jobs
+                    if self.outcomes.get(job["job_id"], {}).get("outcome") not in FINAL_OUTCOMES]
+
+    def results(self):
+        """Return the latest outcome of every job, in run order"""
+        with self._lock:
+            return [self.outcomes.get(job["job_id"], {"job_id": job["job_id"], "outcome": "pending"})
+                    for job in self.jobs]
+
+    def summary(self):
+        counts = {}
+        for result in self.results():
+            counts[result["outcome"]] = counts.get(result["outcome"], 0) + 1
+        return counts
+
+
+class CheckpointStore:
+    """Directory of bulk apply checkpoint files, one per run, readable by the owner only"""
+
+    def __init__(self, directory=DEFAULT_CHECKPOINT_DIR, clock=time.time):
+        self.directory = directory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._active = set()
+
+    @classmethod
+    def from_config(cls, bulk_config):
+        """Build a store from the optional 'bulk_apply' section of config.yaml"""
+        bulk_config = bulk_config or {}
+        return cls(bulk_config.get("checkpoint_dir", DEFAULT_CHECKPOINT_DIR))
+
+    @contextmanager
+    def running(self, run):
+        """
+        Hold run for the duration of an execution so it cannot be resumed twice at once.
+
+        Besides this process's own bookkeeping, an exclusive flock on the
+        checkpoint file keeps other worker processes sharing the directory
+        from executing the run at the same time. Once held, the run is
+        refreshed from its checkpoint, so outcomes another process recorded
+        in the meantime are not applied to again.
+        """
+        with self._lock:
+            if run.run_id in self._active:
+                raise RunInProgress(f"Run {run.run_id} is already in progress")
+            self._active.add(run.run_id)
+        lock = None
+        try:
+            lock = open(run.path, "rb")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise RunInProgress(f"Run {run.run_id} is already in progress in another process")
+            run.refresh(self.load(run.run_id))
+            yield run
+        finally:
+            if lock is not None:
+                lock.close()
+            with self._lock:
+                self._active.discard(run.run_id)
+
+    def _path(self, run_id):
+        if not isinstance(run_id, str) or not _RUN_ID.match(run_id):
+            raise InvalidRunId(f"Invalid run_id: {run_id!r}")
+        return os.path.join(self.directory, f"{run_id}.jsonl")
+
+    def create(self, jobs, options):
+        """Start a new run over jobs (dicts with at least job_id)"""
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        run_id = uuid.uuid4().hex
+        path = self._path(run_id)
+        created_at = self._clock()
+        header = {"run_id": run_id, "jobs": jobs, "options": options, "created_at": created_at}
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as file:
+            file.write(json.dumps(header) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        return BulkApplyRun(path, run_id, jobs, options, created_at)
+
+    def load(self, run_id):
+        """Load a run and its checkpointed outcomes"""
+        path = self._path(run_id)
+        try:
+            with open(path) as file:
+                lines = file.read().split("\n")
+        except FileNotFoundError:
+            raise BulkApplyError(f"Unknown run_id: {run_id}")
+        except (OSError, ValueError) as e:
+            raise BulkApplyError(f"Checkpoint of run {run_id} is unreadable: {e}")
+        try:
+            header = json.loads(lines[0])
+            run_id, jobs, options, created_at = (header["run_id"], header["jobs"], header["options"],
+                                                 header["created_at"])
+        except (ValueError, TypeError, KeyError) as e:
+            raise BulkApplyError(f"Checkpoint of run {run_id} has a corrupt header: {e!r}")
+        outcomes = {}
+        finished = False
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Empty final line, or a write interrupted by a crash
+                continue
+            if record.get("finished"):
+                finished = True
+            elif "job_id" in record:
+                outcomes[record["job_id"]] = record
+        return BulkApplyRun(path, run_id, jobs, options, created_at, outcomes, finished)
+
+    def incomplete(self):
+        """Return the runs that were interrupted before finishing"""
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            return []
+        runs = []
+        for name in names:
+            run_id, extension = os.path.splitext(name)
+            if extension != ".jsonl" or not _RUN_ID.match(run_id):
+                continue
+            try:
+                run = self.load(run_id)
+            except BulkApplyError as e:
+                logger.warning(f"Skipping unreadable bulk apply checkpoint {name}: {e}")
+                continue
+            if not run.finished:
+                runs.append(run)
+        return runs
+
+
+def execute(run, apply, max_parallelism=DEFAULT_MAX_PARALLELISM):
+    """
+    Apply to every pending job of run on at most max_parallelism threads.
+
+    apply(job) returns (payload, status_code) like dispatch_tool. Each
+    outcome is checkpointed as soon as it is known; the run is marked
+    finished once no job is left to retry. Returns the run's results.
+    """
+    def apply_one(job):
+        try:
+            payload, status_code = apply(job)
+        except Exception as e:
+            logger.error(f"Bulk apply to {job['job_id']} failed: {e}")
+            payload, status_code = {"error": str(e)}, 500
+        outcome = {"job_id": job["job_id"], "outcome": classify(status_code), "http_status": status_code}
+        if status_code == 200:
+            outcome["applied_at"] = payload.get("application", {}).get("applied_at")
+        elif "error" in payload:
+            outcome["error"] = payload["error"]
+        if status_code == 409:
+            outcome["duplicate_of"] = payload.get("duplicate_of")
+        run.record(outcome)
+        return outcome
+
+    pending = run.pending()
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallelism, len(pending))),
+                                thread_name_prefix="bulk-apply") as pool:
+            list(pool.map(apply_one, pending))
+    if not run.pending() and not run.finished:
+        run.finish()
+    return run.results()
@@ -0,0 +1,233 @@
+"""
+Config Store
+Parses and validates config.yaml into an immutable snapshot, and watches
+the file so that a changed configuration is swapped in atomically while the
+server runs. Sections that did not change keep their previous frozen
+objects, so subsystems can tell cheaply which sections they must reload.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config.yaml"
+DEFAULT_RELOAD_INTERVAL = 2.0
+
+# Top-level keys whose value must be a mapping when present
+MAPPING_SECTIONS = ("linkedin", "personal_info", "job_preferences", "cache", "search_cache", "storage",
+                    "gateway", "session_cache", "prefetch", "metrics", "http", "batch", "search", "asgi",
+                    "bulk_apply", "cover_letters", "config_reload", "state", "ranking",
+                    "dedup", "startup", "audit")
+
+# Top-level keys whose value must be a string when present
+STRING_KEYS = ("default_cover_letter", "phone_number", "resume_path")
+
+# Setting name suffixes that must hold a non-negative number
+_NUMERIC_SUFFIXES = ("_seconds", "_size", "_entries", "_bytes", "_days", "_concurrency", "_parallelism",
+                     "_jobs", "_per_run", "_per_minute", "_retries", "_segments", "_threshold", "_timeout",
+                     "_workers")
+
+# Of those, settings that size pages or pools and must be at least 1
+_POSITIVE_SUFFIXES = ("page_size", "_concurrency", "_parallelism", "_workers")
+
+
+class ConfigError(ValueError):
+    """Raised when config.yaml cannot be parsed or fails validation"""
+
+
+def freeze(value):
+    """Return a read-only copy of a parsed YAML value"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _digest(value):
+    encoded = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate(raw):
+    """Check a parsed config.yaml and raise ConfigError listing every problem found"""
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, Mapping):
+        raise ConfigError("config.yaml must contain a mapping")
+    errors = []
+    for key in STRING_KEYS:
+        if key in raw and raw[key] is not None and not isinstance(raw[key], str):
+            errors.append(f"{key} must be a string")
+    for section in MAPPING_SECTIONS:
+        value = raw.get(section)
+        if value is None:
+            continue
+        if not isinstance(value, Mapping):
+            errors.append(f"{section} must be a mapping")
+            continue
+        for key, setting in value.items():
+            name = f"{section}.{key}"
+            if key == "enabled" and not isinstance(setting, bool):
+                errors.append(f"{name} must be true or false")
+            elif str(key).endswith(_NUMERIC_SUFFIXES) and setting is not None \
+                    and not (_is_number(setting) and setting >= 0):
+                errors.append(f"{name} must be a non-negative number")
+            elif str(key).endswith(_POSITIVE_SUFFIXES) and setting is not None and setting < 1:
+                errors.append(f"{name} must be at least 1")
+    preferences = raw.get("job_preferences")
+    if isinstance(preferences, Mapping):
+        for key in ("titles", "locations", "skills"):
+            values = preferences.get(key)
+            if values is not None and not (isinstance(values, list) and all(isinstance(v, str) for v in values)):
+                errors.append(f"job_preferences.{key} must be a list of strings")
+    if errors:
+        raise ConfigError("Invalid configuration: " + "; ".join(errors))
+    return raw
+
+
+class ConfigSnapshot(Mapping):
+    """
+    An immutable, validated view of config.yaml.
+
+    Sections are frozen mappings and tuples. Building a snapshot from a
+    previous one reuses the previous frozen object for every section whose
+    content is unchanged.
+    """
+
+    __slots__ = ("_sections", "_digests", "version", "loaded_at")
+
+    def __init__(self, raw=None, previous=None, clock=time.time):
+        raw = validate(raw)
+        self._sections = {}
+        self._digests = {}
+        for key, value in raw.items():
+            digest = _digest(value)
+            if previous is not None and previous._digests.get(key) == digest:
+                self._sections[key] = previous._sections[key]
+            else:
+                self._sections[key] = freeze(value)
+            self._digests[key] = digest
+        self.version = previous.version + 1 if previous is not None else 1
+        self.loaded_at = clock()
+
+    def __getitem__(self, key):
+        return self._sections[key]
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+    def get(self, key, default=None):
+        return self._sections.get(key, default)
+
+    def changed_sections(self, previous):
+        """Return the top-level keys added, removed or changed since previous"""
+        keys = set(self._digests) | set(previous._digests)
+        return sorted(key for key in keys if self._digests.get(key) != previous._digests.get(key))
+
+
+def load_snapshot(path=DEFAULT_CONFIG_PATH, previous=None):
+    """Read, parse and validate path into a ConfigSnapshot"""
+    with open(path, "r") as file:
+        try:
+            raw = yaml.safe_load(file)
+        except yaml.YAMLError as e:
+            raise ConfigError(f"Cannot parse {path}: {e}")
+    return ConfigSnapshot(raw, previous)
+
+
+class ConfigWatcher:
+    """
+    Background thread that polls config.yaml for changes.
+
+    When the file's modification time, size or inode changes, it is loaded
+    into a new snapshot and on_change(previous, snapshot, changed_sections)
+    is called. A file that fails to parse or validate is logged and the
+    current snapshot stays in place.
+    """
+
+    def __init__(self, path, snapshot, on_change, interval=DEFAULT_RELOAD_INTERVAL):
+        self.path = path
+        self.snapshot = snapshot
+        self.on_change = on_change
+        self.interval = interval
+        self.reloads = 0
+        self.errors = 0
+        self.last_error = None
+        self._signature = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, path, snapshot, on_change):
+        """Build a watcher from the optional 'config_reload' section, or return None when disabled"""
+        reload_config = snapshot.get("config_reload") or {}
+        if not reload_config.get("enabled", True):
+            return None
+        return cls(path, snapshot, on_change, reload_config.get("interval_seconds", DEFAULT_RELOAD_INTERVAL))
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def check(self):
+        """Reload the file if it changed since the last check; return the changed sections"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return []
+        self._signature = signature
+        try:
+            snapshot = load_snapshot(self.path, self.snapshot)
+        except (OSError, ConfigError) as e:
+            self.errors += 1
+            self.last_error = str(e)
+            logger.error(f"Keeping the current configuration: {e}")
+            return []
+        previous, self.snapshot = self.snapshot, snapshot
+        changed = snapshot.changed_sections(previous)
+        if changed:
+            self.reloads += 1
+            logger.info(f"Configuration reloaded (version {snapshot.version}, changed: {', '.join(changed)})")
+            self.on_change(previous, snapshot, changed)
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                logger.error(f"Configuration reload failed: {e}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
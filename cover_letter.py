@@ -0,0 +1,146 @@
+"""
+Cover Letter Templates
+Compiles cover-letter templates with [PLACEHOLDER] fields once, renders
+them per job in a single pass from the job record and personal_info, and
+caches rendered letters per (template, job).
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_MAX_TEMPLATES = 64
+
+_PLACEHOLDER = re.compile(r"\[([A-Z][A-Z_]*)\]")
+
+# Placeholders filled from the job being applied to, and the job field each reads
+JOB_FIELDS = {
+    "JOB_TITLE": "title",
+    "COMPANY_NAME": "company",
+    "JOB_LOCATION": "location",
+}
+
+# Placeholders filled from the personal_info section of config.yaml
+PERSONAL_FIELDS = {
+    "YOUR_NAME": "name",
+    "YOUR_EMAIL": "email",
+    "YOUR_PHONE": "phone_number",
+    "YOUR_LOCATION": "location",
+    "YOUR_LINKEDIN": "linkedin_profile",
+    "YOUR_GITHUB": "github_profile",
+}
+
+
+class CoverLetterTemplate:
+    """
+    A template split once into literal text and placeholder slots.
+
+    Rendering fills the slots of a copy of the pieces and joins them in one
+    pass. Placeholders without a value are left in the letter as written.
+    """
+
+    __slots__ = ("text", "_pieces", "_slots", "job_fields")
+
+    def __init__(self, text):
+        self.text = text
+        self._pieces = _PLACEHOLDER.split(text)
+        self._slots = tuple((index, self._pieces[index]) for index in range(1, len(self._pieces), 2))
+        for index, name in self._slots:
+            self._pieces[index] = f"[{name}]"
+        self.job_fields = tuple(dict.fromkeys(name for _, name in self._slots if name in JOB_FIELDS))
+
+    def render(self, values):
+        """Substitute values (placeholder name to text) into the template"""
+        if not self._slots:
+            return self.text
+        parts = self._pieces.copy()
+        for index, name in self._slots:
+            value = values.get(name)
+            if value is not None:
+                parts[index] = str(value)
+        return "".join(parts)
+
+
+class CoverLetterRenderer:
+    """
+    Renders cover letters for jobs with compiled-template and output caches.
+
+    Templates are compiled once per distinct text; the configured default
+    is compiled up front. Rendered letters are cached per (template, job_id)
+    and reused while the job's title, company and location are unchanged.
+    """
+
+    def __init__(self, default_template="", personal_info=None, cache_size=DEFAULT_CACHE_SIZE,
+                 max_templates=DEFAULT_MAX_TEMPLATES):
+        self.cache_size = cache_size
+        self.max_templates = max_templates
+        self._personal = {placeholder: value for placeholder, key in PERSONAL_FIELDS.items()
+                          if (value := (personal_info or {}).get(key))}
+        self._lock = threading.Lock()
+        self._templates = OrderedDict()
+        self._rendered = OrderedDict()
+        self.default = self.compile(default_template or "")
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Compile the default_cover_letter template and read personal_info from config.yaml"""
+        config = config or {}
+        letters_config = config.get("cover_letters") or {}
+        personal_info = dict(config.get("personal_info") or {})
+        personal_info.setdefault("phone_number", config.get("phone_number"))
+        return cls(
+            config.get("default_cover_letter", ""),
+            personal_info,
+            cache_size=letters_config.get("cache_size", DEFAULT_CACHE_SIZE),
+            max_templates=letters_config.get("max_templates", DEFAULT_MAX_TEMPLATES),
+        )
+
+    def compile(self, text):
+        """Return the compiled template for text, compiling it only the first time it is seen"""
+        with self._lock:
+            template = self._templates.get(text)
+            if template is not None:
+                self._templates.move_to_end(text)
+                return template
+        template = CoverLetterTemplate(text)
+        with self._lock:
+            template = self._templates.setdefault(text, template)
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+        return template
+
+    def render(self, job, text=None):
+        """Render the letter for job from text, or from the default template when text is None"""
+        template = self.default if text is None else self.compile(text)
+        fingerprint = tuple(job.get(JOB_FIELDS[name]) for name in template.job_fields)
+        key = (template.text, job["job_id"])
+        with self._lock:
+            cached = self._rendered.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                self._rendered.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        values = dict(self._personal)
+        values.update(zip(template.job_fields, fingerprint))
+        letter = template.render(values)
+        if not self.cache_size:
+            return letter
+        with self._lock:
+            self._rendered[key] = (fingerprint, letter)
+            self._rendered.move_to_end(key)
+            while len(self._rendered) > self.cache_size:
+                self._rendered.popitem(last=False)
+        return letter
+
+    def stats(self):
+        with self._lock:
+            return {
+                "templates": len(self._templates),
+                "cached_letters": len(self._rendered),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
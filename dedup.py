@@ -0,0 +1,225 @@
+"""
+Duplicate Detection
+Groups near-duplicate cached job postings, such as reposts and
+multi-location listings of one role. Each posting gets a MinHash signature
+over word shingles of its title, company and description, and
+locality-sensitive hashing over bands of the signature finds candidate
+duplicates without comparing every posting with every other. Only postings
+of the same company with similar titles are grouped, so employers sharing
+a boilerplate description stay apart.
+"""
+
+import functools
+import itertools
+import threading
+import zlib
+
+import numpy as np
+
+from search_index import tokenize
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+DEFAULT_NUM_PERMUTATIONS = 64
+DEFAULT_BANDS = 16
+SHINGLE_SIZE = 3
+# Jaccard similarity of title words at which two postings can be one role
+TITLE_SIMILARITY_THRESHOLD = 0.5
+
+# Fixed seed, so signatures agree between processes and restarts
+_SEED = 20240601
+
+
+# Odd multiplier combining the hashes of a shingle's words into one 64-bit value
+_SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+@functools.lru_cache(maxsize=65536)
+def _word_hash(token):
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def shingles(text):
+    """Return the hashes of the overlapping SHINGLE_SIZE-word shingles of text as a uint64 array"""
+    tokens = tokenize(text)
+    words = np.fromiter(map(_word_hash, tokens), dtype=np.uint64, count=len(tokens))
+    if len(words) < SHINGLE_SIZE:
+        # A short text is a single shingle, padded with zeros
+        words = np.concatenate([words, np.zeros(SHINGLE_SIZE - len(words), dtype=np.uint64)])
+    count = len(words) - SHINGLE_SIZE + 1
+    hashes = words[:count]
+    for offset in range(1, SHINGLE_SIZE):
+        hashes = hashes * _SHINGLE_MULTIPLIER + words[offset:offset + count]
+    return hashes
+
+
+def posting_text(job):
+    """Return the text a posting's signature is computed from"""
+    description = job.get("full_description") or job.get("description_snippet") or ""
+    return f"{job.get('title') or ''} {job.get('company') or ''} {description}"
+
+
+def posting_identity(job):
+    """Return the normalized company and title words of a posting"""
+    return " ".join(tokenize(job.get("company"))), frozenset(tokenize(job.get("title")))
+
+
+def same_role(first, second):
+    """Return whether two posting identities can belong to the same role"""
+    (first_company, first_title), (second_company, second_title) = first, second
+    if first_company != second_company:
+        return False
+    if not first_title or not second_title:
+        return first_title == second_title
+    return len(first_title & second_title) / len(first_title | second_title) >= TITLE_SIMILARITY_THRESHOLD
+
+
+class MinHasher:
+    """Computes MinHash signatures with a family of multiply-shift hash functions"""
+
+    def __init__(self, num_permutations=DEFAULT_NUM_PERMUTATIONS, seed=_SEED):
+        rng = np.random.default_rng(seed)
+        self.num_permutations = num_permutations
+        self._a = rng.integers(1, 2 ** 63, size=(num_permutations, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=(num_permutations, 1), dtype=np.uint64)
+
+    def signature(self, hashes):
+        """Return the signature of an array of shingle hashes as a uint32 array"""
+        if not len(hashes):
+            return np.full(self.num_permutations, np.iinfo(np.uint32).max, dtype=np.uint32)
+        # Products wrap modulo 2**64; the high 32 bits are the hash
+        return ((self._a * hashes + self._b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+class DuplicateIndex:
+    """
+    Thread-safe grouping of near-duplicate postings.
+
+    It implements the JobCache listener interface (add/remove/clear). A
+    posting joins the group of its most similar indexed posting of the same
+    role (same company, similar title) when their estimated Jaccard
+    similarity reaches the threshold, and starts its own group otherwise.
+    """
+
+    def __init__(self, threshold=DEFAULT_SIMILARITY_THRESHOLD, num_permutations=DEFAULT_NUM_PERMUTATIONS,
+                 bands=DEFAULT_BANDS):
+        if num_permutations % bands:
+            raise ValueError("num_permutations must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self._rows = num_permutations // bands
+        self._hasher = MinHasher(num_permutations)
+        self._group_ids = itertools.count()
+        self._lock = threading.Lock()
+        self.clear()
+
+    @classmethod
+    def from_config(cls, dedup_config):
+        """Build an index from the optional 'dedup' section of config.yaml"""
+        dedup_config = dedup_config or {}
+        return cls(threshold=dedup_config.get("similarity_threshold", DEFAULT_SIMILARITY_THRESHOLD))
+
+    def clear(self):
+        with self._lock:
+            self._signatures = {}
+            self._identities = {}
+            self._fingerprints = {}
+            self._buckets = {}
+            self._group_of = {}
+            self._groups = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self._rows:(band + 1) * self._rows].tobytes())
+                for band in range(self.bands)]
+
+    def add(self, job):
+        """Sign a posting and place it in a duplicate group, unless its text is unchanged"""
+        job_id = job["job_id"]
+        text = posting_text(job)
+        fingerprint = hash(text)
+        if self._fingerprints.get(job_id) == fingerprint:
+            return
+        signature = self._hasher.signature(shingles(text))
+        identity = posting_identity(job)
+        with self._lock:
+            if job_id in self._signatures:
+                self._remove(job_id)
+            best, best_similarity = None, self.threshold
+            band_keys = self._band_keys(signature)
+            candidates = set()
+            for key in band_keys:
+                candidates.update(self._buckets.get(key, ()))
+            for candidate in candidates:
+                if not same_role(self._identities[candidate], identity):
+                    continue
+                similarity = np.count_nonzero(self._signatures[candidate] == signature) / len(signature)
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
+            group = self._group_of[best] if best is not None else next(self._group_ids)
+            self._groups.setdefault(group, []).append(job_id)
+            self._group_of[job_id] = group
+            self._signatures[job_id] = signature
+            self._identities[job_id] = identity
+            self._fingerprints[job_id] = fingerprint
+            for key in band_keys:
+                self._buckets.setdefault(key, set()).add(job_id)
+
+    def _remove(self, job_id):
+        signature = self._signatures.pop(job_id)
+        self._identities.pop(job_id, None)
+        self._fingerprints.pop(job_id, None)
+        for key in self._band_keys(signature):
+            bucket = self._buckets[key]
+            bucket.discard(job_id)
+            if not bucket:
+                del self._buckets[key]
+        group = self._group_of.pop(job_id)
+        members = self._groups[group]
+        members.remove(job_id)
+        if not members:
+            del self._groups[group]
+
+    def remove(self, job_id):
+        with self._lock:
+            if job_id in self._signatures:
+                self._remove(job_id)
+
+    def duplicates(self, job_id):
+        """Return the other postings in job_id's group, in the order they were indexed"""
+        with self._lock:
+            group = self._group_of.get(job_id)
+            if group is None:
+                return []
+            return [member for member in self._groups[group] if member != job_id]
+
+    def collapse(self, job_ids):
+        """
+        Keep the first posting of each duplicate group in job_ids.
+
+        Returns (job_id, duplicates) pairs in the original order, where
+        duplicates lists the other indexed postings of the same group.
+        """
+        with self._lock:
+            seen = set()
+            kept = []
+            for job_id in job_ids:
+                group = self._group_of.get(job_id)
+                if group is None:
+                    kept.append((job_id, []))
+                    continue
+                if group in seen:
+                    continue
+                seen.add(group)
+                kept.append((job_id, [member for member in self._groups[group] if member != job_id]))
+            return kept
+
+    def stats(self):
+        """Return the number of indexed postings, duplicate groups and postings that duplicate another"""
+        with self._lock:
+            return {
+                "postings": len(self._signatures),
+                "groups": len(self._groups),
+                "duplicates": len(self._signatures) - len(self._groups),
+            }
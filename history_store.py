@@ -0,0 +1,398 @@
+"""
+Application History Store
+Durable, indexed storage for job applications backed by SQLite in WAL mode.
+"""
+
+import base64
+import datetime
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+DEFAULT_HISTORY_PATH = "application_history.db"
+
+COLUMNS = ("job_id", "job_title", "company", "applied_at", "status", "cover_letter", "phone_number")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    job_title TEXT,
+    company TEXT,
+    applied_at TEXT NOT NULL,
+    status TEXT,
+    cover_letter TEXT,
+    phone_number TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications (job_id);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company COLLATE NOCASE, applied_at);
+CREATE INDEX IF NOT EXISTS idx_applications_applied_at ON applications (applied_at, id);
+CREATE TABLE IF NOT EXISTS reservations (
+    token TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    fingerprint TEXT,
+    created_at REAL NOT NULL
+);
+"""
+
+# Reservations older than this are left over from a crashed process and ignored
+RESERVATION_TTL_SECONDS = 600
+
+# Duplicate reason for a job whose application has been reserved but not recorded yet
+IN_PROGRESS = "application in progress"
+
+
+# Outcomes that do not count as having applied, so the job may be retried
+RETRYABLE_STATUSES = frozenset({"failed", "error"})
+
+COMPANY_SUFFIXES = frozenset({"ltd", "limited", "inc", "incorporated", "llc", "plc", "gmbh", "corp",
+                              "corporation", "co", "company", "group"})
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+
+_DATE_ONLY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+_INSERT = f"INSERT INTO applications ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+class Reservation:
+    """A claim on a job, and its company/title fingerprint, for an application in progress"""
+
+    __slots__ = ("token", "job_id", "fingerprint")
+
+    def __init__(self, job_id, fingerprint):
+        self.token = uuid.uuid4().hex
+        self.job_id = job_id
+        self.fingerprint = fingerprint
+
+
+class DuplicateApplication(Exception):
+    """Raised when an application duplicates one already in the history"""
+
+    def __init__(self, job_id, duplicate_of, reason):
+        self.job_id = job_id
+        self.duplicate_of = duplicate_of
+        self.reason = reason
+        if reason == IN_PROGRESS:
+            super().__init__(f"An application to job {duplicate_of} is already in progress")
+        else:
+            super().__init__(f"Already applied to job {duplicate_of} ({reason})")
+
+
+def job_fingerprint(company, title):
+    """Fingerprint a posting by normalized company and title to catch reposts under new IDs"""
+    company_words = [word for word in _NON_WORD.split((company or "").lower()) if word]
+    while company_words and company_words[-1] in COMPANY_SUFFIXES:
+        company_words.pop()
+    title_words = [word for word in _NON_WORD.split((title or "").lower()) if word]
+    if not company_words or not title_words:
+        return None
+    return " ".join(company_words) + "|" + " ".join(title_words)
+
+
+def until_clause(until):
+    """
+    Return the SQL condition and parameter for an inclusive upper bound on applied_at.
+
+    A date-only bound covers the whole day: applications before the start
+    of the next day match.
+    """
+    if _DATE_ONLY.match(until):
+        try:
+            next_day = datetime.date.fromisoformat(until) + datetime.timedelta(days=1)
+            return "applied_at < ?", next_day.isoformat()
+        except ValueError:
+            pass
+    return "applied_at <= ?", until
+
+
+def encode_cursor(applied_at, row_id):
+    """Encode the position after a row as an opaque cursor token"""
+    raw = json.dumps([applied_at, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor token into (applied_at, row_id)"""
+    try:
+        applied_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(applied_at), int(row_id)
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+
+
+class HistoryStore:
+    """
+    Thread-safe application history persisted to SQLite.
+
+    Applications are returned newest first and paginated with keyset cursors
+    on (applied_at, id), so every page is an index range scan regardless of
+    how large the history grows. Applied job IDs and company/title
+    fingerprints are also held in memory for constant-time duplicate checks.
+    reserve() claims a job before the application is sent, so concurrent
+    applications to the same job cannot both get past the duplicate check.
+
+    With shared=True several processes may use the same database file: each
+    catches its in-memory index up with rows written by the others before
+    checking for duplicates, and the check and insert run in one write
+    transaction so two workers cannot both record the same application.
+    Their reservations are rows in the database, shared the same way.
+    """
+
+    def __init__(self, path=":memory:", shared=False):
+        self.path = path
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._applied_job_ids = set()
+        self._fingerprints = {}
+        self._reserved_job_ids = set()
+        self._reserved_fingerprints = {}
+        self._total = 0
+        self._last_id = 0
+        self._catch_up()
+
+    def _catch_up(self):
+        """Index the rows added since the last one this store has seen"""
+        rows = self._conn.execute("SELECT id, job_id, company, job_title, status FROM applications "
+                                  "WHERE id > ? ORDER BY id", (self._last_id,))
+        for row_id, job_id, company, job_title, status in rows:
+            self._total += 1
+            self._last_id = row_id
+            self._index(job_id, company, job_title, status)
+
+    def _index(self, job_id, company, job_title, status):
+        if status in RETRYABLE_STATUSES:
+            return
+        self._applied_job_ids.add(job_id)
+        fingerprint = job_fingerprint(company, job_title)
+        if fingerprint is not None:
+            self._fingerprints.setdefault(fingerprint, job_id)
+
+    def _find_duplicate(self, job_id, company, job_title):
+        if job_id in self._applied_job_ids:
+            return job_id, "job_id"
+        fingerprint = job_fingerprint(company, job_title)
+        duplicate_of = self._fingerprints.get(fingerprint)
+        if duplicate_of is not None:
+            return duplicate_of, "same company and title"
+        reserved = self._find_reserved(job_id, fingerprint)
+        if reserved is not None:
+            return reserved, IN_PROGRESS
+        return None
+
+    def _find_reserved(self, job_id, fingerprint):
+        if not self.shared:
+            if job_id in self._reserved_job_ids:
+                return job_id
+            return self._reserved_fingerprints.get(fingerprint)
+        row = self._conn.execute("SELECT job_id FROM reservations WHERE (job_id = ? OR fingerprint = ?) "
+                                 "AND created_at > ? LIMIT 1",
+                                 (job_id, fingerprint, time.time() - RESERVATION_TTL_SECONDS)).fetchone()
+        return row[0] if row is not None else None
+
+    def reserve(self, job_id, company=None, job_title=None):
+        """
+        Claim a job for an application about to be sent and return the Reservation.
+
+        Raises DuplicateApplication if the job, or a posting with the same
+        company and title, was applied to or is reserved. Pass the
+        reservation to add() once the application is made, or to release()
+        if it fails.
+        """
+        reservation = Reservation(job_id, job_fingerprint(company, job_title))
+        with self._lock:
+            if not self.shared:
+                duplicate = self._find_duplicate(job_id, company, job_title)
+                if duplicate is not None:
+                    raise DuplicateApplication(job_id, *duplicate)
+                self._reserved_job_ids.add(job_id)
+                if reservation.fingerprint is not None:
+                    self._reserved_fingerprints[reservation.fingerprint] = job_id
+                return reservation
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._catch_up()
+                self._conn.execute("DELETE FROM reservations WHERE created_at <= ?",
+                                   (time.time() - RESERVATION_TTL_SECONDS,))
+                duplicate = self._find_duplicate(job_id, company, job_title)
+                if duplicate is not None:
+                    raise DuplicateApplication(job_id, *duplicate)
+                self._conn.execute("INSERT INTO reservations (token, job_id, fingerprint, created_at) "
+                                   "VALUES (?, ?, ?, ?)",
+                                   (reservation.token, job_id, reservation.fingerprint, time.time()))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return reservation
+
+    def _drop_reservation(self, reservation):
+        if self.shared:
+            self._conn.execute("DELETE FROM reservations WHERE token = ?", (reservation.token,))
+            return
+        if reservation.job_id in self._reserved_job_ids:
+            self._reserved_job_ids.discard(reservation.job_id)
+            if self._reserved_fingerprints.get(reservation.fingerprint) == reservation.job_id:
+                del self._reserved_fingerprints[reservation.fingerprint]
+
+    def release(self, reservation):
+        """Give up a reservation whose application was not made; releasing twice is harmless"""
+        with self._lock:
+            self._drop_reservation(reservation)
+
+    def find_duplicate(self, job_id, company=None, job_title=None):
+        """Return (duplicate_of, reason) if job was already applied to, else None"""
+        with self._lock:
+            if self.shared:
+                self._catch_up()
+            return self._find_duplicate(job_id, company, job_title)
+
+    def add(self, application, allow_duplicate=True, reservation=None):
+        """
+        Persist an application record.
+
+        With allow_duplicate=False the duplicate check and the insert happen
+        atomically, and DuplicateApplication is raised instead of inserting.
+        A reservation from reserve() is consumed in the same step.
+        """
+        values = [application.get(column) for column in COLUMNS]
+        job_id = application.get("job_id")
+        company = application.get("company")
+        job_title = application.get("job_title")
+        with self._lock:
+            if self.shared:
+                self._add_shared(values, job_id, company, job_title, allow_duplicate, reservation)
+                return application
+            if reservation is not None:
+                self._drop_reservation(reservation)
+            if not allow_duplicate:
+                duplicate = self._find_duplicate(job_id, company, job_title)
+                if duplicate is not None:
+                    raise DuplicateApplication(job_id, *duplicate)
+            self._last_id = self._conn.execute(_INSERT, values).lastrowid
+            self._total += 1
+            self._index(job_id, company, job_title, application.get("status"))
+        return application
+
+    def _add_shared(self, values, job_id, company, job_title, allow_duplicate, reservation):
+        # BEGIN IMMEDIATE takes the database write lock, serializing the
+        # check and insert with every other process using the file
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._catch_up()
+            if reservation is not None:
+                self._drop_reservation(reservation)
+            if not allow_duplicate:
+                duplicate = self._find_duplicate(job_id, company, job_title)
+                if duplicate is not None:
+                    raise DuplicateApplication(job_id, *duplicate)
+            self._conn.execute(_INSERT, values)
+            self._catch_up()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def restore(self, applications):
+        """
+        Insert the applications the history is missing, such as those replayed
+        from the audit log after a crash, and return how many were added.
+
+        An application is already present when a row has its job_id and
+        applied_at. The check and inserts run in one write transaction.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                present = {(row[0], row[1]) for row in self._conn.execute("SELECT job_id, applied_at FROM applications")}
+                rows = []
+                for application in applications:
+                    key = (application.get("job_id"), application.get("applied_at"))
+                    if key not in present:
+                        present.add(key)
+                        rows.append([application.get(column) for column in COLUMNS])
+                self._conn.executemany(_INSERT, rows)
+                self._catch_up()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def query(self, limit=10, cursor=None, company=None, since=None, until=None, status=None):
+        """
+        Return (applications, next_cursor) for one page of history.
+
+        Filters are optional: company matches case-insensitively, since and
+        until bound applied_at (inclusive, ISO-8601; a date-only until
+        includes that whole day), status matches exactly.
+        next_cursor is None on the last page.
+        """
+        clauses = []
+        params = []
+        if company:
+            clauses.append("company = ? COLLATE NOCASE")
+            params.append(company)
+        if since:
+            clauses.append("applied_at >= ?")
+            params.append(since)
+        if until:
+            clause, bound = until_clause(until)
+            clauses.append(clause)
+            params.append(bound)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if cursor:
+            applied_at, row_id = decode_cursor(cursor)
+            clauses.append("(applied_at < ? OR (applied_at = ? AND id < ?))")
+            params.extend([applied_at, applied_at, row_id])
+
+        sql = "SELECT id, " + ", ".join(COLUMNS) + " FROM applications"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY applied_at DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["applied_at"], rows[-1]["id"])
+        return [{column: row[column] for column in COLUMNS} for row in rows], next_cursor
+
+    def find_by_job_id(self, job_id):
+        """Return all applications made to job_id, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT " + ", ".join(COLUMNS) + " FROM applications WHERE job_id = ? ORDER BY id DESC",
+                (job_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def __len__(self):
+        if self.shared:
+            with self._lock:
+                self._catch_up()
+        return self._total
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
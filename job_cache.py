@@ -0,0 +1,245 @@
+"""
+Job Cache
+Bounded, TTL-aware LRU cache for job postings fetched from LinkedIn.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from job_record import DetailStore, JobRecord
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+
+
+def _posted_timestamp(job):
+    """Return the date_posted of a job as a UNIX timestamp, or None"""
+    date_posted = job.get("date_posted")
+    if not date_posted:
+        return None
+    try:
+        return datetime.fromisoformat(str(date_posted)).timestamp()
+    except ValueError:
+        return None
+
+
+class _Entry:
+    __slots__ = ("job", "expires_at", "size")
+
+    def __init__(self, job, expires_at, size):
+        self.job = job
+        self.expires_at = expires_at
+        self.size = size
+
+
+class JobCache:
+    """
+    Thread-safe LRU cache of job postings keyed by job_id.
+
+    Entries expire ttl seconds after they were fetched, or max_age_days after
+    their date_posted when that is configured, whichever comes first. The
+    cache evicts least recently used entries once either max_entries or
+    max_bytes is exceeded.
+
+    Jobs are stored as JobRecords whose detail fields live in the cache's
+    DetailStore; put() accepts plain job dicts and converts them.
+
+    Listeners registered with subscribe() are told about every change to the
+    cached set through add(job), remove(job_id) and clear(), so secondary
+    structures such as the search index stay in step with the cache.
+
+    With a shared store (see shared_state), puts are written through to it
+    and lookups that miss locally are read through from it, so workers in
+    other processes see the same jobs.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 ttl=DEFAULT_TTL_SECONDS, max_age_days=None, clock=time.time, shared=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_age_days = max_age_days
+        self._clock = clock
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.details = DetailStore()
+        self._listeners = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.shared_hits = 0
+
+    @classmethod
+    def from_config(cls, cache_config, shared=None):
+        """Build a cache from the optional 'cache' section of config.yaml"""
+        cache_config = cache_config or {}
+        return cls(
+            max_entries=cache_config.get("max_entries", DEFAULT_MAX_ENTRIES),
+            max_bytes=cache_config.get("max_bytes", DEFAULT_MAX_BYTES),
+            ttl=cache_config.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+            max_age_days=cache_config.get("max_age_days"),
+            shared=shared,
+        )
+
+    def subscribe(self, listener):
+        """Register a listener and replay the current entries to it"""
+        with self._lock:
+            self._listeners.append(listener)
+            for entry in self._entries.values():
+                listener.add(entry.job)
+
+    def unsubscribe(self, listener):
+        """Stop notifying a listener registered with subscribe()"""
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def _expiry_for(self, job, now):
+        expires_at = now + self.ttl
+        if self.max_age_days is not None:
+            posted = _posted_timestamp(job)
+            if posted is not None:
+                expires_at = min(expires_at, posted + self.max_age_days * 86400)
+        return expires_at
+
+    def _remove(self, job_id):
+        entry = self._entries.pop(job_id)
+        self._bytes -= entry.size
+        self.details.discard(job_id)
+        for listener in self._listeners:
+            listener.remove(job_id)
+        return entry
+
+    def get(self, job_id):
+        """Return the cached job for job_id, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is not None:
+                if entry.expires_at > self._clock():
+                    self._entries.move_to_end(job_id)
+                    self.hits += 1
+                    return entry.job
+                self._remove(job_id)
+                self.expirations += 1
+            if self.shared is None:
+                self.misses += 1
+                return None
+        job = self._read_through(job_id)
+        with self._lock:
+            if job is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.shared_hits += 1
+        return job
+
+    def peek(self, job_id):
+        """Return the cached job for job_id without counting a lookup or refreshing its recency"""
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is not None and entry.expires_at > self._clock():
+                return entry.job
+        if self.shared is None:
+            return None
+        return self._read_through(job_id)
+
+    def _read_through(self, job_id):
+        found = self.shared.get_job(job_id)
+        if found is None:
+            return None
+        job, expires_at = found
+        job = JobRecord(job, self.details)
+        self._insert(job, expires_at)
+        return job
+
+    def expiring(self, within):
+        """Return the ids of live entries that expire in the next within seconds, soonest first"""
+        now = self._clock()
+        with self._lock:
+            entries = [(entry.expires_at, job_id) for job_id, entry in self._entries.items()
+                       if now < entry.expires_at <= now + within]
+        return [job_id for _, job_id in sorted(entries)]
+
+    def put(self, job):
+        """
+        Insert or refresh a job, evicting old entries to stay within limits.
+
+        A job dict replaces the cached job and its details; re-inserting a
+        cached JobRecord keeps its details and refreshes its expiry.
+        """
+        if not isinstance(job, JobRecord):
+            job = JobRecord(job, self.details)
+        expires_at = self._expiry_for(job, self._clock())
+        self._insert(job, expires_at)
+        if self.shared is not None:
+            self.shared.put_job(job.to_dict(), expires_at)
+
+    def _insert(self, job, expires_at):
+        job_id = job["job_id"]
+        entry = _Entry(job, expires_at, job.memory_size())
+        with self._lock:
+            previous = self._entries.pop(job_id, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[job_id] = entry
+            self._bytes += entry.size
+            for listener in self._listeners:
+                listener.add(job)
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes + self.details.bytes > self.max_bytes):
+            job_id = next(iter(self._entries))
+            self._remove(job_id)
+            self.evictions += 1
+
+    def purge_expired(self):
+        """Drop all expired entries and return how many were removed"""
+        now = self._clock()
+        with self._lock:
+            expired = [job_id for job_id, entry in self._entries.items() if entry.expires_at <= now]
+            for job_id in expired:
+                self._remove(job_id)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.details.clear()
+            for listener in self._listeners:
+                listener.clear()
+
+    def __contains__(self, job_id):
+        with self._lock:
+            entry = self._entries.get(job_id)
+            return entry is not None and entry.expires_at > self._clock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return cache counters and current usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes + self.details.bytes,
+                "distinct_descriptions": self.details.stats()["distinct_descriptions"],
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "shared_hits": self.shared_hits,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,255 @@
+"""
+Job Record
+Compact, slotted representation of a cached job posting. Repeated string
+fields are interned, and the large detail fields (description, skills and
+salary) live in a separate DetailStore that shares identical descriptions
+between postings and is only consulted when a detail field is read.
+"""
+
+import hashlib
+import sys
+import threading
+from collections.abc import Mapping
+
+# Fields every search result carries, in wire order
+CORE_FIELDS = ("job_id", "title", "company", "location", "description_snippet", "date_posted",
+               "experience_level", "job_type", "remote", "url")
+
+# Low-cardinality fields shared by many postings
+INTERNED_FIELDS = ("company", "location", "date_posted", "experience_level", "job_type")
+
+# Fields added by get_job_details that are left out of search results
+DETAIL_FIELDS = ("full_description", "skills_required", "salary_range")
+
+_MISSING = object()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class _Details:
+    __slots__ = ("description_key", "skills", "salary_range")
+
+    def __init__(self, description_key, skills, salary_range):
+        self.description_key = description_key
+        self.skills = skills
+        self.salary_range = salary_range
+
+
+class DetailStore:
+    """
+    Thread-safe store of job details keyed by job_id.
+
+    Descriptions are kept once per distinct text and reference counted, so
+    postings that share a description (reposts, multi-location listings)
+    share one string. Skills are stored as tuples of interned strings.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._details = {}
+        self._texts = {}
+        self.bytes = 0
+
+    def _release(self, details):
+        key = details.description_key
+        if key is None:
+            return
+        entry = self._texts[key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._texts[key]
+            self.bytes -= sys.getsizeof(entry[0])
+
+    def set(self, job_id, details):
+        """Replace the details of job_id with the detail fields in details, or drop them if there are none"""
+        description = details.get("full_description", _MISSING)
+        skills = details.get("skills_required", _MISSING)
+        salary_range = details.get("salary_range", _MISSING)
+        with self._lock:
+            previous = self._details.pop(job_id, None)
+            if description is _MISSING and skills is _MISSING and salary_range is _MISSING:
+                if previous is not None:
+                    self._release(previous)
+                return
+            key = None
+            if description is not _MISSING:
+                key = _digest(description) if description is not None else b""
+                entry = self._texts.get(key)
+                if entry is None:
+                    entry = self._texts[key] = [description, 0]
+                    self.bytes += sys.getsizeof(description)
+                entry[1] += 1
+            if previous is not None:
+                self._release(previous)
+            if skills is not _MISSING and skills is not None:
+                skills = tuple(_intern(skill) for skill in skills)
+            self._details[job_id] = _Details(key, skills, _intern(salary_range))
+
+    def update(self, job_id, details):
+        """Merge the detail fields in details into those already stored for job_id"""
+        merged = self.get(job_id)
+        merged.update({field: details[field] for field in DETAIL_FIELDS if field in details})
+        self.set(job_id, merged)
+
+    def get(self, job_id):
+        """Return the detail fields stored for job_id as a new dict"""
+        with self._lock:
+            details = self._details.get(job_id)
+            if details is None:
+                return {}
+            result = {}
+            if details.description_key is not None:
+                result["full_description"] = self._texts[details.description_key][0]
+            if details.skills is not _MISSING:
+                result["skills_required"] = list(details.skills) if details.skills is not None else None
+            if details.salary_range is not _MISSING:
+                result["salary_range"] = details.salary_range
+            return result
+
+    def field(self, job_id, field):
+        """Return one detail field of job_id, or _MISSING"""
+        return self.get(job_id).get(field, _MISSING)
+
+    def has(self, job_id, field):
+        """Return True if job_id has the detail field stored"""
+        with self._lock:
+            details = self._details.get(job_id)
+            if details is None:
+                return False
+            if field == "full_description":
+                return details.description_key is not None
+            if field == "skills_required":
+                return details.skills is not _MISSING
+            return details.salary_range is not _MISSING
+
+    def discard(self, job_id):
+        """Drop the details of job_id"""
+        with self._lock:
+            details = self._details.pop(job_id, None)
+            if details is not None:
+                self._release(details)
+
+    def clear(self):
+        with self._lock:
+            self._details.clear()
+            self._texts.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._details)
+
+    def stats(self):
+        """Return the number of jobs with details, distinct descriptions and description bytes"""
+        with self._lock:
+            return {
+                "jobs": len(self._details),
+                "distinct_descriptions": len(self._texts),
+                "description_bytes": self.bytes,
+            }
+
+
+class JobRecord(Mapping):
+    """
+    Read-mostly mapping view of a cached job posting.
+
+    Core fields live in slots, uncommon fields in a small extras dict, and
+    detail fields in the DetailStore given at construction. It behaves like
+    the job dict it replaces; to_dict() returns the original wire format.
+    """
+
+    __slots__ = CORE_FIELDS + ("extra", "store")
+
+    def __init__(self, job, store):
+        self.store = store
+        extra = None
+        for field in CORE_FIELDS:
+            value = job.get(field, _MISSING)
+            setattr(self, field, _intern(value) if field in INTERNED_FIELDS else value)
+        for key, value in job.items():
+            if key not in CORE_FIELDS and key not in DETAIL_FIELDS:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+        store.set(self.job_id, job)
+
+    def __getitem__(self, key):
+        if key in CORE_FIELDS:
+            value = getattr(self, key)
+        elif key in DETAIL_FIELDS:
+            value = self.store.field(self.job_id, key)
+        elif self.extra is not None:
+            value = self.extra.get(key, _MISSING)
+        else:
+            value = _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        if key in CORE_FIELDS:
+            return getattr(self, key) is not _MISSING
+        if key in DETAIL_FIELDS:
+            return self.store.has(self.job_id, key)
+        return self.extra is not None and key in self.extra
+
+    def _summary_keys(self):
+        for field in CORE_FIELDS:
+            if getattr(self, field) is not _MISSING:
+                yield field
+        if self.extra is not None:
+            yield from self.extra
+
+    def __iter__(self):
+        yield from self._summary_keys()
+        for field in DETAIL_FIELDS:
+            if self.store.has(self.job_id, field):
+                yield field
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def update(self, details):
+        """Store fetched detail fields; other fields update the record itself"""
+        self.store.update(self.job_id, details)
+        for key, value in details.items():
+            if key in DETAIL_FIELDS:
+                continue
+            if key in CORE_FIELDS:
+                setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+            else:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+
+    def summary(self):
+        """Return the job as a dict without its detail fields"""
+        return {key: self[key] for key in self._summary_keys()}
+
+    def to_dict(self):
+        """Return the job as a plain dict in the original wire format"""
+        job = self.summary()
+        job.update(self.store.get(self.job_id))
+        return job
+
+    def memory_size(self):
+        """Approximate bytes held by this record, not counting interned strings or shared details"""
+        size = sys.getsizeof(self)
+        for field in CORE_FIELDS:
+            value = getattr(self, field)
+            if field not in INTERNED_FIELDS and value is not _MISSING and type(value) is not bool:
+                size += sys.getsizeof(value)
+        if self.extra is not None:
+            size += sys.getsizeof(self.extra)
+            for key, value in self.extra.items():
+                size += sys.getsizeof(key) + sys.getsizeof(value)
+        return size
+
+    def __repr__(self):
+        return f"JobRecord({self.to_dict()!r})"
@@ -0,0 +1,159 @@
+"""
+JSON Codec
+Fast JSON encoding and decoding for request and response bodies (orjson
+when installed, the standard library otherwise), content-encoding
+negotiation with optional gzip/zstd compression, and precomputed JSON
+documents with ETags for responses that never change.
+"""
+
+import gzip
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_MIN_COMPRESS_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_ZSTD_LEVEL = 3
+
+# Settings replaced by configure()
+codec = "orjson" if orjson is not None else "json"
+compression_enabled = True
+min_compress_size = DEFAULT_MIN_COMPRESS_SIZE
+gzip_level = DEFAULT_GZIP_LEVEL
+zstd_level = DEFAULT_ZSTD_LEVEL
+
+
+def configure(http_config):
+    """Apply the optional 'http' section of config.yaml"""
+    global codec, compression_enabled, min_compress_size, gzip_level, zstd_level
+    http_config = http_config or {}
+    requested = http_config.get("json_codec", "auto")
+    if requested == "orjson" and orjson is None:
+        raise ValueError("http.json_codec is 'orjson' but orjson is not installed")
+    if requested not in ("auto", "orjson", "json"):
+        raise ValueError(f"Unknown http.json_codec: {requested}")
+    codec = "json" if requested == "json" or orjson is None else "orjson"
+    compression = http_config.get("compression") or {}
+    compression_enabled = compression.get("enabled", True)
+    min_compress_size = compression.get("min_size", DEFAULT_MIN_COMPRESS_SIZE)
+    gzip_level = compression.get("gzip_level", DEFAULT_GZIP_LEVEL)
+    zstd_level = compression.get("zstd_level", DEFAULT_ZSTD_LEVEL)
+
+
+def dumps(obj, default=None, sort_keys=False):
+    """
+    Serialize obj to compact UTF-8 JSON bytes.
+
+    default, if given, converts values neither codec encodes natively; with
+    orjson it also receives dates and times, so both codecs encode them alike.
+    With sort_keys the output does not depend on the order of dict keys.
+    """
+    if codec == "orjson":
+        option = orjson.OPT_NON_STR_KEYS
+        if default is not None:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=default,
+                      sort_keys=sort_keys).encode("utf-8")
+
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if codec == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _accepted(accept_encoding):
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def negotiate_encoding(accept_encoding):
+    """Return the best supported content encoding the client accepts ('zstd', 'gzip'), or None"""
+    if not compression_enabled:
+        return None
+    accepted = _accepted(accept_encoding)
+    candidates = (["zstd"] if zstandard is not None else []) + ["gzip"]
+    for encoding in candidates:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    """Compress body with encoding ('zstd', 'gzip' or None)"""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    return body
+
+
+def encode_body(body, accept_encoding):
+    """Return (body, content_encoding), compressing bodies of at least min_compress_size bytes when accepted"""
+    if len(body) < min_compress_size:
+        return body, None
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return body, None
+    return compress(body, encoding), encoding
+
+
+def etag_matches(if_none_match, etag):
+    """Return True if an If-None-Match header value matches etag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class StaticJSON:
+    """
+    A JSON document serialized once.
+
+    Holds the body, a strong ETag derived from it, and lazily built
+    compressed variants, so serving it costs a dictionary lookup. Keys are
+    sorted, so the ETag does not depend on how the payload was built.
+    """
+
+    def __init__(self, payload):
+        self.body = dumps(payload, sort_keys=True)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self._variants = {None: self.body}
+
+    def encoded(self, accept_encoding):
+        """Return (body, content_encoding) for a request's Accept-Encoding"""
+        encoding = negotiate_encoding(accept_encoding) if len(self.body) >= min_compress_size else None
+        body = self._variants.get(encoding)
+        if body is None:
+            body = self._variants[encoding] = compress(self.body, encoding)
+        return body, encoding
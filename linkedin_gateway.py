@@ -0,0 +1,388 @@
+"""
+LinkedIn Gateway
+Pooled, rate-limited access to authenticated linkedin_api sessions with
+retries, a circuit breaker and call metrics.
+"""
+
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+from metrics import UPSTREAM_DURATION
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_BURST = 5
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+DEFAULT_ACQUIRE_TIMEOUT = 30.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60.0
+DEFAULT_HTTP_POOL_SIZE = 10
+LATENCY_WINDOW = 1024
+
+
+class GatewayError(Exception):
+    """Base class for errors raised by the gateway itself"""
+
+
+class CircuitOpenError(GatewayError):
+    """Raised when the circuit breaker rejects a call"""
+
+
+class PoolTimeoutError(GatewayError):
+    """Raised when no session or rate-limit token became available in time"""
+
+
+def is_transient(error):
+    """Return whether an upstream error may succeed on retry: a connection failure, a timeout, 429 or 5xx"""
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    # Includes requests' connection errors and timeouts
+    return isinstance(error, OSError)
+
+
+def is_auth_error(error):
+    """Return whether LinkedIn rejected a call's session (401 or 403), such as a revoked or logged-out one"""
+    return getattr(getattr(error, "response", None), "status_code", None) in (401, 403)
+
+
+class TokenBucket:
+    """Token bucket rate limiter refilling at rate tokens per second up to capacity"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available, without waiting"""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout=None):
+        """Take a token, waiting up to timeout seconds; return False on timeout"""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Stops calls after repeated failures.
+
+    After failure_threshold consecutive failures the breaker opens and rejects
+    calls for reset_timeout seconds, then lets a single trial call through
+    (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+
+    def allow(self):
+        """Return True if a call may proceed now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def cancel(self):
+        """Release the half-open trial slot of a call that never reached upstream"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit breaker opened after {self._failures} failures")
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class Session:
+    """An authenticated LinkedIn client together with its account's rate limiter"""
+
+    def __init__(self, client, account, bucket):
+        self.client = client
+        self.account = account
+        self.bucket = bucket
+
+
+def enable_keep_alive(client, pool_size=DEFAULT_HTTP_POOL_SIZE):
+    """Give a linkedin_api client's requests session a larger keep-alive connection pool"""
+    http_session = getattr(getattr(client, "client", None), "session", None)
+    if http_session is None:
+        return
+    from requests.adapters import HTTPAdapter
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    http_session.mount("https://", adapter)
+    http_session.mount("http://", adapter)
+
+
+class LinkedInGateway:
+    """
+    Gateway through which all upstream LinkedIn calls are made.
+
+    call(fn, *args) checks out a session from the pool, waits for a token
+    from that account's bucket, and runs fn(client, *args). Transient
+    failures are retried with exponential backoff and full jitter, and feed a
+    circuit breaker shared by the whole gateway. Other errors, such as 4xx
+    responses, failed authentication or bad input, are raised at once and
+    never open the breaker. With reauthenticate(username), a call whose
+    session LinkedIn rejects is repeated once on a freshly logged-in client,
+    which then replaces the client of every session of that account.
+    """
+
+    def __init__(self, sessions, max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX, acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT,
+                 breaker=None, sleep=time.sleep, reauthenticate=None):
+        if not sessions:
+            raise ValueError("LinkedInGateway needs at least one session")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.acquire_timeout = acquire_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.reauthenticate = reauthenticate
+        self._sleep = sleep
+        self._reauthenticating = threading.Lock()
+        self.sessions = list(sessions)
+        self._pool = queue.Queue()
+        for session in sessions:
+            self._pool.put(session)
+        self.pool_size = len(sessions)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._calls = 0
+        self._errors = 0
+        self._retries = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._wait_times = deque(maxlen=LATENCY_WINDOW)
+
+    @classmethod
+    def from_clients(cls, clients, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_BURST, **kwargs):
+        """Build a gateway with one session and rate limiter per client"""
+        sessions = [
+            Session(client, f"account-{i}", TokenBucket(requests_per_minute / 60.0, burst))
+            for i, client in enumerate(clients)
+        ]
+        return cls(sessions, **kwargs)
+
+    @classmethod
+    def from_config(cls, config, client_factory, reauthenticate=None):
+        """
+        Build a gateway from config.yaml.
+
+        Accounts come from linkedin.accounts (a list of username/password
+        pairs) or the single linkedin.username/password. Each account gets
+        gateway.sessions_per_account sessions created by
+        client_factory(username, password), which share one token bucket.
+        """
+        linkedin_config = config.get("linkedin") or {}
+        gateway_config = config.get("gateway") or {}
+        accounts = linkedin_config.get("accounts") or [linkedin_config]
+        requests_per_minute = gateway_config.get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE)
+        burst = gateway_config.get("burst", DEFAULT_BURST)
+        sessions_per_account = gateway_config.get("sessions_per_account", 1)
+        http_pool_size = gateway_config.get("http_pool_size", DEFAULT_HTTP_POOL_SIZE)
+
+        sessions = []
+        for account in accounts:
+            username = account.get("username", "")
+            bucket = TokenBucket(requests_per_minute / 60.0, burst)
+            for _ in range(sessions_per_account):
+                client = client_factory(username, account.get("password", ""))
+                enable_keep_alive(client, http_pool_size)
+                sessions.append(Session(client, username, bucket))
+
+        return cls(
+            sessions,
+            max_retries=gateway_config.get("max_retries", DEFAULT_MAX_RETRIES),
+            backoff_base=gateway_config.get("backoff_base", DEFAULT_BACKOFF_BASE),
+            backoff_max=gateway_config.get("backoff_max", DEFAULT_BACKOFF_MAX),
+            acquire_timeout=gateway_config.get("acquire_timeout", DEFAULT_ACQUIRE_TIMEOUT),
+            breaker=CircuitBreaker(
+                failure_threshold=gateway_config.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+                reset_timeout=gateway_config.get("reset_timeout", DEFAULT_RESET_TIMEOUT),
+            ),
+            reauthenticate=reauthenticate,
+        )
+
+    def backoff_delay(self, attempt):
+        """Return the full-jitter backoff delay before retry number attempt (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def _checkout(self):
+        with self._lock:
+            self._waiting += 1
+        start = time.monotonic()
+        try:
+            session = self._pool.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(f"No LinkedIn session available within {self.acquire_timeout}s")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        remaining = max(0.0, self.acquire_timeout - (time.monotonic() - start))
+        if not session.bucket.acquire(timeout=remaining):
+            self._pool.put(session)
+            raise PoolTimeoutError(f"Rate limit for {session.account} not available within {self.acquire_timeout}s")
+        with self._lock:
+            self._wait_times.append(time.monotonic() - start)
+        return session
+
+    def _replace_client(self, session, rejected):
+        with self._reauthenticating:
+            if session.client is not rejected:
+                # Another call already logged this account in again
+                return
+            client = self.reauthenticate(session.account)
+            for other in self.sessions:
+                if other.account == session.account:
+                    other.client = client
+
+    def call(self, fn, *args, idempotent=True, **kwargs):
+        """
+        Run fn(client, *args, **kwargs) on a pooled session with rate limiting and retries.
+
+        Only idempotent calls are retried: a call such as submitting an
+        application may have taken effect upstream even though it failed here.
+        """
+        max_retries = self.max_retries if idempotent else 0
+        attempt = 0
+        reauthenticated = False
+        while True:
+            if not self.breaker.allow():
+                with self._lock:
+                    self._rejected += 1
+                raise CircuitOpenError("LinkedIn circuit breaker is open; upstream calls are paused")
+
+            try:
+                session = self._checkout()
+            except PoolTimeoutError:
+                self.breaker.cancel()
+                raise
+            with self._lock:
+                self._in_flight += 1
+                self._calls += 1
+            start = time.monotonic()
+            call_name = getattr(fn, "__name__", "call").strip("_")
+            client = session.client
+            try:
+                result = fn(client, *args, **kwargs)
+            except Exception as e:
+                UPSTREAM_DURATION.observe(time.monotonic() - start, call_name, "error")
+                with self._lock:
+                    self._errors += 1
+                if is_auth_error(e) and self.reauthenticate is not None and not reauthenticated:
+                    # LinkedIn rejected the call, so it had no effect and can be repeated
+                    logger.warning(f"LinkedIn rejected the session of {session.account} ({e}); logging in again")
+                    self.breaker.cancel()
+                    reauthenticated = True
+                    self._replace_client(session, client)
+                    continue
+                if not is_transient(e):
+                    # Not a sign of LinkedIn being down; frees a half-open trial slot without a verdict
+                    self.breaker.cancel()
+                    raise
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt > max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"Upstream call {getattr(fn, '__name__', fn)} failed ({e}); "
+                               f"retry {attempt}/{max_retries} in {delay:.2f}s")
+            else:
+                UPSTREAM_DURATION.observe(time.monotonic() - start, call_name, "success")
+                self.breaker.record_success()
+                return result
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._latencies.append(time.monotonic() - start)
+                self._pool.put(session)
+            self._sleep(delay)
+            with self._lock:
+                self._retries += 1
+
+    def metrics(self):
+        """Return queue depth, concurrency, error counts and latency percentiles"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            wait_times = sorted(self._wait_times)
+            return {
+                "pool_size": self.pool_size,
+                "idle_sessions": self._pool.qsize(),
+                "queue_depth": self._waiting,
+                "in_flight": self._in_flight,
+                "calls": self._calls,
+                "errors": self._errors,
+                "retries": self._retries,
+                "rejected": self._rejected,
+                "circuit_state": self.breaker.state,
+                "latency_p50_s": _percentile(latencies, 0.5),
+                "latency_p99_s": _percentile(latencies, 0.99),
+                "wait_p50_s": _percentile(wait_times, 0.5),
+                "wait_p99_s": _percentile(wait_times, 0.99),
+            }
+
+
+def _percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
@@ -0,0 +1,340 @@
+"""
+Metrics
+Low-overhead counters, gauges and histograms rendered in the Prometheus
+text exposition format, the tool-dispatch timer that feeds them, and an
+optional sampling profiler that captures stacks of slow tool invocations.
+"""
+
+import bisect
+import itertools
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter as _StackCounter, deque
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans cache hits (sub-millisecond) to slow upstream calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in sorted(values):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label combination"""
+
+    kind = "counter"
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down per label combination"""
+
+    kind = "gauge"
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self._values[label_values] = value
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observed values per label combination"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            return state[2] if state else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for label_values, (counts, total, count) in sorted(values):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, label_values, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Set of metrics rendered together.
+
+    Collectors are callables run at scrape time that return
+    (name, kind, help, [(labels_dict, value), ...]) tuples, for statistics
+    that other components already keep, such as cache counters.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()):
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def clear_collectors(self):
+        with self._lock:
+            self._collectors.clear()
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector} failed: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_text = _format_labels(labels.keys(), labels.values())
+                    lines.append(f"{name}{label_text} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TOOL_REQUESTS = REGISTRY.counter("mcp_tool_requests_total", "Tool invocations by tool and HTTP status",
+                                 ("tool", "status"))
+TOOL_DURATION = REGISTRY.histogram("mcp_tool_duration_seconds", "Tool invocation latency", ("tool",))
+TOOL_IN_FLIGHT = REGISTRY.gauge("mcp_tool_in_flight", "Tool invocations currently running", ("tool",))
+UPSTREAM_DURATION = REGISTRY.histogram("mcp_upstream_duration_seconds",
+                                       "LinkedIn call latency per attempt by call and outcome",
+                                       ("call", "outcome"))
+
+
+class SlowCallProfiler:
+    """
+    Sampling profiler for slow tool invocations.
+
+    Tracked calls cost two dict operations. A background thread wakes every
+    interval seconds and, for tracked calls that have already run longer
+    than threshold seconds, samples their thread's current stack. When such
+    a call finishes its aggregated stacks are kept in profiles() and logged.
+    Calls are tracked individually, so a profiled call nested in another on
+    the same thread (such as a batch dispatching tools) leaves the outer
+    call's profile intact; both are charged the samples taken meanwhile.
+    """
+
+    def __init__(self, threshold=1.0, interval=0.01, tools=("search_jobs", "apply_to_job"), max_profiles=20):
+        self.threshold = threshold
+        self.interval = interval
+        self.tools = frozenset(tools)
+        self._lock = threading.Lock()
+        self._active = {}
+        self._call_ids = itertools.count()
+        self._profiles = deque(maxlen=max_profiles)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, metrics_config):
+        """Build a profiler from metrics.profile_slow_calls in config.yaml, or return None if disabled"""
+        profile_config = (metrics_config or {}).get("profile_slow_calls") or {}
+        if not profile_config.get("enabled", False):
+            return None
+        return cls(
+            threshold=profile_config.get("threshold_ms", 1000) / 1000.0,
+            interval=profile_config.get("interval_ms", 10) / 1000.0,
+            tools=profile_config.get("tools", ("search_jobs", "apply_to_job")),
+            max_profiles=profile_config.get("max_profiles", 20),
+        )
+
+    def begin(self, tool):
+        """Start tracking the current thread's call to tool; return a token for end()"""
+        if tool not in self.tools:
+            return None
+        call = [tool, time.monotonic(), None]
+        with self._lock:
+            call_id = next(self._call_ids)
+            self._active[call_id] = (threading.get_ident(), call)
+        return call_id, call
+
+    def end(self, token):
+        """Stop tracking a call and keep its profile if it was slow"""
+        if token is None:
+            return
+        call_id, call = token
+        with self._lock:
+            self._active.pop(call_id, None)
+        tool, started, stacks = call
+        duration = time.monotonic() - started
+        if duration < self.threshold or not stacks:
+            return
+        profile = {
+            "tool": tool,
+            "duration_s": round(duration, 4),
+            "samples": sum(stacks.values()),
+            "stacks": [{"stack": stack, "samples": count} for stack, count in stacks.most_common(10)],
+        }
+        with self._lock:
+            self._profiles.append(profile)
+        logger.warning(f"Slow {tool} call took {duration:.3f}s; hottest stack: {profile['stacks'][0]['stack']}")
+
+    def _sample(self):
+        now = time.monotonic()
+        with self._lock:
+            slow = [(thread_id, call) for thread_id, call in self._active.values()
+                    if now - call[1] >= self.threshold]
+        if not slow:
+            return
+        frames = sys._current_frames()
+        for thread_id, call in slow:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            stack = ";".join(f"{entry.name} ({entry.filename.rsplit('/', 1)[-1]}:{entry.lineno})"
+                             for entry in traceback.extract_stack(frame))
+            with self._lock:
+                if call[2] is None:
+                    call[2] = _StackCounter()
+                call[2][stack] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="slow-call-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def profiles(self):
+        """Return the stacks of the most recent slow calls, oldest first"""
+        with self._lock:
+            return list(self._profiles)
+
+
+class ToolTimer:
+    """Context manager recording latency, in-flight count and status of one tool invocation"""
+
+    __slots__ = ("tool", "profiler", "status", "_start", "_token")
+
+    def __init__(self, tool, profiler=None):
+        self.tool = tool
+        self.profiler = profiler
+        self.status = 500
+
+    def __enter__(self):
+        TOOL_IN_FLIGHT.inc(self.tool)
+        self._token = self.profiler.begin(self.tool) if self.profiler is not None else None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self._start
+        if self._token is not None:
+            self.profiler.end(self._token)
+        TOOL_IN_FLIGHT.dec(self.tool)
+        TOOL_DURATION.observe(duration, self.tool)
+        TOOL_REQUESTS.inc(self.tool, str(self.status))
+        return False
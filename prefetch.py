@@ -0,0 +1,214 @@
+"""
+Prefetch Scheduler
+Periodically runs the saved searches from config job_preferences, prefetches
+details for new postings and refreshes cached postings before they expire,
+so interactive tool calls are answered from a warm cache.
+"""
+
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 15 * 60
+DEFAULT_JITTER = 0.2
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_MAX_DETAILS_PER_RUN = 25
+DEFAULT_REFRESH_MARGIN_SECONDS = 30 * 60
+RECENT_PREFETCHES = 50
+
+# Allowance for the duration of a run when keeping its results fresh until the next one
+RESULT_TTL_SLACK_SECONDS = 5 * 60
+
+
+def saved_searches(job_preferences):
+    """Expand job_preferences into one search_jobs parameter set per title and location"""
+    job_preferences = job_preferences or {}
+    titles = job_preferences.get("titles") or []
+    locations = job_preferences.get("locations") or [None]
+    searches = []
+    for title, location in itertools.product(titles, locations):
+        parameters = {
+            "title": title,
+            "location": location,
+            "experience_level": job_preferences.get("experience_level"),
+            "job_type": job_preferences.get("job_type"),
+            "remote": True if job_preferences.get("remote_only") else None,
+        }
+        searches.append({key: value for key, value in parameters.items() if value is not None})
+    return searches
+
+
+class PrefetchScheduler:
+    """
+    Background thread that keeps the job cache warm.
+
+    Each run calls refresh_search(parameters) for every saved search, which
+    returns the ids of postings still lacking details, then calls
+    fetch_details(job_id) for those and for the ids returned by
+    stale_job_ids(margin), at most max_details_per_run per run. Upstream
+    calls run on at most max_concurrency threads, so interactive requests
+    keep the rest of the LinkedIn gateway. Runs are interval seconds apart,
+    randomly stretched or shortened by up to the jitter fraction so that
+    several workers do not hit LinkedIn in lockstep.
+    """
+
+    def __init__(self, searches, refresh_search, fetch_details, stale_job_ids,
+                 interval=DEFAULT_INTERVAL_SECONDS, jitter=DEFAULT_JITTER,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, max_details_per_run=DEFAULT_MAX_DETAILS_PER_RUN,
+                 refresh_margin=DEFAULT_REFRESH_MARGIN_SECONDS, clock=time.time, rand=random.random):
+        self.searches = searches
+        self.refresh_search = refresh_search
+        self.fetch_details = fetch_details
+        self.stale_job_ids = stale_job_ids
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.max_details_per_run = max_details_per_run
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self._rand = rand
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._running = False
+        self._next_run_at = None
+        self._last_run = None
+        self._recent = deque(maxlen=RECENT_PREFETCHES)
+        self.runs = 0
+        self.searches_run = 0
+        self.details_prefetched = 0
+        self.refreshed = 0
+        self.errors = 0
+        self.last_error = None
+
+    @classmethod
+    def from_config(cls, config, refresh_search, fetch_details, stale_job_ids):
+        """Build a scheduler from job_preferences and the optional 'prefetch' section of config.yaml"""
+        prefetch_config = config.get("prefetch") or {}
+        return cls(
+            saved_searches(config.get("job_preferences")),
+            refresh_search,
+            fetch_details,
+            stale_job_ids,
+            interval=prefetch_config.get("interval_seconds", DEFAULT_INTERVAL_SECONDS),
+            jitter=prefetch_config.get("jitter", DEFAULT_JITTER),
+            max_concurrency=prefetch_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+            max_details_per_run=prefetch_config.get("max_details_per_run", DEFAULT_MAX_DETAILS_PER_RUN),
+            refresh_margin=prefetch_config.get("refresh_margin_seconds", DEFAULT_REFRESH_MARGIN_SECONDS),
+        )
+
+    def next_delay(self):
+        """Return the jittered number of seconds until the next run"""
+        return self.interval * (1 + self.jitter * (2 * self._rand() - 1))
+
+    def result_ttl(self):
+        """Return how long a run's search results must stay cached to last until the next run refreshes them"""
+        return self.interval * (1 + self.jitter) + RESULT_TTL_SLACK_SECONDS
+
+    def _record_error(self, what, error):
+        logger.warning(f"Prefetch of {what} failed: {error}")
+        with self._lock:
+            self.errors += 1
+            self.last_error = f"{what}: {error}"
+
+    def _search(self, parameters):
+        try:
+            return self.refresh_search(parameters)
+        except Exception as e:
+            self._record_error(f"search {parameters}", e)
+            return []
+
+    def _details(self, job_id, reason):
+        try:
+            self.fetch_details(job_id)
+        except Exception as e:
+            self._record_error(f"job {job_id}", e)
+            return False
+        with self._lock:
+            if reason == "new":
+                self.details_prefetched += 1
+            else:
+                self.refreshed += 1
+            self._recent.append({"job_id": job_id, "reason": reason, "at": self._clock()})
+        return True
+
+    def run_once(self):
+        """Run every saved search, then prefetch and refresh details; return a summary of the run"""
+        started = self._clock()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="prefetch") as pool:
+            results = list(pool.map(self._search, self.searches))
+
+            candidates = {}
+            for job_ids in results:
+                for job_id in job_ids:
+                    candidates.setdefault(job_id, "new")
+            for job_id in self.stale_job_ids(self.refresh_margin):
+                candidates.setdefault(job_id, "stale")
+            targets = list(candidates.items())[:self.max_details_per_run]
+            fetched = sum(pool.map(lambda target: self._details(*target), targets))
+
+        summary = {
+            "started_at": started,
+            "duration_s": round(self._clock() - started, 3),
+            "searches": len(self.searches),
+            "details_fetched": fetched,
+            "details_skipped": len(candidates) - len(targets),
+        }
+        with self._lock:
+            self.runs += 1
+            self.searches_run += len(self.searches)
+            self._last_run = summary
+        logger.info(f"Prefetch run finished: {len(self.searches)} searches, {fetched} jobs fetched")
+        return summary
+
+    def _run(self):
+        while not self._stop.wait(self._next_run_at - self._clock()):
+            with self._lock:
+                self._running = True
+            try:
+                self.run_once()
+            except Exception as e:
+                self._record_error("run", e)
+            finally:
+                with self._lock:
+                    self._running = False
+                    self._next_run_at = self._clock() + self.next_delay()
+
+    def start(self):
+        """Start prefetching in a daemon thread; the first run is a jittered fraction of the interval away"""
+        if self._thread is None and self.searches:
+            self._next_run_at = self._clock() + self.jitter * self.interval * self._rand()
+            self._thread = threading.Thread(target=self._run, name="prefetch-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after the current run"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def status(self):
+        """Return what the scheduler has done so far and when it runs next"""
+        with self._lock:
+            return {
+                "enabled": self._thread is not None,
+                "running": self._running,
+                "saved_searches": self.searches,
+                "interval_seconds": self.interval,
+                "next_run_at": self._next_run_at,
+                "runs": self.runs,
+                "searches_run": self.searches_run,
+                "details_prefetched": self.details_prefetched,
+                "refreshed": self.refreshed,
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "last_run": self._last_run,
+                "recent": list(self._recent),
+            }
@@ -0,0 +1,202 @@
+"""
+Relevance Ranking
+Scores cached job postings against the user's job_preferences and skills.
+Per-posting features (skill overlap, title similarity, location match and
+posting date) are computed once when a posting is cached and kept in NumPy
+columns, so ranking the whole cache is a handful of array operations and a
+partial sort for the top k.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from search_cache import normalize_location
+from search_index import tokenize
+
+DEFAULT_WEIGHTS = {"skills": 0.4, "title": 0.3, "recency": 0.2, "location": 0.1}
+DEFAULT_HALF_LIFE_DAYS = 14
+
+_INITIAL_CAPACITY = 1024
+
+
+def _posted_timestamp(job):
+    date_posted = job.get("date_posted")
+    if not date_posted:
+        return math.nan
+    try:
+        return datetime.fromisoformat(str(date_posted)).timestamp()
+    except ValueError:
+        return math.nan
+
+
+def _normalize_skill(skill):
+    return " ".join(tokenize(skill))
+
+
+class RankingProfile:
+    """The preferences postings are scored against: skills, titles, locations and remote_only"""
+
+    def __init__(self, skills=(), titles=(), locations=(), remote_only=False):
+        self.skills = tuple(dict.fromkeys(s for s in (_normalize_skill(skill) for skill in skills) if s))
+        self.titles = [set(tokenize(title)) for title in titles if tokenize(title)]
+        self.locations = [set(tokenize(normalize_location(location))) for location in locations
+                          if tokenize(normalize_location(location))]
+        self.remote_only = remote_only
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the profile from job_preferences (titles, locations, remote_only, skills) in config.yaml"""
+        preferences = config.get("job_preferences") or {}
+        skills = preferences.get("skills") or (config.get("personal_info") or {}).get("skills") or ()
+        return cls(skills, preferences.get("titles") or (), preferences.get("locations") or (),
+                   bool(preferences.get("remote_only")))
+
+    def matched_skills(self, job):
+        """Return the profile skills a posting asks for or mentions"""
+        required = {_normalize_skill(skill) for skill in job.get("skills_required") or ()}
+        text = " " + " ".join(tokenize(" ".join(str(job.get(field) or "") for field in
+                                                 ("title", "description_snippet", "full_description")))) + " "
+        return [skill for skill in self.skills if skill in required or f" {skill} " in text]
+
+    def features(self, job):
+        """Return (skills, title, location) scores in [0, 1] for a posting"""
+        skills = len(self.matched_skills(job)) / len(self.skills) if self.skills else 0.0
+        title_tokens = set(tokenize(job.get("title")))
+        title = 0.0
+        for preferred in self.titles:
+            union = len(title_tokens | preferred)
+            if union:
+                title = max(title, len(title_tokens & preferred) / union)
+        location_tokens = set(tokenize(normalize_location(job.get("location"))))
+        remote = bool(job.get("remote")) or "remote" in location_tokens
+        if self.remote_only:
+            location = 1.0 if remote else 0.0
+        else:
+            location = 1.0 if any(preferred <= location_tokens or (remote and "remote" in preferred)
+                                  for preferred in self.locations) else 0.0
+        return skills, title, location
+
+
+class RankingIndex:
+    """
+    Thread-safe columnar store of ranking features for cached postings.
+
+    It implements the JobCache listener interface (add/remove/clear), so it
+    always covers exactly the cached postings. Recency is derived from the
+    posting date at query time, so scores never go stale.
+    """
+
+    def __init__(self, profile=None, weights=None, half_life_days=DEFAULT_HALF_LIFE_DAYS, clock=time.time):
+        self.profile = profile or RankingProfile()
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.half_life_days = half_life_days
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.clear()
+
+    @classmethod
+    def from_config(cls, config):
+        """Build an index from job_preferences and the optional 'ranking' section of config.yaml"""
+        ranking_config = config.get("ranking") or {}
+        return cls(
+            RankingProfile.from_config(config),
+            weights=ranking_config.get("weights"),
+            half_life_days=ranking_config.get("half_life_days", DEFAULT_HALF_LIFE_DAYS),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._slots = {}
+            self._job_ids = []
+            self._free = []
+            self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+            self._features = np.zeros((_INITIAL_CAPACITY, 3), dtype=np.float32)
+            self._posted = np.full(_INITIAL_CAPACITY, np.nan)
+
+    def _grow(self):
+        capacity = len(self._alive) * 2
+        self._alive = np.resize(self._alive, capacity)
+        self._alive[len(self._job_ids):] = False
+        features = np.zeros((capacity, 3), dtype=np.float32)
+        features[:len(self._features)] = self._features
+        self._features = features
+        posted = np.full(capacity, np.nan)
+        posted[:len(self._posted)] = self._posted
+        self._posted = posted
+
+    def __len__(self):
+        return len(self._slots)
+
+    def add(self, job):
+        """Compute and store the features of a posting, replacing any previous ones"""
+        job_id = job["job_id"]
+        features = self.profile.features(job)
+        posted = _posted_timestamp(job)
+        with self._lock:
+            slot = self._slots.get(job_id)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                    self._job_ids[slot] = job_id
+                else:
+                    slot = len(self._job_ids)
+                    if slot == len(self._alive):
+                        self._grow()
+                    self._job_ids.append(job_id)
+                self._slots[job_id] = slot
+            self._features[slot] = features
+            self._posted[slot] = posted
+            self._alive[slot] = True
+
+    def remove(self, job_id):
+        with self._lock:
+            slot = self._slots.pop(job_id, None)
+            if slot is not None:
+                self._alive[slot] = False
+                self._job_ids[slot] = None
+                self._free.append(slot)
+
+    def _scores(self, slots):
+        features = self._features[slots]
+        age_days = np.maximum(self._clock() - self._posted[slots], 0.0) / 86400.0
+        recency = np.nan_to_num(np.exp2(-age_days / self.half_life_days), nan=0.0)
+        weights = self.weights
+        scores = features @ np.array([weights["skills"], weights["title"], weights["location"]], dtype=np.float32)
+        return scores + weights["recency"] * recency, features, recency
+
+    def top_k(self, k, job_ids=None):
+        """
+        Return the k best postings as (job_id, score, components), best first.
+
+        job_ids restricts ranking to those postings; by default every cached
+        posting is ranked. components holds the skills, title, recency and
+        location scores behind each total.
+        """
+        with self._lock:
+            if job_ids is None:
+                slots = np.flatnonzero(self._alive[:len(self._job_ids)])
+            else:
+                slots = np.fromiter((self._slots[job_id] for job_id in job_ids if job_id in self._slots),
+                                    dtype=np.intp)
+            if k <= 0 or not len(slots):
+                return []
+            scores, features, recency = self._scores(slots)
+            if k < len(slots):
+                best = np.argpartition(-scores, k - 1)[:k]
+            else:
+                best = np.arange(len(slots))
+            best = best[np.argsort(-scores[best], kind="stable")]
+            results = []
+            for i in best:
+                components = {
+                    "skills": round(float(features[i, 0]), 4),
+                    "title": round(float(features[i, 1]), 4),
+                    "recency": round(float(recency[i]), 4),
+                    "location": round(float(features[i, 2]), 4),
+                }
+                results.append((self._job_ids[slots[i]], round(float(scores[i]), 4), components))
+            return results
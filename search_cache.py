@@ -0,0 +1,174 @@
+"""
+Search Result Cache
+Caches search_jobs results under a canonical key built from the normalized
+search parameters, and answers narrower queries from broader cached results.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from itertools import combinations
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 5 * 60
+
+# Parameters that select a subset of a broader search and can therefore be
+# applied locally to a cached result set
+FILTER_FIELDS = ("experience_level", "job_type", "remote")
+
+LOCATION_ALIASES = {
+    "uk": "united kingdom",
+    "u.k.": "united kingdom",
+    "gb": "united kingdom",
+    "great britain": "united kingdom",
+    "england": "united kingdom",
+    "us": "united states",
+    "u.s.": "united states",
+    "usa": "united states",
+    "united states of america": "united states",
+    "nyc": "new york",
+    "new york city": "new york",
+    "sf": "san francisco",
+    "la": "los angeles",
+    "uae": "united arab emirates",
+    "wfh": "remote",
+    "anywhere": "remote",
+    "work from home": "remote",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize_text(value):
+    if value is None:
+        return None
+    value = _WHITESPACE.sub(" ", str(value)).strip().lower()
+    return value or None
+
+
+def normalize_location(location):
+    """Normalize a location string, expanding common aliases per component"""
+    location = _normalize_text(location)
+    if location is None:
+        return None
+    parts = [part.strip() for part in location.split(",") if part.strip()]
+    return ", ".join(LOCATION_ALIASES.get(part, part) for part in parts)
+
+
+def normalize_search_params(parameters):
+    """Reduce search_jobs parameters to their canonical form"""
+    return {
+        "title": _normalize_text(parameters.get("title")),
+        "location": normalize_location(parameters.get("location")),
+        "experience_level": _normalize_text(parameters.get("experience_level")),
+        "job_type": _normalize_text(parameters.get("job_type")),
+        # remote=False means "no preference", not "on-site only"
+        "remote": True if parameters.get("remote") else None,
+    }
+
+
+def search_key(normalized):
+    """Build a hashable cache key from normalized search parameters"""
+    return tuple(sorted(normalized.items()))
+
+
+def _matches(job, field, value):
+    if field == "remote":
+        return bool(job.get("remote"))
+    return _normalize_text(job.get(field)) == value
+
+
+class SearchResultCache:
+    """
+    Thread-safe TTL cache of search results keyed on normalized parameters.
+
+    A query that is not cached itself may still be served from a cached
+    broader query (one with fewer of FILTER_FIELDS set) by filtering the
+    broader result set locally.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, clock=time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.filtered_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, search_cache_config):
+        """Build a cache from the optional 'search_cache' section of config.yaml"""
+        search_cache_config = search_cache_config or {}
+        return cls(
+            max_entries=search_cache_config.get("max_entries", DEFAULT_MAX_ENTRIES),
+            ttl=search_cache_config.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+        )
+
+    def _lookup(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, jobs = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return jobs
+
+    def get(self, parameters):
+        """Return cached jobs for parameters, or None on a miss"""
+        normalized = normalize_search_params(parameters)
+        now = self._clock()
+        with self._lock:
+            jobs = self._lookup(search_key(normalized), now)
+            if jobs is not None:
+                self.hits += 1
+                return [dict(job) for job in jobs]
+
+            active = [field for field in FILTER_FIELDS if normalized[field] is not None]
+            # Prefer the most specific broader query: drop as few filters as possible
+            for drop_count in range(1, len(active) + 1):
+                for dropped in combinations(active, drop_count):
+                    broader = dict(normalized, **{field: None for field in dropped})
+                    jobs = self._lookup(search_key(broader), now)
+                    if jobs is not None:
+                        self.filtered_hits += 1
+                        return [
+                            dict(job) for job in jobs
+                            if all(_matches(job, field, normalized[field]) for field in dropped)
+                        ]
+
+            self.misses += 1
+            return None
+
+    def put(self, parameters, jobs, ttl=None):
+        """Cache the result set for parameters, for ttl seconds instead of the cache's own TTL if given"""
+        key = search_key(normalize_search_params(parameters))
+        entry = (self._clock() + (self.ttl if ttl is None else ttl), tuple(dict(job) for job in jobs))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every cached result set"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return cache counters and current usage"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "filtered_hits": self.filtered_hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,376 @@
+"""
+Search Index
+In-process inverted index with facet bitmaps over cached job postings.
+
+Each posting gets an integer document number. Tokens, facet values, location
+tokens and posting dates map to bitsets of document numbers, so filtering is
+a handful of big-integer ANDs. Ranking groups the matching documents by score,
+splitting the groups by one query token's score tiers at a time, and only
+looks at the best groups and posting dates needed to fill the requested page.
+Queries whose matches have too many distinct scores to group are scored
+document by document instead.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+
+from search_cache import normalize_location
+
+# Relative weight of a token appearing in each indexed field. A posting's
+# weight for a token is the sum over the fields that contain it, so each
+# token has at most a few distinct weights (score tiers).
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "company": 1.5,
+    "location": 1.0,
+    "description_snippet": 0.5,
+    "full_description": 0.25,
+}
+
+FACET_FIELDS = ("experience_level", "job_type", "remote")
+
+# Bitsets with fewer members than this stay as plain sets, which keeps the
+# long tail of rare tokens (company names, numbers) cheap to store
+SMALL_BITSET_LIMIT = 32
+
+# Title tokens beyond this many are ignored, which bounds the cost of a query
+MAX_QUERY_TOKENS = 12
+
+# Past this many distinct scores, matching documents are scored one by one
+MAX_SCORE_GROUPS = 256
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text):
+    """Split text into lowercase search tokens"""
+    if not text:
+        return []
+    return _TOKEN.findall(str(text).lower())
+
+
+def facet_value(field, value):
+    """Normalize a facet value so that query and posting values compare equal"""
+    if field == "remote":
+        return bool(value)
+    if value is None:
+        return None
+    return " ".join(str(value).lower().split())
+
+
+def iter_bits(bitmap):
+    """Yield the positions of the set bits of an int bitmap, lowest first"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield (index << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+def iter_bits_descending(bitmap):
+    """Yield the positions of the set bits of an int bitmap, highest first"""
+    while bitmap:
+        top = bitmap.bit_length() - 1
+        yield top
+        bitmap ^= 1 << top
+
+
+class _Bitset:
+    """Mutable set of document numbers, stored as a set while small and as a bytearray bitmap once large"""
+
+    __slots__ = ("_small", "_bitmap", "count")
+
+    def __init__(self):
+        self._small = set()
+        self._bitmap = None
+        self.count = 0
+
+    def add(self, doc):
+        if self._bitmap is None:
+            if doc in self._small:
+                return
+            self._small.add(doc)
+            self.count += 1
+            if self.count >= SMALL_BITSET_LIMIT:
+                self._bitmap = bytearray()
+                for member in self._small:
+                    self._set(member)
+                self._small = None
+            return
+        if not self._test(doc):
+            self._set(doc)
+            self.count += 1
+
+    def discard(self, doc):
+        if self._bitmap is None:
+            if doc in self._small:
+                self._small.remove(doc)
+                self.count -= 1
+        elif self._test(doc):
+            self._bitmap[doc >> 3] &= ~(1 << (doc & 7)) & 0xFF
+            self.count -= 1
+
+    def _set(self, doc):
+        index = doc >> 3
+        if index >= len(self._bitmap):
+            self._bitmap.extend(bytes(index + 1 - len(self._bitmap)))
+        self._bitmap[index] |= 1 << (doc & 7)
+
+    def _test(self, doc):
+        index = doc >> 3
+        return index < len(self._bitmap) and self._bitmap[index] & (1 << (doc & 7))
+
+    def to_int(self):
+        """Return the members as an int bitmap"""
+        if self._bitmap is not None:
+            return int.from_bytes(self._bitmap, "little")
+        if not self._small:
+            return 0
+        bitmap = bytearray((max(self._small) >> 3) + 1)
+        for doc in self._small:
+            bitmap[doc >> 3] |= 1 << (doc & 7)
+        return int.from_bytes(bitmap, "little")
+
+
+class _DocEntry:
+    __slots__ = ("job", "weights", "location_tokens", "facets", "date")
+
+    def __init__(self, job, weights, location_tokens, facets, date):
+        self.job = job
+        self.weights = weights
+        self.location_tokens = location_tokens
+        self.facets = facets
+        self.date = date
+
+
+class SearchIndex:
+    """
+    Thread-safe inverted index supporting incremental add and remove.
+
+    It implements the JobCache listener interface (add/remove/clear) so it
+    tracks exactly the set of cached postings.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Remove every document from the index"""
+        with self._lock:
+            self._doc_ids = {}
+            self._docs = []
+            self._dead = 0
+            self._alive = _Bitset()
+            self._token_df = {}
+            self._token_tiers = {}
+            self._location_bits = {}
+            self._facet_bits = {field: {} for field in FACET_FIELDS}
+            self._date_bits = {}
+            self._dates = []
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def __contains__(self, job_id):
+        return job_id in self._doc_ids
+
+    def add(self, job):
+        """Index a job posting, replacing any previous version of it"""
+        job_id = job["job_id"]
+        weights = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in set(tokenize(job.get(field))):
+                weights[token] = weights.get(token, 0.0) + weight
+        location_tokens = set(tokenize(normalize_location(job.get("location"))))
+        facets = [(field, facet_value(field, job.get(field))) for field in FACET_FIELDS]
+        date = str(job.get("date_posted") or "")
+
+        with self._lock:
+            if job_id in self._doc_ids:
+                self._remove(job_id)
+            doc = len(self._docs)
+            self._doc_ids[job_id] = doc
+            self._docs.append(_DocEntry(job, weights, location_tokens, facets, date))
+            self._alive.add(doc)
+            for token, weight in weights.items():
+                self._token_df[token] = self._token_df.get(token, 0) + 1
+                tiers = self._token_tiers.setdefault(token, {})
+                tier = tiers.get(weight)
+                if tier is None:
+                    tier = tiers[weight] = _Bitset()
+                tier.add(doc)
+            for token in location_tokens:
+                self._bitset(self._location_bits, token).add(doc)
+            for field, value in facets:
+                self._bitset(self._facet_bits[field], value).add(doc)
+            if date not in self._date_bits:
+                bisect.insort(self._dates, date)
+            self._bitset(self._date_bits, date).add(doc)
+
+    @staticmethod
+    def _bitset(mapping, key):
+        bitset = mapping.get(key)
+        if bitset is None:
+            bitset = mapping[key] = _Bitset()
+        return bitset
+
+    def remove(self, job_id):
+        """Drop a job posting from the index if present"""
+        with self._lock:
+            if job_id in self._doc_ids:
+                self._remove(job_id)
+                # Document numbers are never reused, so compact once most are dead
+                if self._dead > 1024 and self._dead > len(self._doc_ids):
+                    self._compact()
+
+    def _remove(self, job_id):
+        doc = self._doc_ids.pop(job_id)
+        entry = self._docs[doc]
+        self._alive.discard(doc)
+        for token, weight in entry.weights.items():
+            tiers = self._token_tiers[token]
+            tiers[weight].discard(doc)
+            if not tiers[weight].count:
+                del tiers[weight]
+            self._token_df[token] -= 1
+            if not self._token_df[token]:
+                del self._token_df[token]
+                del self._token_tiers[token]
+        for token in entry.location_tokens:
+            self._location_bits[token].discard(doc)
+        for field, value in entry.facets:
+            self._facet_bits[field][value].discard(doc)
+        dates = self._date_bits[entry.date]
+        dates.discard(doc)
+        if not dates.count:
+            del self._date_bits[entry.date]
+            self._dates.remove(entry.date)
+        self._docs[doc] = None
+        self._dead += 1
+
+    def _compact(self):
+        jobs = [entry.job for entry in self._docs if entry is not None]
+        self.clear()
+        for job in jobs:
+            self.add(job)
+
+    def _lookup_bits(self, mapping, key):
+        bitset = mapping.get(key)
+        return bitset.to_int() if bitset is not None else 0
+
+    def _candidates(self, location=None, experience_level=None, job_type=None, remote=None):
+        bits = self._alive.to_int()
+        if experience_level:
+            bits &= self._lookup_bits(self._facet_bits["experience_level"],
+                                      facet_value("experience_level", experience_level))
+        if job_type:
+            bits &= self._lookup_bits(self._facet_bits["job_type"], facet_value("job_type", job_type))
+        if remote:
+            bits &= self._lookup_bits(self._facet_bits["remote"], True)
+        if location:
+            for token in tokenize(normalize_location(location)):
+                if not bits:
+                    break
+                bits &= self._lookup_bits(self._location_bits, token)
+        return bits
+
+    def _take_newest(self, bits, limit, out):
+        """Append up to limit docs from bits to out, newest date_posted first"""
+        remaining = bits.bit_count() if hasattr(bits, "bit_count") else bin(bits).count("1")
+        for date in reversed(self._dates):
+            if len(out) >= limit or not remaining:
+                return
+            dated = bits & self._date_bits[date].to_int()
+            if not dated:
+                continue
+            for doc in iter_bits_descending(dated):
+                remaining -= 1
+                out.append(doc)
+                if len(out) >= limit:
+                    return
+
+    def _query_tiers(self, query_tokens):
+        """Return each known query token's (score, bits) weight tiers"""
+        total = len(self._doc_ids) or 1
+        tiers_per_token = []
+        for token in query_tokens:
+            tiers = self._token_tiers.get(token)
+            if tiers:
+                idf = math.log(1 + total / self._token_df[token])
+                tiers_per_token.append([(weight * idf, bitset.to_int()) for weight, bitset in tiers.items()])
+        return tiers_per_token
+
+    def _rank(self, query_tokens, candidates, limit):
+        """Return up to limit docs matching a query token, highest score first"""
+        tiers_per_token = self._query_tiers(query_tokens)
+        # Split the candidates into equal-score groups by one token's tiers
+        # at a time, dropping empty intersections as they appear
+        groups = {0.0: candidates}
+        for position, tiers in enumerate(tiers_per_token):
+            split = {}
+            for score, bits in groups.items():
+                rest = bits
+                for tier_score, tier_bits in tiers:
+                    matched = bits & tier_bits
+                    if matched:
+                        key = score + tier_score
+                        split[key] = split.get(key, 0) | matched
+                        rest &= ~tier_bits
+                if rest:
+                    split[score] = split.get(score, 0) | rest
+            groups = split
+            if len(groups) > MAX_SCORE_GROUPS:
+                return self._rank_by_document(groups, tiers_per_token[position + 1:], candidates, limit)
+        groups.pop(0.0, None)
+        docs = []
+        for _, bits in sorted(groups.items(), reverse=True):
+            self._take_newest(bits, limit, docs)
+            if len(docs) >= limit:
+                break
+        return docs
+
+    def _rank_by_document(self, groups, tiers_per_token, candidates, limit):
+        """Score every candidate individually; used once scores are too varied to group"""
+        scores = {}
+        for score, bits in groups.items():
+            for doc in iter_bits(bits):
+                scores[doc] = score
+        for tiers in tiers_per_token:
+            for tier_score, tier_bits in tiers:
+                for doc in iter_bits(tier_bits & candidates):
+                    scores[doc] += tier_score
+        docs = heapq.nlargest(limit, (doc for doc, score in scores.items() if score),
+                              key=lambda doc: (scores[doc], self._docs[doc].date, doc))
+        return docs
+
+    def search(self, title=None, location=None, experience_level=None, job_type=None, remote=None, limit=10):
+        """
+        Return up to limit matching jobs, best first.
+
+        Facets and location are hard filters; every location token must occur
+        in the posting's location. Title tokens are ranked with TF-IDF over
+        the indexed fields, and a posting must match at least one of them;
+        only the first MAX_QUERY_TOKENS distinct tokens are used. Equal
+        scores, and queries without a title, are ordered by date_posted,
+        newest first.
+        """
+        with self._lock:
+            candidates = self._candidates(location, experience_level, job_type, remote)
+            docs = []
+            if candidates:
+                query_tokens = list(dict.fromkeys(tokenize(title)))[:MAX_QUERY_TOKENS]
+                if not query_tokens:
+                    self._take_newest(candidates, limit, docs)
+                else:
+                    docs = self._rank(query_tokens, candidates, limit)
+            return [self._docs[doc].job for doc in docs]
+
+    def facet_counts(self, field):
+        """Return the number of indexed postings for each value of a facet field"""
+        with self._lock:
+            return {value: bitset.count for value, bitset in self._facet_bits[field].items() if bitset.count}
@@ -0,0 +1,78 @@
+"""
+Search Stream
+Page-by-page upstream search iteration with resumable cursor tokens, used
+to stream search_jobs results as they arrive.
+"""
+
+import base64
+import json
+
+from search_cache import normalize_search_params
+
+DEFAULT_PAGE_SIZE = 25
+DEFAULT_STREAM_LIMIT = 100
+MAX_STREAM_LIMIT = 1000
+
+
+class InvalidSearchCursor(ValueError):
+    """Raised when a search cursor cannot be decoded or does not match the search"""
+
+
+def encode_search_cursor(parameters, start):
+    """Encode the search parameters and the upstream offset to resume from as an opaque token"""
+    payload = json.dumps([normalize_search_params(parameters), start], sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_search_cursor(cursor):
+    """Decode a cursor token into (search_parameters, start)"""
+    try:
+        parameters, start = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(parameters, dict) or not isinstance(start, int) or start < 0:
+            raise ValueError(cursor)
+    except (ValueError, TypeError, UnicodeError, AttributeError):
+        raise InvalidSearchCursor(f"Invalid cursor: {cursor}")
+    return parameters, start
+
+
+def resolve_search(parameters):
+    """
+    Return (search_parameters, start) for a streaming request.
+
+    A cursor carries its own search parameters; any search fields sent along
+    with it must describe the same search.
+    """
+    cursor = parameters.get("cursor")
+    if not cursor:
+        return parameters, 0
+    search, start = decode_search_cursor(cursor)
+    given = normalize_search_params(parameters)
+    if any(value is not None for value in given.values()) and given != normalize_search_params(search):
+        raise InvalidSearchCursor("cursor does not match the search parameters")
+    return search, start
+
+
+def iter_pages(fetch_page, parameters, start=0, limit=DEFAULT_STREAM_LIMIT, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return an iterator of (job, next_start) for up to limit jobs, fetching one upstream page at a time.
+
+    fetch_page(parameters, start, count) returns at most count jobs; a short
+    page ends the search. Only one page is held in memory at a time. Raises
+    ValueError at once if page_size is less than 1.
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    return _iter_pages(fetch_page, parameters, start, limit, page_size)
+
+
+def _iter_pages(fetch_page, parameters, start, limit, page_size):
+    remaining = limit
+    while remaining > 0:
+        count = min(page_size, remaining)
+        page = fetch_page(parameters, start, count)
+        for job in page[:count]:
+            start += 1
+            remaining -= 1
+            yield job, start
+        if len(page) < count:
+            return
@@ -5,15 +5,35 @@ This server implements the Model Context Protocol (MCP) to allow Amazon Q
 to search for and apply to LinkedIn jobs.
 """
 
-import json
 import logging
 import os
 import sys
-import yaml
+import threading
 from datetime import datetime
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-from linkedin_api import Linkedin
+from flask.json.provider import DefaultJSONProvider
+from audit_log import ATTEMPT, AuditLog, AuditLogError
+from batch import BatchError, batch_response, iter_batch, parse_batch_request
+from bulk_apply import (DEFAULT_MAX_JOBS, DEFAULT_MAX_PARALLELISM, BulkApplyError, CheckpointStore, InvalidRunId,
+                        RunInProgress, execute)
+from config_store import DEFAULT_CONFIG_PATH, ConfigError, ConfigSnapshot, ConfigWatcher, load_snapshot
+from cover_letter import CoverLetterRenderer
+from history_store import DEFAULT_HISTORY_PATH, DuplicateApplication, HistoryStore, InvalidCursor
+import json_codec
+from job_cache import JobCache
+from job_record import DETAIL_FIELDS
+from metrics import CONTENT_TYPE, REGISTRY, SlowCallProfiler, ToolTimer
+from linkedin_gateway import GatewayError, LinkedInGateway
+from prefetch import PrefetchScheduler
+from search_cache import SearchResultCache, normalize_search_params, search_key
+from search_index import SearchIndex
+from search_stream import (DEFAULT_PAGE_SIZE, DEFAULT_STREAM_LIMIT, MAX_STREAM_LIMIT, InvalidSearchCursor,
+                           encode_search_cursor, iter_pages, resolve_search)
+from session_cache import SessionAuthenticator, SessionCache, SessionRefresher
+from shared_state import LocalBackend, backend_from_config
+from singleflight import SingleFlight, SingleFlightTimeout
+from warmup import WarmUp
 
 # Configure logging
 logging.basicConfig(
@@ -23,53 +43,215 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes and decodes through json_codec, falling
+    back to Flask's own encoding of dates, decimals, UUIDs and dataclasses
+    and sorting keys as Flask does (app.json.sort_keys)
+    """
+
+    def dumps(self, obj, **kwargs):
+        return json_codec.dumps(obj, default=self.default, sort_keys=self.sort_keys).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return json_codec.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_codec.dumps(obj, default=self.default, sort_keys=self.sort_keys),
+                                        mimetype=self.mimetype)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Global variables
-config = {}
+config = ConfigSnapshot()
+config_watcher = None
+state_backend = LocalBackend()
 linkedin_client = None
-job_cache = {}
-application_history = []
+session_refresher = None
+prefetch_scheduler = None
+slow_call_profiler = None
+bulk_apply_store = CheckpointStore()
+cover_letters = CoverLetterRenderer()
+upstream_flight = SingleFlight(timeout=30)
+job_cache = JobCache()
+search_cache = SearchResultCache()
+search_index = SearchIndex()
+job_cache.subscribe(search_index)
+# Built over the cached postings on first use; NumPy is imported then
+ranking_index = None
+duplicate_index = None
+application_history = HistoryStore()
+audit_log = None
+warm_up = WarmUp()
+server_started = threading.Event()
+
+MAX_HISTORY_PAGE_SIZE = 100
+MAX_RANKED_JOBS = 100
+
+# Search matches that are re-ranked by relevance or collapsed into duplicate groups
+RERANK_CANDIDATES = 500
+
+WARM_UP_MODES = ("lazy", "background", "eager")
+
+def Linkedin(*args, **kwargs):
+    """Create a linkedin_api client; the library is slow to import, so it is imported on first use"""
+    from linkedin_api import Linkedin as LinkedinClient
+    return LinkedinClient(*args, **kwargs)
 
 def load_config():
-    """Load configuration from config.yaml"""
+    """Load and validate config.yaml into an immutable snapshot"""
     global config
     try:
-        with open('config.yaml', 'r') as file:
-            config = yaml.safe_load(file)
+        config = load_snapshot(DEFAULT_CONFIG_PATH)
         logger.info("Configuration loaded successfully")
         return True
+    except ConfigError as e:
+        logger.error(str(e))
+        return False
     except Exception as e:
         logger.error(f"Failed to load configuration: {e}")
         return False
 
+def initialize_state():
+    """Select the backend for state shared between worker processes (state.backend)"""
+    global state_backend
+    state_backend = backend_from_config(config.get('state'))
+    logger.info(f"Shared state backend: {state_backend.name}")
+
+def initialize_cache():
+    """Initialize the job and search result caches from the optional cache configuration"""
+    global job_cache, search_cache, search_index, ranking_index, duplicate_index
+    job_cache = JobCache.from_config(config.get('cache'), shared=state_backend.job_store())
+    search_cache = SearchResultCache.from_config(config.get('search_cache'))
+    search_index = SearchIndex()
+    job_cache.subscribe(search_index)
+    # The ranking and duplicate indexes are rebuilt over the new cache on first use
+    ranking_index = duplicate_index = None
+    warm_up.reset("ranking")
+    warm_up.reset("dedup")
+    logger.info(f"Job cache initialized (max_entries={job_cache.max_entries}, ttl={job_cache.ttl}s)")
+
+def build_ranking_index():
+    """Score cached postings against job_preferences and the optional ranking configuration"""
+    global ranking_index
+    from ranking import RankingIndex
+    index = RankingIndex.from_config(config)
+    if ranking_index is not None:
+        job_cache.unsubscribe(ranking_index)
+    job_cache.subscribe(index)
+    ranking_index = index
+    return True
+
+def build_duplicate_index():
+    """Group near-duplicate cached postings using the optional dedup configuration"""
+    global duplicate_index
+    from dedup import DuplicateIndex
+    index = DuplicateIndex.from_config(config.get('dedup'))
+    if duplicate_index is not None:
+        job_cache.unsubscribe(duplicate_index)
+    job_cache.subscribe(index)
+    duplicate_index = index
+    return True
+
+def initialize_ranking():
+    """Rebuild the ranking index after a configuration change, unless it has not been built yet"""
+    if ranking_index is not None:
+        build_ranking_index()
+
+def initialize_dedup():
+    """Rebuild the duplicate index after a configuration change, unless it has not been built yet"""
+    if duplicate_index is not None:
+        build_duplicate_index()
+
+def require_linkedin():
+    """Return the LinkedIn gateway, creating it on the first call that needs it, or None if that fails"""
+    if linkedin_client is None:
+        warm_up.ensure("linkedin")
+    return linkedin_client
+
+def require_ranking_index():
+    """Return the ranking index, building it over the cached postings on first use"""
+    if ranking_index is None and not warm_up.ensure("ranking"):
+        raise RuntimeError("Ranking index is unavailable")
+    return ranking_index
+
+def require_duplicate_index():
+    """Return the duplicate index, building it over the cached postings on first use"""
+    if duplicate_index is None and not warm_up.ensure("dedup"):
+        raise RuntimeError("Duplicate index is unavailable")
+    return duplicate_index
+
+def initialize_history():
+    """Open the persistent application history store"""
+    global application_history
+    path = (config.get('storage') or {}).get('history_path', DEFAULT_HISTORY_PATH)
+    application_history = state_backend.open_history(path)
+    logger.info(f"Application history loaded from {path} ({len(application_history)} applications)")
+
+def initialize_audit_log():
+    """Open the application audit log (audit section) and restore applications the history is missing"""
+    global audit_log
+    if audit_log is not None:
+        audit_log.close()
+    audit_log = AuditLog.from_config(config.get('audit'))
+    if audit_log is None:
+        return
+    attempts, summary = audit_log.replay()
+    applications = [record["application"] for record in attempts.values()
+                    if record.get("status") == "applied" and record.get("application")]
+    restored = application_history.restore(applications)
+    logger.info(f"Audit log replayed: {summary['records']} records in {summary['segments']} segments, "
+                f"{restored} applications restored to the history")
+    unresolved = sorted({record["job_id"] for record in attempts.values() if record["type"] == ATTEMPT})
+    if unresolved:
+        logger.warning(f"Applications to {len(unresolved)} jobs were started but have no recorded outcome; "
+                       f"check them on LinkedIn: {', '.join(unresolved[:20])}")
+
+def initialize_cover_letters():
+    """Compile the default cover letter template from the configuration"""
+    global cover_letters
+    cover_letters = CoverLetterRenderer.from_config(config)
+
 def initialize_linkedin():
-    """Initialize LinkedIn API client"""
-    global linkedin_client
+    """Initialize the pooled, rate-limited LinkedIn API gateway"""
+    global linkedin_client, upstream_flight, session_refresher
     try:
         if not config.get('linkedin'):
             logger.error("LinkedIn configuration missing")
             return False
-            
-        linkedin_client = Linkedin(
-            config['linkedin'].get('username', ''),
-            config['linkedin'].get('password', '')
-        )
-        logger.info("LinkedIn client initialized successfully")
+
+        session_config = config.get('session_cache') or {}
+        if session_config.get('enabled', True):
+            authenticator = SessionAuthenticator(SessionCache.from_config(session_config), Linkedin)
+            linkedin_client = LinkedInGateway.from_config(config, authenticator,
+                                                          reauthenticate=authenticator.reauthenticate)
+            if session_refresher is not None:
+                session_refresher.stop()
+            session_refresher = SessionRefresher(
+                linkedin_client, authenticator,
+                interval=session_config.get('check_interval_seconds', 300),
+                margin=session_config.get('refresh_margin_seconds', 3600),
+            )
+            session_refresher.start()
+        else:
+            linkedin_client = LinkedInGateway.from_config(config, Linkedin)
+        upstream_flight = SingleFlight(timeout=(config.get('gateway') or {}).get('coalesce_timeout', 30))
+        logger.info(f"LinkedIn client initialized successfully ({linkedin_client.pool_size} sessions)")
         return True
     except Exception as e:
         logger.error(f"Failed to initialize LinkedIn client: {e}")
         return False
 
-@app.route('/mcp/v1/tools', methods=['GET'])
-def get_tools():
-    """Return the list of tools provided by this MCP server"""
-    tools = [
+def build_tool_manifest():
+    """Build the schemas of the tools provided by this MCP server"""
+    return [
         {
             "name": "search_jobs",
-            "description": "Search for jobs on LinkedIn based on criteria",
+            "description": "Search for jobs on LinkedIn based on criteria; results are ranked by relevance to the title",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -97,8 +279,23 @@ def get_tools():
                     },
                     "limit": {
                         "type": "integer",
-                        "description": "Maximum number of jobs to return",
+                        "description": "Maximum number of jobs to return (default 10, or 100 when streaming)",
                         "default": 10
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "When streaming, a cursor from a previous stream to resume the search after it"
+                    },
+                    "sort": {
+                        "type": "string",
+                        "description": "Order by match to the title ('match', default) or by relevance to your job preferences and skills ('relevance')",
+                        "enum": ["match", "relevance"],
+                        "default": "match"
+                    },
+                    "collapse_duplicates": {
+                        "type": "boolean",
+                        "description": "Return each reposted or multi-location job once, listing the other postings as duplicates",
+                        "default": False
                     }
                 },
                 "required": ["title"]
@@ -118,6 +315,20 @@ def get_tools():
                 "required": ["job_id"]
             }
         },
+        {
+            "name": "rank_jobs",
+            "description": "Rank every cached job by relevance to your job preferences and skills",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": f"Maximum number of jobs to return (default 10, at most {MAX_RANKED_JOBS})",
+                        "default": 10
+                    }
+                }
+            }
+        },
         {
             "name": "apply_to_job",
             "description": "Apply to a specific job with your profile",
@@ -130,19 +341,63 @@ def get_tools():
                     },
                     "cover_letter": {
                         "type": "string",
-                        "description": "Custom cover letter for this application (optional)"
+                        "description": "Custom cover letter for this application (optional); placeholders such as [JOB_TITLE], [COMPANY_NAME] and [YOUR_NAME] are filled in"
                     },
                     "phone_number": {
                         "type": "string",
                         "description": "Phone number to use for this application (optional)"
+                    },
+                    "allow_duplicate": {
+                        "type": "boolean",
+                        "description": "Apply even if this job, or the same role at the same company, was already applied to",
+                        "default": False
                     }
                 },
                 "required": ["job_id"]
             }
         },
+        {
+            "name": "bulk_apply_to_jobs",
+            "description": "Apply to several jobs at once, given their IDs or a search, and report the outcome for each; progress is saved so an interrupted run can be resumed with its run_id",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "job_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "LinkedIn job IDs to apply to"
+                    },
+                    "search": {
+                        "type": "object",
+                        "description": "search_jobs parameters selecting the jobs to apply to, used when job_ids is not given"
+                    },
+                    "cover_letter": {
+                        "type": "string",
+                        "description": "Cover letter template for every application (optional); placeholders such as [JOB_TITLE] and [COMPANY_NAME] are filled in per job"
+                    },
+                    "phone_number": {
+                        "type": "string",
+                        "description": "Phone number for every application (optional)"
+                    },
+                    "allow_duplicate": {
+                        "type": "boolean",
+                        "description": "Apply even to jobs that were already applied to",
+                        "default": False
+                    },
+                    "max_parallelism": {
+                        "type": "integer",
+                        "description": "Maximum number of applications submitted at once (capped by bulk_apply.max_parallelism)"
+                    },
+                    "run_id": {
+                        "type": "string",
+                        "description": "run_id of an earlier run to resume; jobs with a final outcome are not applied to again"
+                    }
+                }
+            }
+        },
         {
             "name": "get_application_history",
-            "description": "Get history of job applications made through this tool",
+            "description": "Get history of job applications made through this tool, newest first",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -150,120 +405,399 @@ def get_tools():
                         "type": "integer",
                         "description": "Maximum number of applications to return",
                         "default": 10
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous response's next_cursor to fetch the next page"
+                    },
+                    "company": {
+                        "type": "string",
+                        "description": "Only return applications to this company"
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "Only return applications made at or after this ISO-8601 date/time"
+                    },
+                    "until": {
+                        "type": "string",
+                        "description": "Only return applications made at or before this ISO-8601 date/time; a date includes that whole day"
+                    },
+                    "status": {
+                        "type": "string",
+                        "description": "Only return applications with this status (e.g., 'applied')"
                     }
                 }
             }
         }
     ]
-    
-    return jsonify({"tools": tools})
+
+# The manifest never changes while the server runs, so it is built and
+# serialized once and revalidated by clients with its ETag
+TOOLS = build_tool_manifest()
+TOOL_MANIFEST = json_codec.StaticJSON({"tools": TOOLS})
+
+def list_tools():
+    """Return the schemas of the tools provided by this MCP server"""
+    return TOOLS
+
+@app.route('/mcp/v1/tools', methods=['GET'])
+def get_tools():
+    """Return the list of tools provided by this MCP server"""
+    headers = {"ETag": TOOL_MANIFEST.etag, "Cache-Control": "no-cache"}
+    if json_codec.etag_matches(request.headers.get('If-None-Match'), TOOL_MANIFEST.etag):
+        return Response(status=304, headers=headers)
+    body, encoding = TOOL_MANIFEST.encoded(request.headers.get('Accept-Encoding'))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    response = Response(body, mimetype='application/json', headers=headers)
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Compress large JSON responses for clients that accept gzip or zstd"""
+    if (response.mimetype != 'application/json' or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    body, encoding = json_codec.encode_body(response.get_data(), request.headers.get('Accept-Encoding'))
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+    return response
 
 @app.route('/mcp/v1/invoke', methods=['POST'])
 def invoke_tool():
     """Invoke a tool based on the request"""
-    request_data = request.json
-    tool_name = request_data.get('name')
-    parameters = request_data.get('parameters', {})
+    request_data = request.get_json(silent=True)
+    if not isinstance(request_data, dict):
+        return jsonify({
+            "error": "Request body must be a JSON object",
+            "status": "error"
+        }), 400
+    if request_data.get('stream'):
+        # One JSON object per line, sent as soon as each result is available
+        items, status_code = stream_tool(request_data.get('name'), request_data.get('parameters', {}))
+        return Response((json_codec.dumps(item) + b"\n" for item in items), status=status_code,
+                        mimetype='application/x-ndjson')
+    payload, status_code = dispatch_tool(request_data.get('name'), request_data.get('parameters', {}))
+    return jsonify(payload), status_code
+
+@app.route('/mcp/v1/invoke/batch', methods=['POST'])
+def invoke_batch():
+    """Invoke a list of tools concurrently and return a result per call"""
+    try:
+        calls, max_parallelism, stream = parse_batch_request(request.get_json(silent=True), config.get('batch'))
+    except BatchError as e:
+        return jsonify({
+            "error": str(e),
+            "status": "error"
+        }), 400
     
-    logger.info(f"Tool invocation request: {tool_name} with parameters: {parameters}")
+    logger.info(f"Batch invocation request: {len(calls)} calls, max_parallelism={max_parallelism}")
+    items = iter_batch(dispatch_tool, calls, max_parallelism)
+    if stream:
+        # One JSON object per line, in completion order
+        return Response((json_codec.dumps(item) + b"\n" for item in items), mimetype='application/x-ndjson')
+    return jsonify(batch_response(items))
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+@app.route('/metrics/slow_calls', methods=['GET'])
+def get_slow_calls():
+    """Return the stacks sampled from recent slow tool invocations"""
+    return jsonify(slow_call_payload())
+
+@app.route('/mcp/v1/ready', methods=['GET'])
+def get_readiness():
+    """Readiness probe: 200 once started and the components listed in ?require= are warm, else 503"""
+    require = [name for name in request.args.get('require', '').split(',') if name]
+    payload, status_code = readiness_status(require)
+    return jsonify(payload), status_code
+
+@app.route('/mcp/v1/prefetch', methods=['GET'])
+def get_prefetch_status():
+    """Report what the background prefetch scheduler has fetched"""
+    return jsonify(prefetch_status())
+
+def stream_tool(tool_name, parameters):
+    """Return (items, status_code) for a streaming tool invocation"""
+    logger.info(f"Streaming tool invocation request: {tool_name} with parameters: {parameters}")
     
-    if tool_name == "search_jobs":
-        return search_jobs(parameters)
-    elif tool_name == "get_job_details":
-        return get_job_details(parameters)
-    elif tool_name == "apply_to_job":
-        return apply_to_job(parameters)
-    elif tool_name == "get_application_history":
-        return get_application_history(parameters)
-    else:
-        return jsonify({
+    handler = STREAMING_HANDLERS.get(tool_name)
+    if handler is None:
+        return iter([{
+            "type": "error",
+            "error": f"Tool does not support streaming: {tool_name}",
+            "status": "error"
+        }]), 400
+    return handler(parameters), 200
+
+def dispatch_tool(tool_name, parameters):
+    """Run a tool handler and return its (payload, status_code)"""
+    # Lazy formatting keeps the hot path cheap when INFO is disabled
+    logger.info("Tool invocation request: %s with parameters: %s", tool_name, parameters)
+    
+    handler = TOOL_HANDLERS.get(tool_name)
+    if handler is None:
+        return {
             "error": f"Unknown tool: {tool_name}",
             "status": "error"
-        }), 400
+        }, 400
+    
+    with ToolTimer(tool_name, slow_call_profiler) as timer:
+        result = handler(parameters)
+        payload, status_code = result if isinstance(result, tuple) else (result, 200)
+        timer.status = status_code
+    return payload, status_code
+
+def _search_upstream(client, parameters):
+    """Fetch job postings matching the search parameters from LinkedIn"""
+    # In a real implementation, this would use the LinkedIn API
+    # For now, we'll return mock data
+    return [
+        {
+            "job_id": "3123456789",
+            "title": "Senior DevOps Engineer",
+            "company": "Tech Innovations Ltd",
+            "location": "London, United Kingdom",
+            "description_snippet": "Looking for an experienced DevOps engineer to help build and maintain our cloud infrastructure...",
+            "date_posted": "2025-07-15",
+            "experience_level": "Mid-Senior",
+            "job_type": "Full-time",
+            "remote": True,
+            "url": "https://www.linkedin.com/jobs/view/3123456789"
+        },
+        {
+            "job_id": "3123456790",
+            "title": "DevOps Team Lead",
+            "company": "Global Solutions",
+            "location": "London, United Kingdom",
+            "description_snippet": "Seeking a DevOps Team Lead to oversee our infrastructure and CI/CD pipelines...",
+            "date_posted": "2025-07-17",
+            "experience_level": "Mid-Senior",
+            "job_type": "Full-time",
+            "remote": False,
+            "url": "https://www.linkedin.com/jobs/view/3123456790"
+        },
+        {
+            "job_id": "3123456791",
+            "title": "Cloud DevOps Engineer",
+            "company": "Fintech Startup",
+            "location": "Remote",
+            "description_snippet": "Join our team to help build scalable cloud infrastructure using AWS and Kubernetes...",
+            "date_posted": "2025-07-18",
+            "experience_level": "Mid-Senior",
+            "job_type": "Full-time",
+            "remote": True,
+            "url": "https://www.linkedin.com/jobs/view/3123456791"
+        }
+    ]
+
+def _search_upstream_page(client, parameters, start, count):
+    """Fetch one page of job postings matching the search parameters from LinkedIn"""
+    # In a real implementation, this would pass start/count as the LinkedIn
+    # API offset/limit; the mock data is paged locally
+    return _search_upstream(client, parameters)[start:start + count]
+
+def _fetch_search_page(parameters, start, count):
+    """Fetch one upstream search page, sharing identical in-flight page requests"""
+    flight_key = ("search_page", search_key(normalize_search_params(parameters)), start, count)
+    return upstream_flight.do(flight_key, linkedin_client.call, _search_upstream_page, parameters, start, count)
+
+def _fetch_search_results(parameters):
+    """Fetch search results upstream and store them in the search result cache"""
+    jobs = linkedin_client.call(_search_upstream, parameters)
+    search_cache.put(parameters, jobs)
+    return jobs
 
 def search_jobs(parameters):
     """Search for jobs on LinkedIn"""
-    if not linkedin_client:
-        return jsonify({
+    if not require_linkedin():
+        return {
             "error": "LinkedIn client not initialized",
             "status": "error"
-        }), 500
+        }, 500
+    
+    limit = parameters.get("limit", 10)
+    if not isinstance(limit, int) or limit < 1:
+        return {
+            "error": "limit must be a positive integer",
+            "status": "error"
+        }, 400
+    
+    sort = parameters.get("sort", "match")
+    if sort not in ("match", "relevance"):
+        return {
+            "error": "sort must be 'match' or 'relevance'",
+            "status": "error"
+        }, 400
+    collapse = bool(parameters.get("collapse_duplicates"))
     
     try:
-        # In a real implementation, this would use the LinkedIn API
-        # For now, we'll return mock data
-        mock_jobs = [
-            {
-                "job_id": "3123456789",
-                "title": "Senior DevOps Engineer",
-                "company": "Tech Innovations Ltd",
-                "location": "London, United Kingdom",
-                "description_snippet": "Looking for an experienced DevOps engineer to help build and maintain our cloud infrastructure...",
-                "date_posted": "2025-07-15",
-                "experience_level": "Mid-Senior",
-                "job_type": "Full-time",
-                "remote": True,
-                "url": "https://www.linkedin.com/jobs/view/3123456789"
-            },
-            {
-                "job_id": "3123456790",
-                "title": "DevOps Team Lead",
-                "company": "Global Solutions",
-                "location": "London, United Kingdom",
-                "description_snippet": "Seeking a DevOps Team Lead to oversee our infrastructure and CI/CD pipelines...",
-                "date_posted": "2025-07-17",
-                "experience_level": "Mid-Senior",
-                "job_type": "Full-time",
-                "remote": False,
-                "url": "https://www.linkedin.com/jobs/view/3123456790"
-            },
-            {
-                "job_id": "3123456791",
-                "title": "Cloud DevOps Engineer",
-                "company": "Fintech Startup",
-                "location": "Remote",
-                "description_snippet": "Join our team to help build scalable cloud infrastructure using AWS and Kubernetes...",
-                "date_posted": "2025-07-18",
-                "experience_level": "Mid-Senior",
-                "job_type": "Full-time",
-                "remote": True,
-                "url": "https://www.linkedin.com/jobs/view/3123456791"
-            }
-        ]
+        jobs = search_cache.get(parameters)
+        if jobs is None:
+            # Identical concurrent searches share one upstream call
+            flight_key = ("search", search_key(normalize_search_params(parameters)))
+            jobs = upstream_flight.do(flight_key, _fetch_search_results, parameters)
         
-        # Store in cache for later use
-        for job in mock_jobs:
-            job_cache[job["job_id"]] = job
+        # Store in cache for later use, keeping any details already fetched;
+        # the search index follows the cache
+        for job in jobs:
+            if job_cache.peek(job["job_id"]) is None:
+                job_cache.put(job)
         
-        return jsonify({
-            "jobs": mock_jobs,
-            "count": len(mock_jobs),
+        # Answer the query from the index over every cached posting
+        matches = search_index.search(
+            title=parameters.get("title"),
+            location=parameters.get("location"),
+            experience_level=parameters.get("experience_level"),
+            job_type=parameters.get("job_type"),
+            remote=parameters.get("remote"),
+            limit=limit if sort == "match" and not collapse else max(limit, RERANK_CANDIDATES)
+        )
+        matches = [job for job in matches if job["job_id"] in job_cache]
+        if sort == "relevance":
+            # Re-rank the matches against the user's preferences and skills
+            by_id = {job["job_id"]: job for job in matches}
+            ranked = require_ranking_index().top_k(len(by_id), list(by_id))
+            relevance = {job_id: score for job_id, score, _ in ranked}
+            matches = [by_id[job_id] for job_id, _, _ in ranked]
+        duplicates = {}
+        if collapse:
+            duplicates = dict(require_duplicate_index().collapse([job["job_id"] for job in matches]))
+            collapsed = len(matches) - len(duplicates)
+            matches = [job for job in matches if job["job_id"] in duplicates]
+        
+        jobs = []
+        for job in matches[:limit]:
+            summary = job.summary()
+            if sort == "relevance":
+                summary["relevance"] = relevance[job["job_id"]]
+            if collapse:
+                summary["duplicates"] = duplicates[job["job_id"]]
+            jobs.append(summary)
+        
+        result = {
+            "jobs": jobs,
+            "count": len(jobs),
             "status": "success"
-        })
+        }
+        if collapse:
+            result["collapsed"] = collapsed
+        return result
+    except GatewayError as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 503
+    except SingleFlightTimeout as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 504
     except Exception as e:
         logger.error(f"Error searching jobs: {e}")
-        return jsonify({
+        return {
             "error": str(e),
             "status": "error"
-        }), 500
+        }, 500
 
-def get_job_details(parameters):
-    """Get detailed information about a specific job"""
-    job_id = parameters.get("job_id")
+def iter_search_jobs(parameters):
+    """
+    Stream search results one NDJSON-ready item at a time.
+
+    Jobs are fetched upstream page by page and yielded as they arrive, in
+    upstream order, each with a cursor that resumes the search after it.
+    The last item reports the count and the cursor for the next results, or
+    the error that ended the stream.
+    """
+    if not require_linkedin():
+        yield {"type": "error", "error": "LinkedIn client not initialized", "status": "error"}
+        return
     
-    if not job_id:
-        return jsonify({
-            "error": "Job ID is required",
+    limit = parameters.get("limit", DEFAULT_STREAM_LIMIT)
+    if not isinstance(limit, int) or not 1 <= limit <= MAX_STREAM_LIMIT:
+        yield {"type": "error", "error": f"limit must be an integer between 1 and {MAX_STREAM_LIMIT}",
+               "status": "error"}
+        return
+    
+    try:
+        search, start = resolve_search(parameters)
+    except InvalidSearchCursor as e:
+        yield {"type": "error", "error": str(e), "status": "error"}
+        return
+    
+    page_size = (config.get('search') or {}).get('page_size', DEFAULT_PAGE_SIZE)
+    cursor = None
+    count = 0
+    try:
+        for job, next_start in iter_pages(_fetch_search_page, search, start, limit, page_size):
+            if job_cache.peek(job["job_id"]) is None:
+                job_cache.put(job)
+            cursor = encode_search_cursor(search, next_start)
+            count += 1
+            yield {
+                "type": "job",
+                "job": {key: value for key, value in job.items() if key not in DETAIL_FIELDS},
+                "cursor": cursor
+            }
+    except (GatewayError, SingleFlightTimeout) as e:
+        yield {"type": "error", "error": str(e), "count": count, "next_cursor": cursor, "status": "error"}
+        return
+    except Exception as e:
+        logger.error(f"Error streaming job search: {e}")
+        yield {"type": "error", "error": str(e), "count": count, "next_cursor": cursor, "status": "error"}
+        return
+    
+    # A full page means upstream may hold more results
+    yield {
+        "type": "end",
+        "count": count,
+        "next_cursor": cursor if count == limit else None,
+        "status": "success"
+    }
+
+def rank_jobs(parameters):
+    """Rank every cached job against the user's job preferences and skills"""
+    limit = parameters.get("limit", 10)
+    if not isinstance(limit, int) or limit < 1:
+        return {
+            "error": "limit must be a positive integer",
             "status": "error"
-        }), 400
+        }, 400
     
     try:
-        # Check if job is in cache
-        if job_id in job_cache:
-            job = job_cache[job_id]
-            
-            # Add more detailed information
-            job["full_description"] = """
+        index = require_ranking_index()
+        jobs = []
+        for job_id, score, components in index.top_k(min(limit, MAX_RANKED_JOBS)):
+            job = job_cache.peek(job_id)
+            if job is None:
+                continue
+            jobs.append(dict(job.summary(), relevance=score, relevance_components=components,
+                             matched_skills=index.profile.matched_skills(job)))
+        return {
+            "jobs": jobs,
+            "count": len(jobs),
+            "ranked": len(index),
+            "status": "success"
+        }
+    except Exception as e:
+        logger.error(f"Error ranking jobs: {e}")
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 500
+
+def _job_details_upstream(client, job_id):
+    """Fetch the full description, required skills and salary of a job from LinkedIn"""
+    # In a real implementation, this would use the LinkedIn API
+    # For now, we'll return mock data
+    return {
+        "full_description": """
             About the role:
             We are looking for a skilled DevOps Engineer to help us build and maintain our cloud infrastructure. 
             You will be responsible for implementing and managing CI/CD pipelines, infrastructure as code, 
@@ -282,99 +816,605 @@ def get_job_details(parameters):
             - Flexible hours
             - Professional development budget
             - Health insurance
-            """
-            
-            job["skills_required"] = [
-                "AWS", "Kubernetes", "Docker", "Terraform", "Python", "CI/CD", "Linux"
-            ]
-            
-            job["salary_range"] = "£70,000 - £90,000"
-            
-            return jsonify({
-                "job": job,
-                "status": "success"
-            })
-        else:
-            return jsonify({
+            """,
+        "skills_required": [
+            "AWS", "Kubernetes", "Docker", "Terraform", "Python", "CI/CD", "Linux"
+        ],
+        "salary_range": "£70,000 - £90,000"
+    }
+
+def _load_job_details(job):
+    """Fetch the details of a cached job upstream and store them in the cache"""
+    # Concurrent requests for the same job share one upstream call
+    job_id = job["job_id"]
+    job.update(upstream_flight.do(("job_details", job_id), linkedin_client.call,
+                                  _job_details_upstream, job_id))
+    
+    # Re-insert so the cache accounts for the added detail
+    job_cache.put(job)
+
+def prefetch_search(parameters):
+    """Run a saved search upstream, refreshing its postings in the cache; return ids of postings without details"""
+    if not require_linkedin():
+        raise GatewayError("LinkedIn client not initialized")
+    flight_key = ("search", search_key(normalize_search_params(parameters)))
+    jobs = upstream_flight.do(flight_key, _fetch_search_results, parameters)
+    if prefetch_scheduler is not None:
+        # Keep the result until the next run refreshes it, however long the search cache TTL
+        search_cache.put(parameters, jobs, ttl=max(search_cache.ttl, prefetch_scheduler.result_ttl()))
+    missing_details = []
+    for job in jobs:
+        cached = job_cache.peek(job["job_id"])
+        if cached is not None:
+            job = dict(job, **{field: cached[field] for field in DETAIL_FIELDS if field in cached})
+        job_cache.put(job)
+        if "full_description" not in job:
+            missing_details.append(job["job_id"])
+    return missing_details
+
+def prefetch_details(job_id):
+    """Fetch details for a cached job, refreshing its cache entry"""
+    if not require_linkedin():
+        raise GatewayError("LinkedIn client not initialized")
+    job = job_cache.peek(job_id)
+    if job is not None:
+        _load_job_details(job)
+
+def get_job_details(parameters):
+    """Get detailed information about a specific job"""
+    job_id = parameters.get("job_id")
+    
+    if not job_id:
+        return {
+            "error": "Job ID is required",
+            "status": "error"
+        }, 400
+    
+    try:
+        # Check if job is in cache
+        job = job_cache.get(job_id)
+        if job is None:
+            return {
                 "error": f"Job with ID {job_id} not found",
                 "status": "error"
-            }), 404
+            }, 404
+        
+        # Add more detailed information, fetching it only once per cached job
+        if "full_description" not in job:
+            if not require_linkedin():
+                return {
+                    "error": "LinkedIn client not initialized",
+                    "status": "error"
+                }, 500
+            _load_job_details(job)
+        
+        return {
+            "job": job.to_dict(),
+            "status": "success"
+        }
+    except GatewayError as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 503
+    except SingleFlightTimeout as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 504
     except Exception as e:
         logger.error(f"Error getting job details: {e}")
-        return jsonify({
+        return {
             "error": str(e),
             "status": "error"
-        }), 500
+        }, 500
+
+def _apply_upstream(client, job_id, cover_letter, phone_number):
+    """Submit an application for a job through LinkedIn"""
+    # In a real implementation, this would use the LinkedIn API to apply
+    # For now, we'll just record the application
+    return None
 
 def apply_to_job(parameters):
     """Apply to a specific job with your profile"""
     job_id = parameters.get("job_id")
-    cover_letter = parameters.get("cover_letter", config.get("default_cover_letter", ""))
     phone_number = parameters.get("phone_number", config.get("phone_number", ""))
     
     if not job_id:
-        return jsonify({
+        return {
             "error": "Job ID is required",
             "status": "error"
-        }), 400
+        }, 400
+    
+    allow_duplicate = bool(parameters.get("allow_duplicate", False))
     
     try:
+        # Reject repeat applications before doing any upstream work
+        duplicate = None if allow_duplicate else application_history.find_duplicate(job_id)
+        if duplicate is not None:
+            return duplicate_application_response(DuplicateApplication(job_id, *duplicate))
+        
         # Check if job exists
-        if job_id not in job_cache:
-            return jsonify({
+        job = job_cache.get(job_id)
+        if job is None:
+            return {
                 "error": f"Job with ID {job_id} not found",
                 "status": "error"
-            }), 404
-        
-        job = job_cache[job_id]
+            }, 404
         
-        # In a real implementation, this would use the LinkedIn API to apply
-        # For now, we'll just record the application
-        application = {
-            "job_id": job_id,
-            "job_title": job["title"],
-            "company": job["company"],
-            "applied_at": datetime.now().isoformat(),
-            "status": "applied",
-            "cover_letter": cover_letter[:100] + "..." if len(cover_letter) > 100 else cover_letter,
-            "phone_number": phone_number
-        }
-        
-        application_history.append(application)
-        
-        return jsonify({
-            "application": application,
-            "message": f"Successfully applied to {job['title']} at {job['company']}",
-            "status": "success"
-        })
+        # Claim the job before any upstream work, so a concurrent apply to it gets a 409
+        reservation = None
+        if not allow_duplicate:
+            reservation = application_history.reserve(job_id, job["company"], job["title"])
+        try:
+            if not require_linkedin():
+                return {
+                    "error": "LinkedIn client not initialized",
+                    "status": "error"
+                }, 500
+            
+            # Fill the [JOB_TITLE], [COMPANY_NAME] and [YOUR_NAME] placeholders
+            cover_letter = cover_letters.render(job, parameters.get("cover_letter"))
+            # The attempt is durable before LinkedIn sees it, so a crash cannot hide an application
+            attempt_id = None
+            if audit_log is not None:
+                attempt_id = audit_log.record_attempt(job_id, job["title"], job["company"])
+            try:
+                # Never retried: a failed submission may still have reached LinkedIn
+                linkedin_client.call(_apply_upstream, job_id, cover_letter, phone_number, idempotent=False)
+            except Exception as e:
+                record_application_outcome(attempt_id, job_id, "failed", error=str(e))
+                raise
+            
+            application = {
+                "job_id": job_id,
+                "job_title": job["title"],
+                "company": job["company"],
+                "applied_at": datetime.now().isoformat(),
+                "status": "applied",
+                "cover_letter": cover_letter[:100] + "..." if len(cover_letter) > 100 else cover_letter,
+                "phone_number": phone_number
+            }
+            
+            record_application_outcome(attempt_id, job_id, "applied", application=application)
+            try:
+                application_history.add(application, allow_duplicate=allow_duplicate, reservation=reservation)
+            except DuplicateApplication as e:
+                # A concurrent application to the same job was recorded first
+                record_application_outcome(attempt_id, job_id, "duplicate", error=str(e))
+                raise
+            
+            return {
+                "application": application,
+                "message": f"Successfully applied to {job['title']} at {job['company']}",
+                "status": "success"
+            }
+        finally:
+            # Already consumed if the application was recorded
+            if reservation is not None:
+                application_history.release(reservation)
+    except DuplicateApplication as e:
+        return duplicate_application_response(e)
+    except GatewayError as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 503
     except Exception as e:
         logger.error(f"Error applying to job: {e}")
-        return jsonify({
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 500
+
+def record_application_outcome(attempt_id, job_id, status, **details):
+    """Log the outcome of an application attempt; a failure to log does not undo the application"""
+    if attempt_id is None:
+        return
+    try:
+        audit_log.record_outcome(attempt_id, job_id, status, **details)
+    except AuditLogError as e:
+        logger.error(f"Failed to log the outcome of application attempt {attempt_id}: {e}")
+
+def duplicate_application_response(duplicate):
+    """Build the 409 response for an application that was already made"""
+    return {
+        "error": str(duplicate),
+        "duplicate_of": duplicate.duplicate_of,
+        "reason": duplicate.reason,
+        "status": "error"
+    }, 409
+
+def _bulk_apply_jobs(parameters, max_jobs):
+    """Resolve the jobs a new bulk apply run covers; return (jobs, None) or (None, error response)"""
+    job_ids = parameters.get("job_ids")
+    search = parameters.get("search")
+    if job_ids is not None:
+        if not isinstance(job_ids, list) or not all(isinstance(job_id, str) and job_id for job_id in job_ids):
+            return None, ({
+                "error": "job_ids must be a list of job ID strings",
+                "status": "error"
+            }, 400)
+        job_ids = list(dict.fromkeys(job_ids))
+        if len(job_ids) > max_jobs:
+            return None, ({
+                "error": f"At most {max_jobs} jobs can be applied to in one run",
+                "status": "error"
+            }, 400)
+        jobs = []
+        for job_id in job_ids:
+            job = job_cache.peek(job_id)
+            jobs.append(job.summary() if job is not None else {"job_id": job_id})
+        return jobs, None
+    if isinstance(search, dict):
+        limit = search.get("limit", 10)
+        if isinstance(limit, int):
+            limit = min(limit, max_jobs)
+        payload, status_code = dispatch_tool("search_jobs", dict(search, limit=limit))
+        if status_code != 200:
+            return None, (payload, status_code)
+        return payload["jobs"], None
+    return None, ({
+        "error": "job_ids, search or run_id is required",
+        "status": "error"
+    }, 400)
+
+def run_bulk_apply(run, max_parallelism):
+    """Apply to the pending jobs of a bulk apply run and return their outcomes"""
+    # The phone number was resolved once when the run was created, and every
+    # job renders its letter from the same compiled template; a resumed run
+    # re-seeds the job cache with the recorded summaries
+    options = run.options
+    for job in run.pending():
+        if "title" in job and job_cache.peek(job["job_id"]) is None:
+            job_cache.put(dict(job))
+    with bulk_apply_store.running(run):
+        return execute(run, lambda job: dispatch_tool("apply_to_job", dict(options, job_id=job["job_id"])),
+                       max_parallelism)
+
+def bulk_apply_to_jobs(parameters):
+    """Apply to many jobs through a bounded worker pool, checkpointing each outcome"""
+    if not require_linkedin():
+        return {
+            "error": "LinkedIn client not initialized",
+            "status": "error"
+        }, 500
+    
+    bulk_config = config.get('bulk_apply') or {}
+    max_parallelism = bulk_config.get('max_parallelism', DEFAULT_MAX_PARALLELISM)
+    requested = parameters.get("max_parallelism", max_parallelism)
+    if not isinstance(requested, int) or requested < 1:
+        return {
+            "error": "max_parallelism must be a positive integer",
+            "status": "error"
+        }, 400
+    
+    try:
+        run_id = parameters.get("run_id")
+        if run_id:
+            run = bulk_apply_store.load(run_id)
+        else:
+            jobs, error = _bulk_apply_jobs(parameters, bulk_config.get('max_jobs', DEFAULT_MAX_JOBS))
+            if error is not None:
+                return error
+            options = {
+                "phone_number": parameters.get("phone_number", config.get("phone_number", "")),
+                "allow_duplicate": bool(parameters.get("allow_duplicate", False))
+            }
+            if "cover_letter" in parameters:
+                options["cover_letter"] = parameters["cover_letter"]
+            run = bulk_apply_store.create(jobs, options)
+        resumed = len(run.jobs) - len(run.pending())
+        results = run_bulk_apply(run, min(requested, max_parallelism))
+        return {
+            "run_id": run.run_id,
+            "results": results,
+            "summary": run.summary(),
+            "resumed": resumed,
+            "complete": run.finished,
+            "status": "success" if run.finished else "partial"
+        }
+    except RunInProgress as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 409
+    except InvalidRunId as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 400
+    except BulkApplyError as e:
+        return {
             "error": str(e),
             "status": "error"
-        }), 500
+        }, 404
+    except Exception as e:
+        logger.error(f"Error in bulk apply: {e}")
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 500
 
 def get_application_history(parameters):
     """Get history of job applications"""
     limit = parameters.get("limit", 10)
     
+    if not isinstance(limit, int) or limit < 1:
+        return {
+            "error": "limit must be a positive integer",
+            "status": "error"
+        }, 400
+    
+    for name in ("company", "since", "until", "status"):
+        if parameters.get(name) is not None and not isinstance(parameters[name], str):
+            return {
+                "error": f"{name} must be a string",
+                "status": "error"
+            }, 400
+    
     try:
-        return jsonify({
-            "applications": application_history[:limit],
-            "count": len(application_history[:limit]),
+        applications, next_cursor = application_history.query(
+            limit=min(limit, MAX_HISTORY_PAGE_SIZE),
+            cursor=parameters.get("cursor"),
+            company=parameters.get("company"),
+            since=parameters.get("since"),
+            until=parameters.get("until"),
+            status=parameters.get("status")
+        )
+        return {
+            "applications": applications,
+            "count": len(applications),
             "total": len(application_history),
+            "next_cursor": next_cursor,
             "status": "success"
-        })
+        }
+    except InvalidCursor as e:
+        return {
+            "error": str(e),
+            "status": "error"
+        }, 400
     except Exception as e:
         logger.error(f"Error getting application history: {e}")
-        return jsonify({
+        return {
             "error": str(e),
             "status": "error"
-        }), 500
+        }, 500
 
-if __name__ == "__main__":
+TOOL_HANDLERS = {
+    "search_jobs": search_jobs,
+    "get_job_details": get_job_details,
+    "rank_jobs": rank_jobs,
+    "apply_to_job": apply_to_job,
+    "bulk_apply_to_jobs": bulk_apply_to_jobs,
+    "get_application_history": get_application_history,
+}
+
+# Tools that can stream their results with {"stream": true}
+STREAMING_HANDLERS = {
+    "search_jobs": iter_search_jobs,
+}
+
+def initialize_prefetch():
+    """Start the background scheduler that runs the saved job_preferences searches"""
+    global prefetch_scheduler
+    if prefetch_scheduler is not None:
+        prefetch_scheduler.stop()
+        prefetch_scheduler = None
+    # Opt-in: each worker runs its own scheduler, multiplying upstream load by the worker count
+    if not config.get('linkedin') or not (config.get('prefetch') or {}).get('enabled', False):
+        return
+    prefetch_scheduler = PrefetchScheduler.from_config(config, prefetch_search, prefetch_details,
+                                                    lambda within: job_cache.expiring(within))
+    prefetch_scheduler.start()
+    logger.info(f"Prefetch scheduler started ({len(prefetch_scheduler.searches)} saved searches, "
+                f"every ~{prefetch_scheduler.interval}s)")
+
+def initialize_bulk_apply():
+    """Open the bulk apply checkpoint store and optionally resume runs interrupted by a restart"""
+    global bulk_apply_store
+    bulk_config = config.get('bulk_apply') or {}
+    bulk_apply_store = CheckpointStore.from_config(bulk_config)
+    if not config.get('linkedin') or not bulk_config.get('resume_on_startup', False):
+        return
+    runs = bulk_apply_store.incomplete()
+    if runs:
+        threading.Thread(target=resume_bulk_apply_runs, args=(runs,), name="bulk-apply-resume", daemon=True).start()
+        logger.info(f"Resuming {len(runs)} interrupted bulk apply runs")
+
+def resume_bulk_apply_runs(runs):
+    """Finish interrupted bulk apply runs one after another"""
+    max_parallelism = (config.get('bulk_apply') or {}).get('max_parallelism', DEFAULT_MAX_PARALLELISM)
+    for run in runs:
+        try:
+            run_bulk_apply(run, max_parallelism)
+            logger.info(f"Bulk apply run {run.run_id} resumed: {run.summary()}")
+        except RunInProgress:
+            # Another worker process resumed it first
+            logger.info(f"Bulk apply run {run.run_id} is already being resumed elsewhere")
+        except Exception as e:
+            logger.error(f"Failed to resume bulk apply run {run.run_id}: {e}")
+
+def initialize_metrics():
+    """Start the optional slow-call profiler configured under metrics.profile_slow_calls"""
+    global slow_call_profiler
+    if slow_call_profiler is not None:
+        slow_call_profiler.stop()
+    slow_call_profiler = SlowCallProfiler.from_config(config.get('metrics'))
+    if slow_call_profiler is not None:
+        slow_call_profiler.start()
+        logger.info(f"Slow-call profiler enabled (threshold={slow_call_profiler.threshold}s)")
+
+def slow_call_payload():
+    """Return the slow-call profiles payload"""
+    profiles = slow_call_profiler.profiles() if slow_call_profiler is not None else []
+    return {
+        "enabled": slow_call_profiler is not None,
+        "profiles": profiles,
+        "status": "success"
+    }
+
+def collect_metrics():
+    """Report cache, coalescing and gateway statistics as metric families at scrape time"""
+    families = []
+    caches = {"job": job_cache.stats(), "search": search_cache.stats()}
+    families.append(("mcp_cache_hits_total", "counter", "Cache lookups answered from the cache",
+                     [({"cache": name}, stats["hits"] + stats.get("filtered_hits", 0))
+                      for name, stats in caches.items()]))
+    families.append(("mcp_cache_misses_total", "counter", "Cache lookups that missed",
+                     [({"cache": name}, stats["misses"]) for name, stats in caches.items()]))
+    families.append(("mcp_cache_hit_ratio", "gauge", "Fraction of cache lookups that hit",
+                     [({"cache": name}, _hit_ratio(stats)) for name, stats in caches.items()]))
+    families.append(("mcp_cache_entries", "gauge", "Entries currently cached",
+                     [({"cache": name}, stats["entries"]) for name, stats in caches.items()]))
+    families.append(("mcp_job_cache_bytes", "gauge", "Approximate bytes held by the job cache",
+                     [({}, caches["job"]["bytes"])]))
+    families.append(("mcp_job_cache_duplicates", "gauge", "Cached postings that near-duplicate another cached posting",
+                     [({}, duplicate_index.stats()["duplicates"] if duplicate_index is not None else 0)]))
+    
+    if audit_log is not None:
+        audit = audit_log.stats()
+        families.append(("mcp_audit_records_total", "counter", "Application audit log records written",
+                         [({}, audit["records"])]))
+        families.append(("mcp_audit_commits_total", "counter", "Audit log group commits, each one write and fsync",
+                         [({}, audit["commits"])]))
+    
+    families.append(("mcp_config_version", "gauge", "Version of the configuration snapshot in use",
+                     [({}, config.version)]))
+    if config_watcher is not None:
+        families.append(("mcp_config_reload_errors_total", "counter", "Configuration reloads rejected as invalid",
+                         [({}, config_watcher.errors)]))
+    
+    flight = upstream_flight.stats()
+    families.append(("mcp_upstream_coalesced_total", "counter", "Upstream calls that joined one already in flight",
+                     [({}, flight["coalesced"])]))
+    families.append(("mcp_upstream_coalesced_in_flight", "gauge", "Distinct coalesced upstream calls in flight",
+                     [({}, flight["in_flight"])]))
+    
+    if isinstance(linkedin_client, LinkedInGateway):
+        gateway = linkedin_client.metrics()
+        for key, kind, help in (
+            ("in_flight", "gauge", "LinkedIn calls currently running"),
+            ("queue_depth", "gauge", "Callers waiting for a LinkedIn session"),
+            ("idle_sessions", "gauge", "LinkedIn sessions idle in the pool"),
+            ("errors", "counter", "Failed LinkedIn call attempts"),
+            ("retries", "counter", "Retried LinkedIn calls"),
+            ("rejected", "counter", "LinkedIn calls rejected by the circuit breaker"),
+        ):
+            name = f"mcp_gateway_{key}_total" if kind == "counter" else f"mcp_gateway_{key}"
+            families.append((name, kind, help, [({}, gateway[key])]))
+        families.append(("mcp_gateway_circuit_open", "gauge", "1 while the circuit breaker is not closed",
+                         [({}, int(gateway["circuit_state"] != "closed"))]))
+    return families
+
+def _hit_ratio(stats):
+    hits = stats["hits"] + stats.get("filtered_hits", 0)
+    lookups = hits + stats["misses"]
+    return hits / lookups if lookups else 0.0
+
+REGISTRY.register_collector(collect_metrics)
+
+def _configure_http():
+    json_codec.configure(config.get('http'))
+
+# Sections a running server applies on reload, and the initializer that
+# applies each; bulk_apply, batch and search are read on every request
+CONFIG_RELOADERS = {
+    "default_cover_letter": (initialize_cover_letters,),
+    "personal_info": (initialize_cover_letters, initialize_ranking),
+    "phone_number": (initialize_cover_letters,),
+    "cover_letters": (initialize_cover_letters,),
+    "job_preferences": (initialize_prefetch, initialize_ranking),
+    "prefetch": (initialize_prefetch,),
+    "ranking": (initialize_ranking,),
+    "dedup": (initialize_dedup,),
+    "http": (_configure_http,),
+    "metrics": (initialize_metrics,),
+}
+PER_REQUEST_SECTIONS = ("bulk_apply", "batch", "search", "config_reload")
+
+def apply_config_change(previous, snapshot, changed):
+    """Swap in a reloaded configuration snapshot and re-initialize the subsystems whose sections changed"""
+    global config
+    # Requests already running keep the snapshot they read; new ones see this one
+    config = snapshot
+    reloaders = []
+    for section in changed:
+        if section in CONFIG_RELOADERS:
+            reloaders.extend(reloader for reloader in CONFIG_RELOADERS[section] if reloader not in reloaders)
+        elif section not in PER_REQUEST_SECTIONS:
+            logger.warning(f"Configuration section '{section}' changed; restart the server to apply it")
+    for reloader in reloaders:
+        try:
+            reloader()
+        except Exception as e:
+            logger.error(f"Failed to apply configuration change ({reloader.__name__}): {e}")
+
+def initialize_config_watcher():
+    """Watch config.yaml and apply changes without a restart, unless config_reload.enabled is false"""
+    global config_watcher
+    if config_watcher is not None:
+        config_watcher.stop()
+    config_watcher = ConfigWatcher.from_config(DEFAULT_CONFIG_PATH, config, apply_config_change)
+    if config_watcher is not None:
+        config_watcher.start()
+
+def prefetch_status():
+    """Return the prefetch scheduler status payload"""
+    if prefetch_scheduler is None:
+        return {"prefetch": {"enabled": False}, "status": "success"}
+    return {"prefetch": prefetch_scheduler.status(), "status": "success"}
+
+# Components created on first use rather than at startup
+warm_up.register("linkedin", initialize_linkedin)
+warm_up.register("ranking", build_ranking_index)
+warm_up.register("dedup", build_duplicate_index)
+
+def initialize_warm_up():
+    """Create the lazily initialized components now, in the background, or on first use (startup.warm_up)"""
+    mode = (config.get('startup') or {}).get('warm_up', 'lazy')
+    if mode not in WARM_UP_MODES:
+        logger.warning(f"Unknown startup.warm_up '{mode}'; components are created on first use")
+        return
+    names = ["linkedin", "ranking", "dedup"] if config.get('linkedin') else ["ranking", "dedup"]
+    if mode == "eager":
+        for name in names:
+            warm_up.ensure(name)
+    elif mode == "background":
+        warm_up.start_background(names)
+
+def readiness_status(require=()):
+    """Return (payload, status_code) for the readiness probe"""
+    components = warm_up.status()
+    unknown = [name for name in require if name not in components]
+    if unknown:
+        return {
+            "error": f"Unknown components: {', '.join(unknown)}",
+            "status": "error"
+        }, 400
+    ready = server_started.is_set() and warm_up.is_ready(require)
+    return {
+        "ready": ready,
+        "started": server_started.is_set(),
+        "components": components,
+        "status": "success"
+    }, 200 if ready else 503
+
+def startup():
+    """Load configuration and initialize the caches; the LinkedIn client and indexes are created on first use"""
     if load_config():
-        initialize_linkedin()
+        json_codec.configure(config.get('http'))
+        initialize_cover_letters()
+        initialize_state()
+        initialize_cache()
+        initialize_history()
+        initialize_audit_log()
+        initialize_prefetch()
+        initialize_bulk_apply()
+        initialize_metrics()
+        initialize_config_watcher()
+        initialize_warm_up()
+        server_started.set()
     else:
         # Create default config if it doesn't exist
         if not os.path.exists('config.yaml'):
@@ -393,9 +1433,16 @@ if __name__ == "__main__":
                     "job_type": "Full-time"
                 }
             }
+            import yaml
             with open('config.yaml', 'w') as file:
                 yaml.dump(default_config, file, default_flow_style=False)
             logger.info("Created default configuration file. Please edit config.yaml with your details.")
-    
-    # Start the server
-    app.run(host='0.0.0.0', port=8080)
+
+if __name__ == "__main__":
+    if "--asgi" in sys.argv:
+        # Async serving mode; startup() runs from the ASGI lifespan handler
+        import uvicorn
+        uvicorn.run("asgi:app", host='0.0.0.0', port=8080)
+    else:
+        startup()
+        app.run(host='0.0.0.0', port=8080)
@@ -0,0 +1,271 @@
+"""
+Session Cache
+Persists authenticated LinkedIn session cookies to a permission-restricted
+local file so that server starts reuse a valid session instead of logging in,
+and refreshes sessions in the background before they expire.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_CACHE_PATH = os.path.join(".session_cache", "linkedin_sessions.json")
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_REFRESH_MARGIN_SECONDS = 60 * 60
+DEFAULT_CHECK_INTERVAL_SECONDS = 5 * 60
+
+# Cookies without which a LinkedIn session is not authenticated
+REQUIRED_COOKIES = ("JSESSIONID", "li_at")
+
+
+def _account_key(username):
+    # Keep account e-mail addresses out of the cache file
+    return hashlib.sha256(username.encode("utf-8")).hexdigest()
+
+
+def serialize_cookies(cookiejar):
+    """Convert a cookie jar to a JSON-serializable list"""
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "expires": cookie.expires,
+            "secure": cookie.secure,
+        }
+        for cookie in cookiejar
+    ]
+
+
+def deserialize_cookies(cookies):
+    """Rebuild a requests cookie jar from serialize_cookies output"""
+    from requests.cookies import RequestsCookieJar
+    jar = RequestsCookieJar()
+    for cookie in cookies:
+        jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"), expires=cookie.get("expires"), secure=cookie.get("secure", False))
+    return jar
+
+
+def session_expiry(cookies):
+    """Return when a serialized session stops being usable, or None if it never is"""
+    by_name = {cookie["name"]: cookie for cookie in cookies if cookie.get("value")}
+    if not all(name in by_name for name in REQUIRED_COOKIES):
+        return None
+    expiries = [by_name[name].get("expires") for name in REQUIRED_COOKIES]
+    expiries = [expires for expires in expiries if expires]
+    return min(expiries) if expiries else float("inf")
+
+
+class SessionCache:
+    """
+    File-backed store of session cookies per LinkedIn account.
+
+    The file and its directory are created owner-only (0600/0700) and are
+    replaced atomically on every save. An entry is valid while its required
+    cookies are present and unexpired and it is younger than max_age.
+    """
+
+    def __init__(self, path=DEFAULT_SESSION_CACHE_PATH, max_age=DEFAULT_MAX_AGE_SECONDS, clock=time.time):
+        self.path = path
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, session_cache_config):
+        """Build a cache from the optional 'session_cache' section of config.yaml"""
+        session_cache_config = session_cache_config or {}
+        return cls(
+            path=session_cache_config.get("path", DEFAULT_SESSION_CACHE_PATH),
+            max_age=session_cache_config.get("max_age_seconds", DEFAULT_MAX_AGE_SECONDS),
+        )
+
+    def _read(self):
+        try:
+            mode = os.stat(self.path).st_mode
+        except FileNotFoundError:
+            return {}
+        if mode & (stat.S_IRWXG | stat.S_IRWXO):
+            logger.warning(f"Ignoring session cache {self.path}: it is readable by other users")
+            return {}
+        try:
+            with open(self.path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable session cache {self.path}: {e}")
+            return {}
+
+    def _write(self, entries):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as file:
+            json.dump(entries, file)
+        os.replace(tmp_path, self.path)
+
+    def load(self, username):
+        """Return the cached cookie jar for username, or None if missing or no longer valid"""
+        with self._lock:
+            entry = self._read().get(_account_key(username))
+        if not entry:
+            return None
+        now = self._clock()
+        expires_at = self.expires_at_entry(entry)
+        if expires_at is None or expires_at <= now:
+            return None
+        return deserialize_cookies(entry["cookies"])
+
+    def expires_at_entry(self, entry):
+        """Return when a cache entry stops being valid, or None if it is unusable"""
+        expiry = session_expiry(entry.get("cookies", []))
+        if expiry is None:
+            return None
+        return min(expiry, entry.get("saved_at", 0) + self.max_age)
+
+    def expires_at(self, username):
+        """Return when the cached session for username stops being valid, or None"""
+        with self._lock:
+            entry = self._read().get(_account_key(username))
+        return self.expires_at_entry(entry) if entry else None
+
+    def save(self, username, cookiejar):
+        """Persist the session cookies of username"""
+        with self._lock:
+            entries = self._read()
+            entries[_account_key(username)] = {
+                "cookies": serialize_cookies(cookiejar),
+                "saved_at": self._clock(),
+            }
+            self._write(entries)
+
+    def invalidate(self, username):
+        """Forget the cached session of username"""
+        with self._lock:
+            entries = self._read()
+            if entries.pop(_account_key(username), None) is not None:
+                self._write(entries)
+
+
+def client_cookies(client):
+    """Return the cookie jar of a linkedin_api client"""
+    return client.client.session.cookies
+
+
+class SessionAuthenticator:
+    """
+    LinkedIn client factory that reuses cached sessions.
+
+    Pass it to LinkedInGateway.from_config as the client factory: it builds
+    clients from cached cookies without any network round-trip, and only
+    performs a full login when no valid session is cached. Cached cookies
+    are only checked against their expiry, so also pass its reauthenticate
+    to the gateway: a session LinkedIn has revoked is then dropped from the
+    cache and replaced by a fresh login the first time a call is rejected.
+    """
+
+    def __init__(self, cache, client_factory):
+        self.cache = cache
+        self.client_factory = client_factory
+        self._passwords = {}
+        self.reused = 0
+        self.logins = 0
+
+    def __call__(self, username, password):
+        self._passwords[username] = password
+        cookies = self.cache.load(username)
+        if cookies is not None:
+            try:
+                client = self.client_factory(username, password, cookies=cookies)
+                self.reused += 1
+                logger.info("Reusing cached LinkedIn session")
+                return client
+            except Exception as e:
+                logger.warning(f"Cached LinkedIn session rejected ({e}); logging in again")
+                self.cache.invalidate(username)
+        return self.login(username)
+
+    def reauthenticate(self, username):
+        """Forget the cached session of username, which LinkedIn rejected, and log in again"""
+        self.cache.invalidate(username)
+        return self.login(username)
+
+    def login(self, username):
+        """Perform a full login for username and cache the new session"""
+        client = self.client_factory(username, self._passwords.get(username, ""), refresh_cookies=True)
+        self.logins += 1
+        self.cache.save(username, client_cookies(client))
+        return client
+
+
+class SessionRefresher:
+    """
+    Background thread that re-authenticates gateway sessions shortly before
+    their cached cookies expire, so requests never wait on a login.
+
+    A session whose cache entry has no usable expiry, for example because
+    LinkedIn set no required cookies, is treated as lasting the cache's
+    max_age from its last login rather than being due on every check.
+    """
+
+    def __init__(self, gateway, authenticator, interval=DEFAULT_CHECK_INTERVAL_SECONDS,
+                 margin=DEFAULT_REFRESH_MARGIN_SECONDS, clock=time.time):
+        self.gateway = gateway
+        self.authenticator = authenticator
+        self.interval = interval
+        self.margin = margin
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread = None
+        self._logged_in_at = {}
+        self.refreshes = 0
+
+    def refresh_due(self):
+        """Re-authenticate every account whose session expires within the margin"""
+        refreshed = {}
+        for session in self.gateway.sessions:
+            username = session.account
+            if username not in refreshed:
+                expires_at = self.authenticator.cache.expires_at(username)
+                if expires_at is None:
+                    logged_in_at = self._logged_in_at.setdefault(username, self._clock())
+                    expires_at = logged_in_at + self.authenticator.cache.max_age
+                if expires_at - self._clock() > self.margin:
+                    continue
+                try:
+                    refreshed[username] = self.authenticator.login(username)
+                    self._logged_in_at[username] = self._clock()
+                    self.refreshes += 1
+                    logger.info("Refreshed LinkedIn session in the background")
+                except Exception as e:
+                    logger.error(f"Background LinkedIn session refresh failed: {e}")
+                    continue
+            # Swapping the client is atomic; calls already running keep the old one
+            session.client = refreshed[username]
+        return len(refreshed)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh_due()
+
+    def start(self):
+        """Start checking sessions in a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="session-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,130 @@
+"""
+Shared State
+Backends for the state that several server processes must agree on: cached
+job postings and the application history. The local backend keeps
+everything in the process (one worker). The SQLite backend shares both
+through database files so any number of workers or replicas on one host
+see the same jobs and the same history.
+"""
+
+import sqlite3
+import threading
+import time
+
+import json_codec
+from history_store import HistoryStore
+
+DEFAULT_BACKEND = "local"
+DEFAULT_STATE_PATH = "shared_state.db"
+
+# Expired jobs are deleted by put_job at most this often
+DEFAULT_PURGE_INTERVAL = 60.0
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs (expires_at);
+"""
+
+
+class SQLiteJobStore:
+    """
+    Job postings shared between processes through a SQLite table.
+
+    Each process keeps its own JobCache in front of this store: puts write
+    through to it, and local misses read through from it, so a job cached
+    by one worker can be looked up by every other worker. Expired rows are
+    deleted by put_job, at most once every purge_interval seconds per
+    process, so the table stays bounded by the jobs still live.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH, clock=time.time, purge_interval=DEFAULT_PURGE_INTERVAL):
+        self.path = path
+        self.purge_interval = purge_interval
+        self._clock = clock
+        self._next_purge = clock() + purge_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(JOBS_SCHEMA)
+
+    def get_job(self, job_id):
+        """Return (job dict, expires_at) for a live job, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT data, expires_at FROM jobs WHERE job_id = ? AND expires_at > ?",
+                                     (job_id, self._clock())).fetchone()
+        if row is None:
+            return None
+        return json_codec.loads(row[0]), row[1]
+
+    def put_job(self, job, expires_at):
+        """Insert or replace a job dict, including its detail fields"""
+        data = json_codec.dumps(job)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO jobs (job_id, data, expires_at) VALUES (?, ?, ?)",
+                               (job["job_id"], data, expires_at))
+            if self._clock() >= self._next_purge:
+                self._purge()
+
+    def _purge(self):
+        now = self._clock()
+        self._next_purge = now + self.purge_interval
+        return self._conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (now,)).rowcount
+
+    def purge_expired(self):
+        """Delete expired jobs and return how many were removed"""
+        with self._lock:
+            return self._purge()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LocalBackend:
+    """Process-local state for a single worker"""
+
+    name = "local"
+
+    def job_store(self):
+        return None
+
+    def open_history(self, path):
+        return HistoryStore(path)
+
+
+class SQLiteBackend:
+    """State shared between worker processes on one host through SQLite files"""
+
+    name = "sqlite"
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+
+    def job_store(self):
+        return SQLiteJobStore(self.path)
+
+    def open_history(self, path):
+        if path == ":memory:":
+            raise ValueError("The sqlite state backend needs a file for storage.history_path")
+        return HistoryStore(path, shared=True)
+
+
+def backend_from_config(state_config):
+    """Build the backend selected by the optional 'state' section of config.yaml"""
+    state_config = state_config or {}
+    name = state_config.get("backend", DEFAULT_BACKEND)
+    if name == "local":
+        return LocalBackend()
+    if name == "sqlite":
+        return SQLiteBackend(state_config.get("path", DEFAULT_STATE_PATH))
+    raise ValueError(f"Unknown state.backend: {name}")
@@ -0,0 +1,85 @@
+"""
+Single Flight
+Coalesces concurrent identical upstream calls so that they share one
+in-flight request and all receive its result.
+"""
+
+import threading
+
+
+class SingleFlightTimeout(Exception):
+    """Raised when a coalesced caller gives up waiting for the shared call"""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe call coalescing keyed by an arbitrary hashable key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait for and share its result, or re-raise
+    its exception. Once the call finishes the key is forgotten, so later
+    callers start a fresh call.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) for key, or wait for the call already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise SingleFlightTimeout(f"Timed out after {self.timeout}s waiting for in-flight call {key!r}")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self):
+        """Return the number of distinct calls currently in flight"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """Return call counters"""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add parent directory to path to import asgi
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asgi
+import server
+
+async def call_asgi(app, method, path, body=b"", headers=(), raw=False):
+    """Drive an ASGI app with a single HTTP request and return (status, json), or the sent messages if raw"""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path, "headers": list(headers)}, receive, send)
+    if raw:
+        return sent
+    status = sent[0]["status"]
+    payload = json.loads(b"".join(m.get("body", b"") for m in sent[1:]))
+    return status, payload
+
+class TestAsgiApp(unittest.TestCase):
+    def setUp(self):
+        self.app = asgi.MCPAsgiApp(max_workers=4, run_startup=False)
+
+    def request(self, method, path, body=None):
+        raw = json.dumps(body).encode() if body is not None else b""
+        return asyncio.run(call_asgi(self.app, method, path, raw))
+
+    def test_get_tools(self):
+        status, data = self.request("GET", "/mcp/v1/tools")
+        self.assertEqual(status, 200)
+        self.assertEqual([tool["name"] for tool in data["tools"]],
+                         [tool["name"] for tool in server.list_tools()])
+
+    @patch('server.linkedin_client', MagicMock())
+    def test_invoke_search_jobs(self):
+        status, data = self.request("POST", "/mcp/v1/invoke",
+                                    {"name": "search_jobs", "parameters": {"title": "DevOps"}})
+        self.assertEqual(status, 200)
+        self.assertEqual(data["status"], "success")
+
+    def test_readiness(self):
+        with patch('server.server_started', threading.Event()):
+            status, data = self.request("GET", "/mcp/v1/ready")
+            self.assertEqual(status, 503)
+            server.server_started.set()
+            status, data = self.request("GET", "/mcp/v1/ready")
+            self.assertEqual(status, 200)
+            self.assertIn("linkedin", data["components"])
+
+    def test_invoke_unknown_tool(self):
+        status, data = self.request("POST", "/mcp/v1/invoke", {"name": "unknown"})
+        self.assertEqual(status, 400)
+        self.assertEqual(data["status"], "error")
+
+    def test_invalid_json(self):
+        status, data = asyncio.run(call_asgi(self.app, "POST", "/mcp/v1/invoke", b"{not json"))
+        self.assertEqual(status, 400)
+
+    def test_non_object_body(self):
+        for body in ([], "x", 1):
+            status, data = self.request("POST", "/mcp/v1/invoke", body)
+            self.assertEqual(status, 400)
+            self.assertEqual(data["status"], "error")
+
+    def test_cors_preflight(self):
+        sent = asyncio.run(call_asgi(self.app, "OPTIONS", "/mcp/v1/invoke", headers=[
+            (b"origin", b"http://agent.example"), (b"access-control-request-method", b"POST"),
+            (b"access-control-request-headers", b"content-type")], raw=True))
+        flask_response = server.app.test_client().options("/mcp/v1/invoke", headers={
+            "Origin": "http://agent.example", "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type"})
+        self.assertEqual(sent[0]["status"], flask_response.status_code)
+        headers = {key.decode(): value.decode() for key, value in sent[0]["headers"]}
+        for name in ("Access-Control-Allow-Origin", "Access-Control-Allow-Methods",
+                     "Access-Control-Allow-Headers", "Vary"):
+            self.assertEqual(headers[name.lower()], flask_response.headers[name])
+        # Flask lists the allowed methods in no particular order
+        self.assertEqual(set(headers["allow"].split(", ")), set(flask_response.headers["Allow"].split(", ")))
+        sent = asyncio.run(call_asgi(self.app, "OPTIONS", "/mcp/v1/tools", raw=True))
+        self.assertEqual(dict(sent[0]["headers"])[b"access-control-allow-origin"], b"*")
+        status, _ = asyncio.run(call_asgi(self.app, "OPTIONS", "/nope"))
+        self.assertEqual(status, 404)
+
+    def test_invoke_batch(self):
+        status, data = self.request("POST", "/mcp/v1/invoke/batch", {
+            "calls": [{"name": "get_application_history", "parameters": {}}, {"name": "unknown"}],
+            "max_parallelism": 2,
+        })
+        self.assertEqual(status, 200)
+        self.assertEqual([item["status_code"] for item in data["results"]], [200, 400])
+        self.assertEqual(data["status"], "partial")
+
+    def test_unknown_path(self):
+        status, _ = self.request("GET", "/nope")
+        self.assertEqual(status, 404)
+
+    def test_concurrent_invocations_share_bounded_pool(self):
+        async def run_many():
+            return await asyncio.gather(*[
+                call_asgi(self.app, "POST", "/mcp/v1/invoke",
+                          json.dumps({"name": "get_application_history", "parameters": {}}).encode())
+                for _ in range(50)
+            ])
+        results = asyncio.run(run_many())
+        self.assertTrue(all(status == 200 for status, _ in results))
+        self.assertLessEqual(len(self.app._executor._threads), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Add parent directory to path to import audit_log
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from audit_log import ATTEMPT, OUTCOME, AuditLog, AuditLogError, decode_records, encode_record
+from config_store import ConfigSnapshot
+from history_store import HistoryStore
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+
+class TestAuditLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.log = AuditLog(self.tmpdir, compact_segments=0)
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_replay_folds_attempts_into_outcomes(self):
+        first = self.log.record_attempt("1", "DevOps Engineer", "Acme")
+        second = self.log.record_attempt("2")
+        self.log.record_outcome(first, "1", "applied", application={"job_id": "1"})
+        self.log.record_outcome(first, "1", "duplicate", error="Already applied")
+
+        attempts, summary = AuditLog(self.tmpdir).replay()
+        self.assertEqual(summary, {"segments": 1, "records": 4, "torn_segments": 0})
+        self.assertEqual(attempts[first]["type"], OUTCOME)
+        self.assertEqual(attempts[first]["status"], "duplicate")
+        self.assertEqual(attempts[second]["type"], ATTEMPT)
+        self.assertEqual(list(attempts), [first, second])
+
+    def test_torn_and_corrupt_tails_are_ignored(self):
+        frames = encode_record({"a": 1}) + encode_record({"b": 2})
+        self.assertEqual(decode_records(frames), ([{"a": 1}, {"b": 2}], len(frames)))
+        self.assertEqual(decode_records(frames[:-3]), ([{"a": 1}], len(encode_record({"a": 1}))))
+        corrupt = bytearray(frames)
+        corrupt[-1] ^= 0xFF
+        self.assertEqual(decode_records(bytes(corrupt))[0], [{"a": 1}])
+
+        self.log.record_attempt("1")
+        self.log.close()
+        path = os.path.join(self.tmpdir, segment_files(self.tmpdir)[0])
+        with open(path, "ab") as file:
+            file.write(encode_record({"type": ATTEMPT, "attempt_id": "x", "job_id": "2"})[:-5])
+        attempts, summary = AuditLog(self.tmpdir).replay()
+        self.assertEqual(len(attempts), 1)
+        self.assertEqual(summary["torn_segments"], 1)
+
+    def test_concurrent_appends_share_fsyncs(self):
+        def slow_fsync(fd):
+            time.sleep(0.02)
+
+        with patch("audit_log.os.fsync", side_effect=slow_fsync):
+            threads = [threading.Thread(target=self.log.record_attempt, args=(str(i),)) for i in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        stats = self.log.stats()
+        self.assertEqual(stats["records"], 16)
+        self.assertLess(stats["commits"], 16)
+        self.assertEqual(len(self.log.replay()[0]), 16)
+
+    def test_rotation_and_compaction(self):
+        log = AuditLog(self.tmpdir, segment_bytes=300, compact_segments=0)
+        attempt_ids = []
+        for i in range(10):
+            attempt_id = log.record_attempt(str(i), "DevOps Engineer", "Acme")
+            log.record_outcome(attempt_id, str(i), "applied", application={"job_id": str(i)})
+            attempt_ids.append(attempt_id)
+        before = log.replay()[0]
+        segments = segment_files(self.tmpdir)
+        self.assertGreater(len(segments), 3)
+
+        removed = log.compact()
+        self.assertEqual(removed, len(segments) - 2)
+        # The segment still being written is left alone
+        self.assertEqual(segment_files(self.tmpdir), segments[-2:])
+        attempts, summary = log.replay()
+        self.assertEqual(attempts, before)
+        self.assertEqual(summary["records"], len(before) + 1)
+
+        log.record_attempt("late")
+        self.assertEqual(len(log.replay()[0]), 11)
+        log.close()
+
+    def test_write_failure_is_reported_and_writing_continues(self):
+        self.log.record_attempt("1")
+        with patch("audit_log.os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(AuditLogError):
+                self.log.record_attempt("2")
+        self.log.record_attempt("3")
+        self.assertEqual(len(segment_files(self.tmpdir)), 2)
+        self.assertEqual(sorted(record["job_id"] for record in self.log.replay()[0].values()), ["1", "2", "3"])
+
+    def test_from_config(self):
+        self.assertIsNone(AuditLog.from_config({"enabled": False}))
+        log = AuditLog.from_config({"path": self.tmpdir, "fsync": False, "segment_bytes": 1024})
+        self.assertFalse(log.fsync)
+        self.assertEqual(log.segment_bytes, 1024)
+        log.close()
+        with self.assertRaises(AuditLogError):
+            log.record_attempt("1")
+
+class TestAuditedApplications(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.upstream = MagicMock()
+        self.job_cache = JobCache()
+        self.job_cache.put({"job_id": "j1", "title": "DevOps Engineer", "company": "Acme"})
+        self.job_cache.put({"job_id": "j2", "title": "SRE", "company": "Globex"})
+        self.patches = [
+            patch("server.config", ConfigSnapshot({"audit": {"path": self.tmpdir}})),
+            patch("server.audit_log", None),
+            patch("server.application_history", HistoryStore()),
+            patch("server.job_cache", self.job_cache),
+            patch("server.linkedin_client", LinkedInGateway.from_clients([self.upstream], burst=10)),
+        ]
+        for p in self.patches:
+            p.start()
+        server.initialize_audit_log()
+
+    def tearDown(self):
+        server.audit_log.close()
+        for p in reversed(self.patches):
+            p.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def test_attempts_and_outcomes_are_logged(self):
+        _, status = server.dispatch_tool("apply_to_job", {"job_id": "j1"})
+        self.assertEqual(status, 200)
+        with patch("server._apply_upstream", side_effect=RuntimeError("LinkedIn rejected the application")):
+            _, status = server.dispatch_tool("apply_to_job", {"job_id": "j2"})
+        self.assertEqual(status, 500)
+
+        outcomes = {record["job_id"]: record for record in server.audit_log.replay()[0].values()}
+        self.assertEqual(outcomes["j1"]["status"], "applied")
+        self.assertEqual(outcomes["j1"]["application"]["company"], "Acme")
+        self.assertEqual(outcomes["j2"]["status"], "failed")
+        self.assertIn("rejected", outcomes["j2"]["error"])
+
+    def test_startup_restores_applications_missing_from_the_history(self):
+        server.dispatch_tool("apply_to_job", {"job_id": "j1"})
+        server.audit_log.record_attempt("j2", "SRE", "Globex")
+
+        # The history lost the application, for example to a crash before it was flushed
+        with patch("server.application_history", HistoryStore()):
+            with self.assertLogs("server", level="WARNING") as logs:
+                server.initialize_audit_log()
+            self.assertEqual(len(server.application_history), 1)
+            self.assertEqual(server.application_history.find_duplicate("j1"), ("j1", "job_id"))
+            server.initialize_audit_log()
+            self.assertEqual(len(server.application_history), 1)
+        self.assertIn("j2", logs.output[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import batch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from batch import BatchError, batch_response, iter_batch, parse_batch_request
+
+class TestParseBatchRequest(unittest.TestCase):
+    def test_defaults(self):
+        calls, max_parallelism, stream = parse_batch_request({"calls": [{"name": "x"}]})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(max_parallelism, 8)
+        self.assertFalse(stream)
+
+    def test_parallelism_capped_by_config(self):
+        _, max_parallelism, _ = parse_batch_request({"calls": [{}], "max_parallelism": 50},
+                                                    {"max_parallelism": 4})
+        self.assertEqual(max_parallelism, 4)
+
+    def test_rejects_malformed_requests(self):
+        for body in (None, {}, {"calls": []}, {"calls": [{}], "max_parallelism": 0}):
+            with self.assertRaises(BatchError):
+                parse_batch_request(body)
+        with self.assertRaises(BatchError):
+            parse_batch_request({"calls": [{}] * 3}, {"max_calls": 2})
+
+class TestIterBatch(unittest.TestCase):
+    def test_parallelism_limit(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def dispatch(name, parameters):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+            return {"status": "success"}, 200
+
+        items = list(iter_batch(dispatch, [{"name": "t"}] * 12, 3))
+        self.assertEqual(len(items), 12)
+        self.assertLessEqual(max(peak), 3)
+
+    def test_errors_reported_per_item(self):
+        def dispatch(name, parameters):
+            if name == "boom":
+                raise RuntimeError("upstream failed")
+            return {"status": "success"}, 200
+
+        response = batch_response(iter_batch(dispatch, [{"name": "ok", "id": "a"}, {"name": "boom"}, "bad"], 2))
+        self.assertEqual([item["id"] for item in response["results"]], ["a", 1, 2])
+        self.assertEqual([item["status_code"] for item in response["results"]], [200, 500, 400])
+        self.assertEqual(response["errors"], 2)
+        self.assertEqual(response["status"], "partial")
+
+class TestBatchEndpoint(unittest.TestCase):
+    def setUp(self):
+        server.app.testing = True
+        self.client = server.app.test_client()
+
+    def test_invoke_batch(self):
+        response = self.client.post('/mcp/v1/invoke/batch', json={
+            'calls': [
+                {'name': 'get_application_history', 'parameters': {}},
+                {'name': 'get_job_details', 'parameters': {}},
+                {'name': 'unknown_tool'}
+            ]
+        })
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([item['status_code'] for item in data['results']], [200, 400, 400])
+
+    def test_invoke_batch_stream(self):
+        response = self.client.post('/mcp/v1/invoke/batch', json={
+            'calls': [{'name': 'get_application_history', 'parameters': {}}] * 3,
+            'stream': True
+        })
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual(sorted(item['index'] for item in lines), [0, 1, 2])
+
+    def test_invoke_batch_rejects_bad_body(self):
+        response = self.client.post('/mcp/v1/invoke/batch', json={'calls': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
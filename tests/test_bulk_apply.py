@@ -0,0 +1,259 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path to import bulk_apply
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from bulk_apply import BulkApplyError, CheckpointStore, InvalidRunId, RunInProgress, classify, execute
+from config_store import ConfigSnapshot
+from history_store import HistoryStore
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+from search_cache import SearchResultCache
+from search_index import SearchIndex
+
+def make_job(job_id, title="DevOps Engineer", company=None):
+    return {"job_id": job_id, "title": title, "company": company or f"Company {job_id}", "location": "London"}
+
+class TestCheckpointStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(os.path.join(self.tmp.name, "runs"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_outcomes_survive_reload(self):
+        run = self.store.create([{"job_id": "1"}, {"job_id": "2"}], {"allow_duplicate": False})
+        self.assertEqual(stat.S_IMODE(os.stat(run.path).st_mode), 0o600)
+        run.record({"job_id": "1", "outcome": "applied"})
+
+        loaded = self.store.load(run.run_id)
+        self.assertEqual(loaded.options, {"allow_duplicate": False})
+        self.assertEqual([job["job_id"] for job in loaded.pending()], ["2"])
+        self.assertEqual(loaded.results()[1], {"job_id": "2", "outcome": "pending"})
+        self.assertEqual([r.run_id for r in self.store.incomplete()], [run.run_id])
+
+    def test_torn_trailing_line_is_ignored(self):
+        run = self.store.create([{"job_id": "1"}, {"job_id": "2"}], {})
+        run.record({"job_id": "1", "outcome": "applied"})
+        with open(run.path, "a") as file:
+            file.write('{"job_id": "2", "outc')
+        loaded = self.store.load(run.run_id)
+        self.assertEqual(loaded.summary(), {"applied": 1, "pending": 1})
+
+    def test_invalid_and_unknown_run_ids(self):
+        with self.assertRaises(InvalidRunId):
+            self.store.load("../../etc/passwd")
+        with self.assertRaises(InvalidRunId):
+            self.store.load(12345)
+        with self.assertRaises(BulkApplyError):
+            self.store.load("0" * 32)
+
+    def test_corrupt_header_is_reported(self):
+        run = self.store.create([{"job_id": "1"}], {})
+        with open(run.path, "w") as file:
+            file.write('{"run_id": "' + run.run_id + '", "jo\n')
+        with self.assertRaisesRegex(BulkApplyError, "corrupt header"):
+            self.store.load(run.run_id)
+        with open(run.path, "wb") as file:
+            file.write(b"\xff\xfe\n")
+        with self.assertRaisesRegex(BulkApplyError, "unreadable"):
+            self.store.load(run.run_id)
+        with self.assertLogs("bulk_apply", level="WARNING"):
+            self.assertEqual(self.store.incomplete(), [])
+
+    def test_run_cannot_execute_twice_at_once(self):
+        run = self.store.create([{"job_id": "1"}], {})
+        with self.store.running(run):
+            with self.assertRaises(RunInProgress):
+                with self.store.running(self.store.load(run.run_id)):
+                    pass
+
+    def test_worker_processes_do_not_execute_one_run_together(self):
+        # A second store over the same directory stands in for another worker process
+        other = CheckpointStore(self.store.directory)
+        run = self.store.create([{"job_id": "1"}, {"job_id": "2"}], {})
+        stale = other.load(run.run_id)
+        with self.store.running(run):
+            with self.assertRaisesRegex(RunInProgress, "another process"):
+                with other.running(stale):
+                    pass
+            run.record({"job_id": "1", "outcome": "applied"})
+        apply = MagicMock(return_value=({"application": {}}, 200))
+        with other.running(stale):
+            execute(stale, apply)
+        self.assertEqual([call.args[0]["job_id"] for call in apply.call_args_list], ["2"])
+        self.assertEqual(self.store.load(run.run_id).summary(), {"applied": 2})
+
+class TestExecute(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_classify(self):
+        self.assertEqual([classify(code) for code in (200, 409, 404, 400, 500, 503)],
+                         ["applied", "duplicate", "not_found", "invalid", "failed", "failed"])
+
+    def test_failed_jobs_are_retried_on_resume(self):
+        run = self.store.create([{"job_id": str(i)} for i in range(4)], {})
+        attempts = []
+
+        def flaky(job):
+            attempts.append(job["job_id"])
+            if job["job_id"] == "2" and attempts.count("2") == 1:
+                return {"error": "LinkedIn unavailable", "status": "error"}, 503
+            return {"application": {"applied_at": "now"}, "status": "success"}, 200
+
+        results = execute(run, flaky, max_parallelism=2)
+        self.assertEqual(results[2]["outcome"], "failed")
+        self.assertEqual(results[2]["error"], "LinkedIn unavailable")
+        self.assertFalse(run.finished)
+
+        resumed = self.store.load(run.run_id)
+        results = execute(resumed, flaky)
+        self.assertEqual([r["outcome"] for r in results], ["applied"] * 4)
+        self.assertEqual(sorted(attempts), ["0", "1", "2", "2", "3"])
+        self.assertTrue(self.store.load(run.run_id).finished)
+        self.assertEqual(self.store.incomplete(), [])
+
+    def test_exceptions_become_failed_outcomes(self):
+        run = self.store.create([{"job_id": "1"}], {})
+        results = execute(run, MagicMock(side_effect=RuntimeError("boom")))
+        self.assertEqual(results, [{"job_id": "1", "outcome": "failed", "http_status": 500, "error": "boom"}])
+
+    def test_parallelism_is_bounded(self):
+        run = self.store.create([{"job_id": str(i)} for i in range(12)], {})
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def apply(job):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return {"application": {}}, 200
+
+        execute(run, apply, max_parallelism=3)
+        self.assertEqual(active[1], 3)
+
+class TestBulkApplyTool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.job_cache = JobCache()
+        self.search_index = SearchIndex()
+        self.job_cache.subscribe(self.search_index)
+        for job_id in ("1", "2", "3"):
+            self.job_cache.put(make_job(job_id))
+        self.job_cache.put(make_job("4", company="Company 3"))
+        self.history = HistoryStore()
+        self.patches = [
+            patch("server.job_cache", self.job_cache),
+            patch("server.search_index", self.search_index),
+            patch("server.search_cache", SearchResultCache()),
+            patch("server.application_history", self.history),
+            patch("server.bulk_apply_store", CheckpointStore(self.tmp.name)),
+            patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock() for _ in range(4)])),
+            patch("server.config", ConfigSnapshot({"phone_number": "+44"})),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = server.app.test_client()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def invoke(self, parameters):
+        response = self.client.post('/mcp/v1/invoke', json={'name': 'bulk_apply_to_jobs', 'parameters': parameters})
+        return response.status_code, response.get_json()
+
+    def test_applies_and_reports_per_job_outcomes(self):
+        self.history.add({"job_id": "2", "job_title": "DevOps Engineer", "company": "Company 2",
+                          "applied_at": "2024-01-01T00:00:00", "status": "applied"})
+        status, payload = self.invoke({"job_ids": ["1", "2", "3", "4", "missing", "1"]})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["status"], "success")
+        outcomes = {result["job_id"]: result["outcome"] for result in payload["results"]}
+        self.assertEqual(outcomes["1"], "applied")
+        self.assertEqual(outcomes["2"], "duplicate")
+        self.assertEqual(outcomes["missing"], "not_found")
+        # 3 and 4 are the same role at the same company; only one goes through
+        self.assertEqual(sorted([outcomes["3"], outcomes["4"]]), ["applied", "duplicate"])
+        self.assertEqual(len(payload["results"]), 5)
+        self.assertEqual(self.history.query(limit=10)[0][0]["phone_number"], "+44")
+
+    def test_startup_resume_skips_runs_held_by_another_worker(self):
+        run = server.bulk_apply_store.create([make_job("1")], {"phone_number": "+44"})
+        other = CheckpointStore(self.tmp.name)
+        with other.running(other.load(run.run_id)), patch("server._apply_upstream") as upstream:
+            with self.assertLogs("server", level="INFO") as logs:
+                server.resume_bulk_apply_runs(server.bulk_apply_store.incomplete())
+        upstream.assert_not_called()
+        self.assertIn("already being resumed", logs.output[0])
+        self.assertEqual(server.bulk_apply_store.load(run.run_id).summary(), {"pending": 1})
+
+    def test_resume_skips_finished_jobs(self):
+        with patch("server._apply_upstream", side_effect=[None, GatewayDown(), None]):
+            status, payload = self.invoke({"job_ids": ["1", "2", "3"], "max_parallelism": 1})
+        self.assertEqual(payload["status"], "partial")
+        self.assertEqual(payload["summary"], {"applied": 2, "failed": 1})
+
+        with patch("server._apply_upstream") as upstream:
+            status, payload = self.invoke({"run_id": payload["run_id"]})
+        self.assertEqual(upstream.call_count, 1)
+        self.assertEqual(payload["resumed"], 2)
+        self.assertEqual(payload["summary"], {"applied": 3})
+        self.assertTrue(payload["complete"])
+
+    def test_applies_to_search_results(self):
+        jobs = [make_job("10", title="Platform Engineer"), make_job("11", title="Platform Engineer")]
+        with patch("server._search_upstream", return_value=jobs):
+            status, payload = self.invoke({"search": {"title": "Platform", "limit": 50}})
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted(result["job_id"] for result in payload["results"]), ["10", "11"])
+        self.assertEqual({result["outcome"] for result in payload["results"]}, {"applied"})
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self.invoke({})[0], 400)
+        self.assertEqual(self.invoke({"job_ids": "1"})[0], 400)
+        self.assertEqual(self.invoke({"job_ids": ["1"], "max_parallelism": 0})[0], 400)
+        self.assertEqual(self.invoke({"run_id": "0" * 32})[0], 404)
+        self.assertEqual(self.invoke({"run_id": 12345})[0], 400)
+        self.assertEqual(self.invoke({"run_id": "../../etc/passwd"})[0], 400)
+        with patch("server.config", ConfigSnapshot({"bulk_apply": {"max_jobs": 2}})):
+            self.assertEqual(self.invoke({"job_ids": ["1", "2", "3"]})[0], 400)
+
+    def test_throughput_scales_with_parallelism(self):
+        def slow_apply(client, job_id, cover_letter, phone_number):
+            time.sleep(0.05)
+
+        for i in range(8):
+            self.job_cache.put(make_job(f"p{i}"))
+        timings = {}
+        with patch("server._apply_upstream", side_effect=slow_apply):
+            for parallelism in (1, 4):
+                start = time.perf_counter()
+                status, payload = self.invoke({"job_ids": [f"p{i}" for i in range(8)], "allow_duplicate": True,
+                                               "max_parallelism": parallelism})
+                timings[parallelism] = time.perf_counter() - start
+                self.assertEqual(payload["summary"], {"applied": 8})
+        self.assertLess(timings[4], timings[1] / 2)
+
+class GatewayDown(Exception):
+    pass
+
+if __name__ == '__main__':
+    unittest.main()
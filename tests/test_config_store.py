@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Add parent directory to path to import config_store
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from config_store import ConfigError, ConfigSnapshot, ConfigWatcher, load_snapshot, validate
+from cover_letter import CoverLetterRenderer
+
+CONFIG = """
+default_cover_letter: "Hello [COMPANY_NAME]"
+personal_info:
+  name: Sam
+job_preferences:
+  titles: [DevOps Engineer]
+  locations: [London]
+cache:
+  max_entries: 100
+"""
+
+class TestValidation(unittest.TestCase):
+    def test_valid_config(self):
+        self.assertEqual(validate(None), {})
+        validate({"cache": {"max_entries": 10, "ttl_seconds": 1.5}, "prefetch": {"enabled": False}})
+
+    def test_reports_every_problem(self):
+        with self.assertRaises(ConfigError) as raised:
+            validate({
+                "cache": {"max_entries": -1},
+                "prefetch": {"enabled": "yes"},
+                "gateway": ["not", "a", "mapping"],
+                "job_preferences": {"titles": "DevOps"},
+                "default_cover_letter": 42,
+                "search": {"page_size": 0},
+            })
+        message = str(raised.exception)
+        for fragment in ("cache.max_entries", "prefetch.enabled", "gateway must be a mapping", "search.page_size",
+                         "job_preferences.titles", "default_cover_letter"):
+            self.assertIn(fragment, message)
+
+    def test_top_level_must_be_mapping(self):
+        with self.assertRaises(ConfigError):
+            validate(["linkedin"])
+
+class TestConfigSnapshot(unittest.TestCase):
+    def test_snapshot_is_immutable(self):
+        snapshot = ConfigSnapshot({"cache": {"max_entries": 1}, "job_preferences": {"titles": ["SRE"]}})
+        self.assertEqual(snapshot.get("cache").get("max_entries"), 1)
+        self.assertEqual(snapshot["job_preferences"]["titles"], ("SRE",))
+        with self.assertRaises(TypeError):
+            snapshot["cache"]["max_entries"] = 2
+        with self.assertRaises(TypeError):
+            snapshot["new"] = {}
+        self.assertIsNone(snapshot.get("missing"))
+
+    def test_unchanged_sections_are_reused(self):
+        first = ConfigSnapshot({"cache": {"max_entries": 1}, "prefetch": {"interval_seconds": 60}})
+        second = ConfigSnapshot({"cache": {"max_entries": 1}, "prefetch": {"interval_seconds": 30},
+                                 "http": {}}, previous=first)
+        self.assertIs(second["cache"], first["cache"])
+        self.assertIsNot(second["prefetch"], first["prefetch"])
+        self.assertEqual(second.changed_sections(first), ["http", "prefetch"])
+        self.assertEqual(second.version, first.version + 1)
+
+class TestConfigWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "config.yaml")
+        self.write(CONFIG)
+        self.snapshot = load_snapshot(self.path)
+        self.on_change = MagicMock()
+        self.watcher = ConfigWatcher(self.path, self.snapshot, self.on_change)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text, mtime=None):
+        with open(self.path, "w") as file:
+            file.write(text)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_no_change(self):
+        self.assertEqual(self.watcher.check(), [])
+        self.on_change.assert_not_called()
+
+    def test_changed_file_is_swapped_in(self):
+        self.write(CONFIG.replace("Sam", "Alex"), mtime=1)
+        self.assertEqual(self.watcher.check(), ["personal_info"])
+        previous, snapshot, changed = self.on_change.call_args[0]
+        self.assertIs(previous, self.snapshot)
+        self.assertEqual(snapshot["personal_info"]["name"], "Alex")
+        self.assertIs(snapshot["cache"], self.snapshot["cache"])
+        self.assertIs(self.watcher.snapshot, snapshot)
+
+    def test_invalid_file_keeps_current_snapshot(self):
+        self.write("cache: [1, 2", mtime=1)
+        self.assertEqual(self.watcher.check(), [])
+        self.write("cache:\n  max_entries: -5\n", mtime=2)
+        self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.watcher.errors, 2)
+        self.assertIs(self.watcher.snapshot, self.snapshot)
+        self.on_change.assert_not_called()
+
+    def test_disabled_by_config(self):
+        snapshot = ConfigSnapshot({"config_reload": {"enabled": False}})
+        self.assertIsNone(ConfigWatcher.from_config(self.path, snapshot, self.on_change))
+
+class TestServerReload(unittest.TestCase):
+    def test_cover_letters_follow_reloaded_config(self):
+        previous = ConfigSnapshot({"default_cover_letter": "Hi [COMPANY_NAME]"})
+        snapshot = ConfigSnapshot({"default_cover_letter": "Dear [COMPANY_NAME]"}, previous)
+        with patch("server.config", previous), \
+                patch("server.cover_letters", CoverLetterRenderer.from_config(previous)), \
+                patch("server.initialize_prefetch") as initialize_prefetch:
+            server.apply_config_change(previous, snapshot, snapshot.changed_sections(previous))
+            self.assertIs(server.config, snapshot)
+            self.assertEqual(server.cover_letters.render({"job_id": "1", "company": "Acme"}), "Dear Acme")
+            initialize_prefetch.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import cover_letter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from cover_letter import CoverLetterRenderer, CoverLetterTemplate
+from history_store import HistoryStore
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+
+TEMPLATE = "Dear [COMPANY_NAME],\nI want the [JOB_TITLE] role at [COMPANY_NAME].\n[YOUR_NAME]"
+
+def make_job(job_id="1", title="DevOps Engineer", company="Acme"):
+    return {"job_id": job_id, "title": title, "company": company, "location": "London"}
+
+class TestCoverLetterTemplate(unittest.TestCase):
+    def test_render_fills_placeholders(self):
+        template = CoverLetterTemplate(TEMPLATE)
+        self.assertEqual(template.job_fields, ("COMPANY_NAME", "JOB_TITLE"))
+        self.assertEqual(template.render({"COMPANY_NAME": "Acme", "JOB_TITLE": "SRE", "YOUR_NAME": "Sam"}),
+                         "Dear Acme,\nI want the SRE role at Acme.\nSam")
+
+    def test_unknown_and_missing_placeholders_are_kept(self):
+        template = CoverLetterTemplate("[JOB_TITLE] [SALARY] [lower] []")
+        self.assertEqual(template.render({}), "[JOB_TITLE] [SALARY] [lower] []")
+
+    def test_plain_text(self):
+        self.assertEqual(CoverLetterTemplate("Hello").render({}), "Hello")
+
+class TestCoverLetterRenderer(unittest.TestCase):
+    def setUp(self):
+        self.renderer = CoverLetterRenderer.from_config({
+            "default_cover_letter": TEMPLATE,
+            "personal_info": {"name": "Sam Doe"},
+        })
+
+    def test_render_default_template(self):
+        self.assertEqual(self.renderer.render(make_job()),
+                         "Dear Acme,\nI want the DevOps Engineer role at Acme.\nSam Doe")
+
+    def test_rendered_letters_are_cached_per_job(self):
+        first = self.renderer.render(make_job())
+        self.assertIs(self.renderer.render(make_job()), first)
+        self.renderer.render(make_job("2", company="Globex"))
+        self.assertEqual(self.renderer.stats()["hits"], 1)
+        self.assertEqual(self.renderer.stats()["cached_letters"], 2)
+
+    def test_changed_job_is_rendered_again(self):
+        self.renderer.render(make_job())
+        self.assertIn("Acme Ltd", self.renderer.render(make_job(company="Acme Ltd")))
+
+    def test_custom_templates_are_compiled_once(self):
+        self.assertIs(self.renderer.compile("Hi [COMPANY_NAME]"), self.renderer.compile("Hi [COMPANY_NAME]"))
+        self.assertEqual(self.renderer.render(make_job(), "Hi [COMPANY_NAME]"), "Hi Acme")
+
+    def test_caches_are_bounded(self):
+        renderer = CoverLetterRenderer(TEMPLATE, cache_size=2, max_templates=2)
+        for i in range(5):
+            renderer.render(make_job(str(i)), f"Letter {i} for [COMPANY_NAME]")
+        stats = renderer.stats()
+        self.assertEqual(stats["cached_letters"], 2)
+        self.assertEqual(stats["templates"], 2)
+
+class TestApplyRendersCoverLetter(unittest.TestCase):
+    def test_apply_to_job_fills_placeholders(self):
+        job_cache = JobCache()
+        job_cache.put(make_job("j1"))
+        upstream = MagicMock(return_value=None)
+        renderer = CoverLetterRenderer("Hello [COMPANY_NAME], from [YOUR_NAME]", {"name": "Sam"})
+        with patch("server.job_cache", job_cache), \
+                patch("server.application_history", HistoryStore()), \
+                patch("server.cover_letters", renderer), \
+                patch("server._apply_upstream", upstream), \
+                patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()])):
+            payload, status = server.dispatch_tool("apply_to_job", {"job_id": "j1"})
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["application"]["cover_letter"], "Hello Acme, from Sam")
+            self.assertEqual(upstream.call_args[0][2], "Hello Acme, from Sam")
+
+            server.dispatch_tool("apply_to_job", {"job_id": "j1", "cover_letter": "Re: [JOB_TITLE]",
+                                                  "allow_duplicate": True})
+            self.assertEqual(upstream.call_args[0][2], "Re: DevOps Engineer")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import dedup
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from config_store import ConfigSnapshot
+from dedup import DuplicateIndex, MinHasher, shingles
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+from search_cache import SearchResultCache
+from search_index import SearchIndex
+
+DESCRIPTION = ("Acme is hiring a DevOps Engineer to build and run our Kubernetes platform on AWS. "
+               "You will own CI/CD pipelines, write Terraform modules, improve observability with "
+               "Prometheus and Grafana, and help product teams ship safely several times a day. "
+               "We offer flexible hours, a learning budget and a friendly on-call rotation.")
+
+def make_job(job_id, title="DevOps Engineer", company="Acme", location="London", description=DESCRIPTION):
+    return {"job_id": job_id, "title": title, "company": company, "location": location,
+            "description_snippet": description[:80], "full_description": description}
+
+class TestMinHash(unittest.TestCase):
+    def test_similar_sets_have_similar_signatures(self):
+        hasher = MinHasher(128)
+        first = shingles(DESCRIPTION)
+        second = shingles(DESCRIPTION + " Apply by Friday.")
+        jaccard = len(set(first) & set(second)) / len(set(first) | set(second))
+        estimate = (hasher.signature(first) == hasher.signature(second)).mean()
+        self.assertAlmostEqual(estimate, jaccard, delta=0.1)
+        self.assertLess((hasher.signature(first) == hasher.signature(shingles("Accountant role"))).mean(), 0.1)
+
+    def test_signatures_are_deterministic(self):
+        self.assertTrue((MinHasher().signature(shingles("a b c d")) ==
+                         MinHasher().signature(shingles("a b c d"))).all())
+        self.assertEqual(len(shingles("a b c d")), 2)
+        self.assertEqual(len(shingles("a")), 1)
+        self.assertEqual(len(MinHasher(32).signature(shingles(""))), 32)
+
+class TestDuplicateIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = DuplicateIndex()
+
+    def test_groups_reposts_and_multi_location_listings(self):
+        self.index.add(make_job("1"))
+        self.index.add(make_job("2", location="Manchester"))
+        self.index.add(make_job("3", description=DESCRIPTION.replace("a day", "a week")))
+        self.index.add(make_job("4", title="Data Analyst", company="Globex",
+                                description="Globex needs an analyst to build dashboards in Looker and SQL."))
+        self.assertEqual(self.index.duplicates("1"), ["2", "3"])
+        self.assertEqual(self.index.duplicates("4"), [])
+        self.assertEqual(self.index.duplicates("missing"), [])
+        self.assertEqual(self.index.stats(), {"postings": 4, "groups": 2, "duplicates": 2})
+
+    def test_collapse_keeps_first_of_each_group(self):
+        for job_id in ("1", "2", "3"):
+            self.index.add(make_job(job_id, location=f"City {job_id}"))
+        self.index.add(make_job("4", company="Globex", description="Something else entirely, built in Go."))
+        self.assertEqual(self.index.collapse(["2", "4", "1", "unknown"]),
+                         [("2", ["1", "3"]), ("4", []), ("unknown", [])])
+
+    def test_shared_description_across_companies_is_not_a_duplicate(self):
+        for job_id, company in (("1", "Acme"), ("2", "Globex"), ("3", "Initech")):
+            self.index.add(make_job(job_id, company=company))
+        self.index.add(make_job("4", title="Accountant"))
+        self.assertEqual(self.index.collapse(["1", "2", "3", "4"]), [("1", []), ("2", []), ("3", []), ("4", [])])
+        self.assertEqual(self.index.stats()["duplicates"], 0)
+
+    def test_changed_text_regroups_and_remove(self):
+        self.index.add(make_job("1"))
+        self.index.add(make_job("2"))
+        self.index.add(make_job("2", title="Chef", company="Bistro", description="Cook lunch and dinner."))
+        self.assertEqual(self.index.duplicates("1"), [])
+        self.index.add(make_job("3"))
+        self.index.remove("1")
+        self.index.remove("1")
+        self.assertEqual(self.index.duplicates("3"), [])
+        self.assertEqual(len(self.index), 2)
+
+    def test_follows_the_job_cache(self):
+        cache = JobCache()
+        cache.subscribe(self.index)
+        cache.put(make_job("1"))
+        cache.put(make_job("2"))
+        self.assertEqual(self.index.duplicates("2"), ["1"])
+        cache.clear()
+        self.assertEqual(self.index.stats()["postings"], 0)
+
+    def test_from_config(self):
+        self.assertEqual(DuplicateIndex.from_config({"similarity_threshold": 0.5}).threshold, 0.5)
+        with self.assertRaises(ValueError):
+            DuplicateIndex(num_permutations=10, bands=3)
+
+class TestCollapseInSearch(unittest.TestCase):
+    def setUp(self):
+        self.job_cache = JobCache()
+        self.search_index = SearchIndex()
+        self.duplicate_index = DuplicateIndex()
+        self.job_cache.subscribe(self.search_index)
+        self.job_cache.subscribe(self.duplicate_index)
+        for job_id, location in (("1", "London"), ("2", "Manchester"), ("3", "Leeds")):
+            self.job_cache.put(make_job(job_id, location=location))
+        self.job_cache.put(make_job("4", company="Globex", description="Globex runs DevOps for retail in Go."))
+        self.patches = [
+            patch("server.job_cache", self.job_cache),
+            patch("server.search_index", self.search_index),
+            patch("server.search_cache", SearchResultCache()),
+            patch("server.duplicate_index", self.duplicate_index),
+            patch("server._fetch_search_results", return_value=[]),
+            patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()])),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_collapse_duplicates(self):
+        payload, status = server.dispatch_tool("search_jobs", {"title": "DevOps Engineer"})
+        self.assertEqual(payload["count"], 4)
+
+        payload, status = server.dispatch_tool("search_jobs", {"title": "DevOps Engineer", "limit": 2,
+                                                               "collapse_duplicates": True})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["count"], 2)
+        self.assertEqual(payload["collapsed"], 2)
+        by_id = {job["job_id"]: job["duplicates"] for job in payload["jobs"]}
+        self.assertEqual(by_id["4"], [])
+        grouped = [job_id for job_id in by_id if job_id != "4"]
+        self.assertEqual(len(grouped), 1)
+        self.assertEqual(sorted(by_id[grouped[0]] + grouped), ["1", "2", "3"])
+
+    def test_mock_jobs_with_a_shared_description_are_not_collapsed(self):
+        job_cache = JobCache()
+        duplicate_index = DuplicateIndex()
+        job_cache.subscribe(duplicate_index)
+        for job in server._search_upstream(MagicMock(), {}):
+            job_cache.put(dict(job, **server._job_details_upstream(MagicMock(), job["job_id"])))
+        self.assertEqual(duplicate_index.stats()["duplicates"], 0)
+
+    def test_initialize_dedup_reads_config(self):
+        with patch("server.config", ConfigSnapshot({"dedup": {"similarity_threshold": 0.9}})):
+            server.initialize_dedup()
+            self.assertEqual(server.duplicate_index.threshold, 0.9)
+            self.assertEqual(server.duplicate_index.stats()["groups"], 2)
+            self.job_cache.unsubscribe(server.duplicate_index)
+
+if __name__ == '__main__':
+    unittest.main()
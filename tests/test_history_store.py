@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+
+# Add parent directory to path to import history_store
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from history_store import DuplicateApplication, HistoryStore, InvalidCursor, job_fingerprint
+
+def make_application(i, **fields):
+    application = {
+        "job_id": str(i),
+        "job_title": "DevOps Engineer",
+        "company": "Acme",
+        "applied_at": f"2025-07-{10 + i:02d}T10:00:00",
+        "status": "applied",
+    }
+    application.update(fields)
+    return application
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "history.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_survives_reopen(self):
+        store = HistoryStore(self.path)
+        store.add(make_application(1))
+        store.close()
+
+        store = HistoryStore(self.path)
+        self.assertEqual(len(store), 1)
+        applications, _ = store.query()
+        self.assertEqual(applications[0]["job_id"], "1")
+        self.assertEqual(store._conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        store.close()
+
+    def test_newest_first_pagination(self):
+        store = HistoryStore()
+        for i in range(7):
+            store.add(make_application(i))
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = store.query(limit=3, cursor=cursor)
+            seen.extend(application["job_id"] for application in page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, ["6", "5", "4", "3", "2", "1", "0"])
+
+    def test_pagination_with_equal_timestamps(self):
+        store = HistoryStore()
+        for i in range(4):
+            store.add(make_application(i, applied_at="2025-07-10T10:00:00"))
+        page, cursor = store.query(limit=3)
+        rest, cursor = store.query(limit=3, cursor=cursor)
+        self.assertEqual([a["job_id"] for a in page + rest], ["3", "2", "1", "0"])
+        self.assertIsNone(cursor)
+
+    def test_filters(self):
+        store = HistoryStore()
+        store.add(make_application(1, company="Acme"))
+        store.add(make_application(2, company="Globex", status="rejected"))
+        store.add(make_application(3, company="ACME"))
+        page, _ = store.query(company="acme")
+        self.assertEqual([a["job_id"] for a in page], ["3", "1"])
+        page, _ = store.query(status="rejected")
+        self.assertEqual([a["job_id"] for a in page], ["2"])
+        page, _ = store.query(since="2025-07-12", until="2025-07-13T00:00:00")
+        self.assertEqual([a["job_id"] for a in page], ["2"])
+        # A date-only bound includes the whole day
+        page, _ = store.query(until="2025-07-12")
+        self.assertEqual([a["job_id"] for a in page], ["2", "1"])
+        page, _ = store.query(since="2025-07-12", until="2025-07-12")
+        self.assertEqual([a["job_id"] for a in page], ["2"])
+
+    def test_find_by_job_id_uses_index(self):
+        store = HistoryStore()
+        store.add(make_application(1))
+        self.assertEqual(store.find_by_job_id("1")[0]["company"], "Acme")
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM applications WHERE job_id = ?", ("1",)).fetchall()
+        self.assertIn("idx_applications_job_id", " ".join(str(tuple(row)) for row in plan))
+
+    def test_duplicate_detection(self):
+        store = HistoryStore()
+        store.add(make_application(1, company="Acme Ltd", job_title="Senior DevOps Engineer"))
+        self.assertEqual(store.find_duplicate("1"), ("1", "job_id"))
+        self.assertEqual(store.find_duplicate("99", "ACME", "Senior DevOps  Engineer"),
+                         ("1", "same company and title"))
+        self.assertIsNone(store.find_duplicate("99", "Acme", "Platform Engineer"))
+        with self.assertRaises(DuplicateApplication):
+            store.add(make_application(1), allow_duplicate=False)
+        self.assertEqual(len(store), 1)
+
+    def test_failed_applications_are_not_duplicates(self):
+        store = HistoryStore()
+        store.add(make_application(1, status="failed"))
+        self.assertIsNone(store.find_duplicate("1"))
+
+    def test_duplicate_index_rebuilt_on_open(self):
+        store = HistoryStore(self.path)
+        store.add(make_application(1, company="Globex Inc", job_title="SRE"))
+        store.close()
+        store = HistoryStore(self.path)
+        self.assertIsNotNone(store.find_duplicate("1"))
+        self.assertIsNotNone(store.find_duplicate("2", "Globex", "sre"))
+        store.close()
+
+    def test_job_fingerprint(self):
+        self.assertEqual(job_fingerprint("Tech Innovations Ltd", "DevOps Engineer"),
+                         job_fingerprint("tech innovations", "devops engineer"))
+        self.assertIsNone(job_fingerprint("", "DevOps Engineer"))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            HistoryStore().query(cursor="not-a-cursor")
+
+    def test_reservations_block_concurrent_applications(self):
+        for store, other in ((HistoryStore(), None),
+                             (HistoryStore(self.path, shared=True), HistoryStore(self.path, shared=True))):
+            other = other or store
+            reservation = store.reserve("1", "Acme", "DevOps Engineer")
+            with self.assertRaises(DuplicateApplication) as raised:
+                other.reserve("2", "Acme Ltd", "DevOps Engineer")
+            self.assertEqual((raised.exception.duplicate_of, raised.exception.reason), ("1", "application in progress"))
+            self.assertEqual(other.find_duplicate("1"), ("1", "application in progress"))
+
+            store.release(reservation)
+            store.release(reservation)
+            self.assertIsNone(other.find_duplicate("1"))
+
+            reservation = store.reserve("1", "Acme", "DevOps Engineer")
+            store.add(make_application(1), allow_duplicate=False, reservation=reservation)
+            self.assertEqual(other.find_duplicate("2", "Acme", "DevOps Engineer"), ("1", "same company and title"))
+            store.release(reservation)
+            self.assertEqual(other.find_duplicate("1"), ("1", "job_id"))
+            store.close()
+            other.close()
+
+    def test_restore_adds_only_missing_applications(self):
+        store = HistoryStore()
+        store.add(make_application(1))
+        restored = store.restore([make_application(1), make_application(2), make_application(2)])
+        self.assertEqual(restored, 1)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.find_duplicate("2"), ("2", "job_id"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import job_cache
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from job_cache import JobCache
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def make_job(job_id, **fields):
+    job = {"job_id": job_id, "title": "DevOps Engineer", "company": "Test Company"}
+    job.update(fields)
+    return job
+
+class TestJobCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_get_and_put(self):
+        cache = JobCache(clock=self.clock)
+        cache.put(make_job("1"))
+        self.assertEqual(cache.get("1")["job_id"], "1")
+        self.assertIsNone(cache.get("2"))
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_lru_eviction_by_entries(self):
+        cache = JobCache(max_entries=2, clock=self.clock)
+        cache.put(make_job("1"))
+        cache.put(make_job("2"))
+        cache.get("1")
+        cache.put(make_job("3"))
+        self.assertIn("1", cache)
+        self.assertNotIn("2", cache)
+        self.assertIn("3", cache)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_eviction_by_bytes(self):
+        cache = JobCache(max_bytes=4000, clock=self.clock)
+        for i in range(10):
+            cache.put(make_job(str(i), full_description=str(i) * 1000))
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 4000)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertIn("9", cache)
+
+    def test_ttl_expiry(self):
+        cache = JobCache(ttl=60, clock=self.clock)
+        cache.put(make_job("1"))
+        self.clock.now += 61
+        self.assertIsNone(cache.get("1"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_max_age_from_date_posted(self):
+        cache = JobCache(ttl=100 * 86400, max_age_days=30, clock=self.clock)
+        cache.put(make_job("old", date_posted="1970-01-01"))
+        cache.put(make_job("new", date_posted="1970-01-12"))
+        self.clock.now = 20 * 86400
+        self.assertEqual(cache.purge_expired(), 0)
+        self.clock.now = 32 * 86400
+        self.assertEqual(cache.purge_expired(), 1)
+        self.assertIn("new", cache)
+
+    def test_peek_does_not_count_or_reorder(self):
+        cache = JobCache(max_entries=2, clock=self.clock)
+        cache.put(make_job("1"))
+        cache.put(make_job("2"))
+        self.assertEqual(cache.peek("1")["job_id"], "1")
+        self.assertIsNone(cache.peek("missing"))
+        cache.put(make_job("3"))
+        self.assertNotIn("1", cache)
+        self.assertEqual(cache.stats()["hits"], 0)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_expiring(self):
+        cache = JobCache(ttl=100, clock=self.clock)
+        cache.put(make_job("old"))
+        self.clock.now += 50
+        cache.put(make_job("new"))
+        self.assertEqual(cache.expiring(60), ["old"])
+        self.assertEqual(cache.expiring(200), ["old", "new"])
+        self.clock.now += 60
+        self.assertEqual(cache.expiring(200), ["new"])
+
+if __name__ == '__main__':
+    unittest.main()
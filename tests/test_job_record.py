@@ -0,0 +1,85 @@
+import json
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import job_record
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from job_record import DetailStore, JobRecord
+
+def make_job(job_id, **fields):
+    job = {
+        "job_id": job_id,
+        "title": "DevOps Engineer",
+        "company": "Tech Innovations Ltd",
+        "location": "London, United Kingdom",
+        "description_snippet": "Looking for an experienced engineer...",
+        "date_posted": "2025-07-15",
+        "experience_level": "Mid-Senior",
+        "job_type": "Full-time",
+        "remote": True,
+        "url": f"https://www.linkedin.com/jobs/view/{job_id}",
+    }
+    job.update(fields)
+    return job
+
+class TestJobRecord(unittest.TestCase):
+    def setUp(self):
+        self.store = DetailStore()
+
+    def test_wire_format_is_unchanged(self):
+        job = make_job("1", badge="promoted", full_description="About the role", skills_required=["AWS"],
+                       salary_range="£70,000")
+        record = JobRecord(job, self.store)
+        self.assertEqual(json.dumps(record.to_dict()), json.dumps(job))
+        self.assertEqual(record, job)
+        self.assertEqual(record.summary(), {key: value for key, value in job.items()
+                                            if key not in ("full_description", "skills_required", "salary_range")})
+
+    def test_missing_fields_stay_missing(self):
+        record = JobRecord({"job_id": "1", "title": "SRE"}, self.store)
+        self.assertEqual(record.to_dict(), {"job_id": "1", "title": "SRE"})
+        self.assertNotIn("company", record)
+        self.assertIsNone(record.get("company"))
+        with self.assertRaises(KeyError):
+            record["full_description"]
+
+    def test_update_adds_details_lazily(self):
+        record = JobRecord(make_job("1"), self.store)
+        self.assertNotIn("full_description", record)
+        record.update({"full_description": "text", "skills_required": ["Go"], "salary_range": None})
+        self.assertEqual(record["full_description"], "text")
+        self.assertEqual(record["skills_required"], ["Go"])
+        self.assertIn("salary_range", record)
+        self.assertEqual(list(record)[-3:], ["full_description", "skills_required", "salary_range"])
+
+    def test_interned_fields_are_shared(self):
+        a = JobRecord(make_job("1", company="".join(["Acme ", "Corp"])), self.store)
+        b = JobRecord(make_job("2", company="".join(["Acme ", "Corp"])), self.store)
+        self.assertIs(a.company, b.company)
+
+    def test_descriptions_are_shared_and_reference_counted(self):
+        description = "We are hiring. " * 100
+        JobRecord(make_job("1", full_description="".join(description)), self.store)
+        JobRecord(make_job("2", full_description=description[:] + ""), self.store)
+        stats = self.store.stats()
+        self.assertEqual(stats["jobs"], 2)
+        self.assertEqual(stats["distinct_descriptions"], 1)
+        self.store.discard("1")
+        self.assertEqual(self.store.stats()["distinct_descriptions"], 1)
+        self.store.discard("2")
+        self.assertEqual(self.store.stats(), {"jobs": 0, "distinct_descriptions": 0, "description_bytes": 0})
+
+    def test_replacing_a_job_replaces_its_details(self):
+        JobRecord(make_job("1", full_description="old"), self.store)
+        record = JobRecord(make_job("1"), self.store)
+        self.assertNotIn("full_description", record)
+        self.assertEqual(self.store.stats()["distinct_descriptions"], 0)
+
+    def test_record_is_smaller_than_dict(self):
+        job = make_job("1")
+        record = JobRecord(job, self.store)
+        self.assertLess(sys.getsizeof(record), sys.getsizeof(job))
+
+if __name__ == '__main__':
+    unittest.main()
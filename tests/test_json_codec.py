@@ -0,0 +1,140 @@
+import asyncio
+import gzip
+import json
+import unittest
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import json_codec
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asgi
+import json_codec
+import server
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+
+class TestJsonCodec(unittest.TestCase):
+    def tearDown(self):
+        json_codec.configure({})
+
+    def test_codecs_round_trip(self):
+        payload = {"jobs": [{"title": "DevOps", "salary_range": "£70,000", "remote": True}], "count": 1}
+        for name in ("json", "auto"):
+            json_codec.configure({"json_codec": name})
+            body = json_codec.dumps(payload)
+            self.assertIsInstance(body, bytes)
+            self.assertEqual(json.loads(body), payload)
+            self.assertEqual(json_codec.loads(body), payload)
+
+    def test_flask_provider_keeps_default_encoding(self):
+        when = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        payload = {"at": when, "salary": Decimal("70000.50"), "id": uuid.UUID(int=1)}
+        expected = {"at": "Wed, 01 May 2024 12:30:00 GMT", "salary": "70000.50",
+                    "id": "00000000-0000-0000-0000-000000000001"}
+        for name in ("json", "auto"):
+            json_codec.configure({"json_codec": name})
+            with server.app.app_context():
+                self.assertEqual(json.loads(server.app.json.dumps(payload)), expected)
+                self.assertEqual(json.loads(server.app.json.response(payload).data), expected)
+
+    def test_keys_are_sorted_like_flask(self):
+        for name in ("json", "auto"):
+            json_codec.configure({"json_codec": name})
+            with server.app.app_context():
+                self.assertEqual(server.app.json.dumps({"b": 1, "a": {"d": 2, "c": 3}}), '{"a":{"c":3,"d":2},"b":1}')
+                self.assertEqual(server.app.json.response({"b": 1, "a": 2}).data, b'{"a":2,"b":1}')
+            self.assertEqual(json_codec.StaticJSON({"b": 1, "a": 2}).etag, json_codec.StaticJSON({"a": 2, "b": 1}).etag)
+
+    def test_unknown_codec_is_rejected(self):
+        with self.assertRaises(ValueError):
+            json_codec.configure({"json_codec": "msgpack"})
+
+    def test_negotiate_encoding(self):
+        self.assertEqual(json_codec.negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(json_codec.negotiate_encoding("br;q=1.0, gzip;q=0.5"), "gzip")
+        self.assertIsNone(json_codec.negotiate_encoding("gzip;q=0"))
+        self.assertIsNone(json_codec.negotiate_encoding(None))
+        json_codec.configure({"compression": {"enabled": False}})
+        self.assertIsNone(json_codec.negotiate_encoding("gzip"))
+
+    def test_encode_body_compresses_only_large_bodies(self):
+        small = b'{"status":"success"}'
+        self.assertEqual(json_codec.encode_body(small, "gzip"), (small, None))
+        large = json_codec.dumps({"jobs": ["x" * 50] * 100})
+        body, encoding = json_codec.encode_body(large, "gzip")
+        self.assertEqual(encoding, "gzip")
+        self.assertEqual(gzip.decompress(body), large)
+
+    def test_etag_matches(self):
+        self.assertTrue(json_codec.etag_matches('"a", "b"', '"b"'))
+        self.assertTrue(json_codec.etag_matches('W/"b"', '"b"'))
+        self.assertTrue(json_codec.etag_matches('*', '"b"'))
+        self.assertFalse(json_codec.etag_matches('"a"', '"b"'))
+        self.assertFalse(json_codec.etag_matches(None, '"b"'))
+
+    def test_static_json_caches_variants(self):
+        document = json_codec.StaticJSON({"tools": [{"name": "x" * 2000}]})
+        first, encoding = document.encoded("gzip")
+        self.assertEqual(encoding, "gzip")
+        self.assertIs(document.encoded("gzip")[0], first)
+        self.assertEqual(document.encoded(None), (document.body, None))
+
+class TestHttpEncoding(unittest.TestCase):
+    def setUp(self):
+        self.client = server.app.test_client()
+
+    def test_tool_manifest_etag(self):
+        response = self.client.get('/mcp/v1/tools')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertEqual(json.loads(response.data), {"tools": server.list_tools()})
+
+        response = self.client.get('/mcp/v1/tools', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+
+        response = self.client.get('/mcp/v1/tools', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.data)), {"tools": server.list_tools()})
+
+    def test_large_invoke_response_is_compressed(self):
+        job_cache = JobCache()
+        job_cache.put({"job_id": "1", "title": "DevOps Engineer", "company": "Acme",
+                       "full_description": "Long description. " * 200})
+        with patch("server.job_cache", job_cache), \
+                patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()])):
+            response = self.client.post('/mcp/v1/invoke', json={'name': 'get_job_details',
+                                                                'parameters': {'job_id': '1'}},
+                                        headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.data))['job']['company'], 'Acme')
+
+    def test_asgi_tool_manifest_etag(self):
+        app = asgi.MCPAsgiApp(run_startup=False)
+
+        async def get(headers):
+            sent = []
+
+            async def receive():
+                return {"type": "http.request", "body": b""}
+
+            async def send(message):
+                sent.append(message)
+
+            await app({"type": "http", "method": "GET", "path": "/mcp/v1/tools", "headers": headers},
+                      receive, send)
+            return sent
+
+        sent = asyncio.run(get([]))
+        etag = dict(sent[0]["headers"])[b"etag"]
+        self.assertEqual(json.loads(sent[1]["body"]), {"tools": server.list_tools()})
+        sent = asyncio.run(get([(b"if-none-match", etag)]))
+        self.assertEqual(sent[0]["status"], 304)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import requests
+
+# Add parent directory to path to import linkedin_gateway
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from linkedin_gateway import (CircuitBreaker, CircuitOpenError, LinkedInGateway, PoolTimeoutError,
+                              Session, TokenBucket, is_transient)
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"{status_code} error", response=response)
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+        self.assertTrue(all(bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(bucket.try_acquire())
+        self.assertTrue(bucket.acquire(timeout=1.0))
+        self.assertAlmostEqual(clock.now, 0.5)
+
+    def test_acquire_timeout(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=0.1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.try_acquire()
+        self.assertFalse(bucket.acquire(timeout=1.0))
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_recovers(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        clock.now = 10
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+class TestLinkedInGateway(unittest.TestCase):
+    def make_gateway(self, clients, **kwargs):
+        kwargs.setdefault("sleep", lambda seconds: None)
+        return LinkedInGateway.from_clients(clients, requests_per_minute=6000, burst=100, **kwargs)
+
+    def test_call_passes_client(self):
+        client = MagicMock()
+        gateway = self.make_gateway([client])
+        self.assertIs(gateway.call(lambda c, x: (c, x), 1)[0], client)
+        self.assertEqual(gateway.metrics()["calls"], 1)
+
+    def test_retries_with_backoff(self):
+        delays = []
+        gateway = self.make_gateway([MagicMock()], max_retries=3, sleep=delays.append)
+        attempts = []
+
+        def flaky(client):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "ok"
+
+        self.assertEqual(gateway.call(flaky), "ok")
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(all(0 <= delay <= gateway.backoff_base * 2 for delay in delays))
+        self.assertEqual(gateway.metrics()["retries"], 2)
+
+    def test_gives_up_after_max_retries(self):
+        gateway = self.make_gateway([MagicMock()], max_retries=1)
+
+        def broken(client):
+            raise ConnectionError("down")
+
+        with self.assertRaises(ConnectionError):
+            gateway.call(broken)
+        self.assertEqual(gateway.metrics()["errors"], 2)
+
+    def test_non_idempotent_calls_are_not_retried(self):
+        gateway = self.make_gateway([MagicMock()], max_retries=3)
+        attempts = []
+
+        def submit(client, job_id):
+            attempts.append(job_id)
+            raise TimeoutError("read timed out")
+
+        with self.assertRaises(TimeoutError):
+            gateway.call(submit, "1", idempotent=False)
+        self.assertEqual(attempts, ["1"])
+        self.assertEqual(gateway.metrics()["retries"], 0)
+
+    def test_only_transient_errors_are_retried_and_trip_the_breaker(self):
+        gateway = self.make_gateway([MagicMock()], max_retries=2,
+                                    breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+        attempts = []
+
+        def failing(client, error):
+            attempts.append(error)
+            raise error
+
+        for error in (ValueError("bad job id"), http_error(401), http_error(404)):
+            with self.assertRaises(type(error)):
+                gateway.call(failing, error)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(gateway.metrics()["retries"], 0)
+        self.assertEqual(gateway.breaker.state, CircuitBreaker.CLOSED)
+
+        # The 503 opens the breaker, which then rejects the retry
+        with self.assertRaises(CircuitOpenError):
+            gateway.call(failing, http_error(503))
+        self.assertEqual(gateway.metrics()["retries"], 1)
+        self.assertEqual(gateway.breaker.state, CircuitBreaker.OPEN)
+        self.assertTrue(is_transient(http_error(429)))
+        self.assertTrue(is_transient(TimeoutError("read timed out")))
+
+    def test_circuit_breaker_rejects_calls(self):
+        gateway = self.make_gateway([MagicMock()], max_retries=0,
+                                    breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+        with self.assertRaises(ConnectionError):
+            gateway.call(lambda client: (_ for _ in ()).throw(ConnectionError("down")))
+        with self.assertRaises(CircuitOpenError):
+            gateway.call(lambda client: "ok")
+        self.assertEqual(gateway.metrics()["rejected"], 1)
+
+    def test_pool_limits_concurrency(self):
+        gateway = self.make_gateway([MagicMock(), MagicMock()])
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow(client):
+            with lock:
+                active.append(client)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(client)
+
+        threads = [threading.Thread(target=gateway.call, args=(slow,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(gateway.metrics()["idle_sessions"], 2)
+
+    def test_pool_timeout(self):
+        bucket = TokenBucket(rate=0.001, capacity=1)
+        bucket.try_acquire()
+        gateway = LinkedInGateway([Session(MagicMock(), "a", bucket)], acquire_timeout=0.01)
+        with self.assertRaises(PoolTimeoutError):
+            gateway.call(lambda client: "ok")
+
+    def test_from_config_accounts(self):
+        created = []
+
+        def factory(username, password):
+            created.append(username)
+            return MagicMock()
+
+        config = {
+            "linkedin": {"accounts": [{"username": "a", "password": "x"}, {"username": "b", "password": "y"}]},
+            "gateway": {"sessions_per_account": 2},
+        }
+        gateway = LinkedInGateway.from_config(config, factory)
+        self.assertEqual(created, ["a", "a", "b", "b"])
+        self.assertEqual(gateway.pool_size, 4)
+
+if __name__ == '__main__':
+    unittest.main()
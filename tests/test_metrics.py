@@ -0,0 +1,118 @@
+import json
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import metrics
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from linkedin_gateway import LinkedInGateway
+from metrics import TOOL_DURATION, TOOL_REQUESTS, Counter, Histogram, Registry, SlowCallProfiler, ToolTimer
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_and_histogram_render(self):
+        registry = Registry()
+        requests = registry.register(Counter("requests_total", "Requests", ("tool",)))
+        latency = registry.register(Histogram("latency_seconds", "Latency", ("tool",), buckets=(0.1, 1.0)))
+        requests.inc("search_jobs")
+        requests.inc("search_jobs", amount=2)
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value, "search_jobs")
+
+        text = registry.render()
+        self.assertIn('# TYPE requests_total counter', text)
+        self.assertIn('requests_total{tool="search_jobs"} 3', text)
+        self.assertIn('latency_seconds_bucket{tool="search_jobs",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{tool="search_jobs",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{tool="search_jobs",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{tool="search_jobs"} 3', text)
+        self.assertIn('latency_seconds_sum{tool="search_jobs"} 5.55', text)
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        registry.register(Counter("c", "C", ("label",))).inc('a"b\\c')
+        self.assertIn('c{label="a\\"b\\\\c"} 1', registry.render())
+
+    def test_failing_collector_is_skipped(self):
+        registry = Registry()
+        registry.register_collector(lambda: 1 / 0)
+        registry.register_collector(lambda: [("up", "gauge", "Up", [({}, 1)])])
+        self.assertIn("up 1", registry.render())
+
+    def test_tool_timer_records_status(self):
+        before = TOOL_REQUESTS.value("timer_test", "404")
+        with ToolTimer("timer_test") as timer:
+            timer.status = 404
+        self.assertEqual(TOOL_REQUESTS.value("timer_test", "404"), before + 1)
+        self.assertEqual(TOOL_DURATION.count("timer_test"), 1)
+
+    def test_slow_call_profiler_captures_stacks(self):
+        profiler = SlowCallProfiler(threshold=0.02, interval=0.005, tools=("search_jobs",))
+        profiler.start()
+        try:
+            def slow_search_upstream():
+                time.sleep(0.1)
+
+            with ToolTimer("search_jobs", profiler):
+                slow_search_upstream()
+            with ToolTimer("search_jobs", profiler):
+                pass
+            with ToolTimer("get_job_details", profiler):
+                time.sleep(0.05)
+        finally:
+            profiler.stop()
+
+        profiles = profiler.profiles()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]["tool"], "search_jobs")
+        self.assertGreater(profiles[0]["samples"], 0)
+        self.assertIn("slow_search_upstream", profiles[0]["stacks"][0]["stack"])
+
+    def test_nested_calls_keep_separate_profiles(self):
+        profiler = SlowCallProfiler(threshold=0.02, interval=0.005, tools=("search_jobs", "apply_to_job"))
+        profiler.start()
+        try:
+            with ToolTimer("search_jobs", profiler):
+                with ToolTimer("apply_to_job", profiler):
+                    time.sleep(0.06)
+                time.sleep(0.06)
+        finally:
+            profiler.stop()
+
+        profiles = {profile["tool"]: profile for profile in profiler.profiles()}
+        self.assertEqual(sorted(profiles), ["apply_to_job", "search_jobs"])
+        self.assertGreater(profiles["search_jobs"]["duration_s"], profiles["apply_to_job"]["duration_s"])
+        self.assertGreater(profiles["search_jobs"]["samples"], profiles["apply_to_job"]["samples"])
+
+    def test_profiler_disabled_by_default(self):
+        self.assertIsNone(SlowCallProfiler.from_config({}))
+        profiler = SlowCallProfiler.from_config({"profile_slow_calls": {"enabled": True, "threshold_ms": 250}})
+        self.assertEqual(profiler.threshold, 0.25)
+
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_metrics_endpoint_reports_tools_caches_and_upstream(self):
+        client = server.app.test_client()
+        with patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()], burst=10)):
+            server.search_cache.clear()
+            client.post('/mcp/v1/invoke', json={'name': 'search_jobs', 'parameters': {'title': 'DevOps'}})
+            client.post('/mcp/v1/invoke', json={'name': 'search_jobs', 'parameters': {'title': 'DevOps'}})
+            response = client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        text = response.data.decode()
+        self.assertIn('mcp_tool_requests_total{tool="search_jobs",status="200"}', text)
+        self.assertIn('mcp_tool_duration_seconds_bucket{tool="search_jobs",le="+Inf"}', text)
+        self.assertIn('mcp_tool_in_flight{tool="search_jobs"} 0', text)
+        self.assertIn('mcp_upstream_duration_seconds_count{call="search_upstream",outcome="success"}', text)
+        self.assertIn('mcp_cache_hit_ratio{cache="search"}', text)
+        self.assertIn('mcp_gateway_circuit_open 0', text)
+
+    def test_slow_calls_endpoint(self):
+        response = server.app.test_client().get('/metrics/slow_calls')
+        self.assertEqual(json.loads(response.data)["profiles"], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import prefetch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from config_store import ConfigSnapshot
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+from prefetch import PrefetchScheduler, saved_searches
+from search_cache import SearchResultCache
+from search_index import SearchIndex
+
+class TestSavedSearches(unittest.TestCase):
+    def test_expands_titles_and_locations(self):
+        searches = saved_searches({
+            "titles": ["DevOps Engineer", "SRE"],
+            "locations": ["London", "Remote"],
+            "experience_level": "Mid-Senior",
+            "job_type": "Full-time",
+            "remote_only": True,
+        })
+        self.assertEqual(len(searches), 4)
+        self.assertEqual(searches[0], {"title": "DevOps Engineer", "location": "London",
+                                       "experience_level": "Mid-Senior", "job_type": "Full-time",
+                                       "remote": True})
+
+    def test_missing_preferences(self):
+        self.assertEqual(saved_searches(None), [])
+        self.assertEqual(saved_searches({"titles": ["SRE"]}), [{"title": "SRE"}])
+
+class TestPrefetchScheduler(unittest.TestCase):
+    def make_scheduler(self, refresh_search, fetch_details, stale=(), **kwargs):
+        return PrefetchScheduler([{"title": "A"}, {"title": "B"}], refresh_search, fetch_details,
+                                 lambda within: list(stale), **kwargs)
+
+    def test_run_once_fetches_new_and_stale_jobs(self):
+        fetched = []
+        scheduler = self.make_scheduler(lambda parameters: ["1", "2"] if parameters["title"] == "A" else ["2"],
+                                        fetched.append, stale=["2", "9"])
+        summary = scheduler.run_once()
+        self.assertEqual(sorted(fetched), ["1", "2", "9"])
+        self.assertEqual(summary["details_fetched"], 3)
+        status = scheduler.status()
+        self.assertEqual(status["details_prefetched"], 2)
+        self.assertEqual(status["refreshed"], 1)
+        self.assertEqual(status["searches_run"], 2)
+        self.assertEqual({item["job_id"] for item in status["recent"]}, {"1", "2", "9"})
+
+    def test_details_per_run_are_capped(self):
+        fetched = []
+        scheduler = self.make_scheduler(lambda parameters: [parameters["title"] + str(i) for i in range(10)],
+                                        fetched.append, max_details_per_run=5)
+        summary = scheduler.run_once()
+        self.assertEqual(len(fetched), 5)
+        self.assertEqual(summary["details_skipped"], 15)
+
+    def test_errors_are_recorded_and_do_not_stop_the_run(self):
+        def refresh_search(parameters):
+            if parameters["title"] == "A":
+                raise RuntimeError("upstream down")
+            return ["1"]
+
+        fetched = []
+        scheduler = self.make_scheduler(refresh_search, fetched.append)
+        scheduler.run_once()
+        self.assertEqual(fetched, ["1"])
+        self.assertEqual(scheduler.status()["errors"], 1)
+        self.assertIn("upstream down", scheduler.status()["last_error"])
+
+    def test_concurrency_is_bounded(self):
+        active = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def fetch_details(job_id):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+        scheduler = self.make_scheduler(lambda parameters: [parameters["title"] + str(i) for i in range(8)],
+                                        fetch_details, max_concurrency=3)
+        scheduler.run_once()
+        self.assertLessEqual(peak[0], 3)
+
+    def test_next_delay_is_jittered_within_bounds(self):
+        low = self.make_scheduler(list, print, interval=100, jitter=0.2, rand=lambda: 0.0)
+        high = self.make_scheduler(list, print, interval=100, jitter=0.2, rand=lambda: 1.0)
+        self.assertAlmostEqual(low.next_delay(), 80)
+        self.assertAlmostEqual(high.next_delay(), 120)
+
+    def test_result_ttl_covers_the_longest_gap_between_runs(self):
+        scheduler = self.make_scheduler(print, print, interval=900, jitter=0.2)
+        self.assertGreater(scheduler.result_ttl(), 900 * 1.2)
+
+    def test_background_thread_runs_and_stops(self):
+        ran = threading.Event()
+        scheduler = self.make_scheduler(lambda parameters: ran.set() or [], print, interval=0.01)
+        scheduler.start()
+        self.assertTrue(ran.wait(2))
+        scheduler.stop()
+        self.assertFalse(scheduler.status()["enabled"])
+
+class TestServerPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.job_cache = JobCache()
+        self.search_index = SearchIndex()
+        self.job_cache.subscribe(self.search_index)
+        self.patches = [
+            patch("server.job_cache", self.job_cache),
+            patch("server.search_index", self.search_index),
+            patch("server.search_cache", SearchResultCache()),
+            patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()])),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_prefetch_warms_cache_for_interactive_calls(self):
+        missing = server.prefetch_search({"title": "DevOps Engineer"})
+        self.assertEqual(len(missing), 3)
+        for job_id in missing:
+            server.prefetch_details(job_id)
+
+        with patch("server._search_upstream") as search_upstream, \
+                patch("server._job_details_upstream") as details_upstream:
+            payload, status = server.dispatch_tool("get_job_details", {"job_id": missing[0]})
+            self.assertEqual(status, 200)
+            self.assertIn("full_description", payload["job"])
+            details_upstream.assert_not_called()
+            search_upstream.assert_not_called()
+
+        # A later refresh keeps the details already fetched
+        self.assertEqual(server.prefetch_search({"title": "DevOps Engineer"}), [])
+
+    def test_prefetched_results_outlive_the_search_cache_ttl(self):
+        clock = [1000.0]
+        scheduler = PrefetchScheduler([{"title": "DevOps Engineer"}], server.prefetch_search, server.prefetch_details,
+                                      lambda within: [], interval=900, jitter=0.2)
+        with patch("server.search_cache", SearchResultCache(ttl=300, clock=lambda: clock[0])), \
+                patch("server.prefetch_scheduler", scheduler):
+            scheduler.run_once()
+            clock[0] += 900 * 1.2
+            with patch("server._search_upstream") as search_upstream:
+                payload, status = server.dispatch_tool("search_jobs", {"title": "DevOps Engineer"})
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["count"], 3)
+            search_upstream.assert_not_called()
+
+    def test_prefetch_is_opt_in(self):
+        with patch("server.config", ConfigSnapshot({"linkedin": {"username": "user"},
+                                                    "job_preferences": {"titles": ["SRE"]}})), \
+                patch("server.prefetch_scheduler", None):
+            server.initialize_prefetch()
+            self.assertIsNone(server.prefetch_scheduler)
+
+    def test_status_endpoint(self):
+        scheduler = PrefetchScheduler([{"title": "SRE"}], lambda parameters: [], print, lambda within: [])
+        scheduler.run_once()
+        with patch("server.prefetch_scheduler", scheduler):
+            response = server.app.test_client().get("/mcp/v1/prefetch")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["prefetch"]["runs"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
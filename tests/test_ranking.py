@@ -0,0 +1,168 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import ranking
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from config_store import ConfigSnapshot
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+from ranking import RankingIndex, RankingProfile
+from search_cache import SearchResultCache
+from search_index import SearchIndex
+
+NOW = datetime(2024, 6, 1)
+
+def make_job(job_id, title="DevOps Engineer", location="London", days_old=0, **fields):
+    job = {"job_id": job_id, "title": title, "company": f"Company {job_id}", "location": location,
+           "date_posted": (NOW - timedelta(days=days_old)).isoformat()}
+    job.update(fields)
+    return job
+
+def make_profile():
+    return RankingProfile(skills=["Kubernetes", "Terraform", "AWS", "Python"], titles=["DevOps Engineer"],
+                          locations=["London"])
+
+class TestRankingProfile(unittest.TestCase):
+    def test_features(self):
+        profile = make_profile()
+        job = make_job("1", skills_required=["kubernetes", "AWS"],
+                       description_snippet="We use Terraform everywhere")
+        self.assertEqual(profile.matched_skills(job), ["kubernetes", "terraform", "aws"])
+        self.assertEqual(profile.features(job), (0.75, 1.0, 1.0))
+        skills, title, location = profile.features(make_job("2", title="Senior DevOps Engineer", location="Paris"))
+        self.assertEqual((skills, location), (0.0, 0.0))
+        self.assertAlmostEqual(title, 2 / 3)
+
+    def test_remote_only(self):
+        profile = RankingProfile(locations=["London"], remote_only=True)
+        self.assertEqual(profile.features(make_job("1"))[2], 0.0)
+        self.assertEqual(profile.features(make_job("2", location="Remote"))[2], 1.0)
+
+    def test_from_config_falls_back_to_personal_skills(self):
+        profile = RankingProfile.from_config(ConfigSnapshot({
+            "personal_info": {"skills": ["Go"]},
+            "job_preferences": {"titles": ["SRE"], "remote_only": True},
+        }))
+        self.assertEqual(profile.skills, ("go",))
+        self.assertTrue(profile.remote_only)
+
+class TestRankingIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RankingIndex(make_profile(), clock=NOW.timestamp)
+
+    def test_top_k_orders_by_score(self):
+        self.index.add(make_job("weak", title="Accountant", location="Paris"))
+        self.index.add(make_job("strong", skills_required=["Kubernetes", "Terraform", "AWS", "Python"]))
+        self.index.add(make_job("title", skills_required=["Python"]))
+        ranked = self.index.top_k(2)
+        self.assertEqual([job_id for job_id, _, _ in ranked], ["strong", "title"])
+        job_id, score, components = ranked[0]
+        self.assertEqual(components, {"skills": 1.0, "title": 1.0, "recency": 1.0, "location": 1.0})
+        self.assertAlmostEqual(score, 1.0, places=3)
+        self.assertEqual(len(self.index.top_k(10)), 3)
+        self.assertEqual(self.index.top_k(0), [])
+
+    def test_recency_decays_with_half_life(self):
+        index = RankingIndex(RankingProfile(), half_life_days=7, clock=NOW.timestamp)
+        index.add(make_job("old", days_old=14))
+        index.add(make_job("new", days_old=0))
+        index.add(make_job("undated", date_posted=None))
+        ranked = {job_id: components["recency"] for job_id, _, components in index.top_k(3)}
+        self.assertEqual(ranked, {"new": 1.0, "old": 0.25, "undated": 0.0})
+
+    def test_restricted_to_job_ids(self):
+        for i in range(5):
+            self.index.add(make_job(str(i), days_old=i))
+        ranked = self.index.top_k(10, job_ids=["3", "1", "missing"])
+        self.assertEqual([job_id for job_id, _, _ in ranked], ["1", "3"])
+
+    def test_remove_and_reuse_slots(self):
+        for i in range(3):
+            self.index.add(make_job(str(i)))
+        self.index.remove("1")
+        self.index.remove("1")
+        self.assertEqual(len(self.index), 2)
+        self.index.add(make_job("3", skills_required=["AWS"]))
+        self.assertEqual(self.index.top_k(1)[0][0], "3")
+        self.assertEqual(sorted(job_id for job_id, _, _ in self.index.top_k(10)), ["0", "2", "3"])
+
+    def test_grows_past_initial_capacity(self):
+        for i in range(3000):
+            self.index.add(make_job(str(i), days_old=i % 30))
+        self.assertEqual(len(self.index), 3000)
+        self.assertEqual(len(self.index.top_k(3000)), 3000)
+
+    def test_follows_the_job_cache(self):
+        cache = JobCache()
+        cache.put(make_job("1"))
+        cache.subscribe(self.index)
+        cache.put(make_job("2"))
+        self.assertEqual(len(self.index), 2)
+        cache.clear()
+        self.assertEqual(self.index.top_k(10), [])
+
+class TestRankingTools(unittest.TestCase):
+    def setUp(self):
+        self.job_cache = JobCache()
+        self.search_index = SearchIndex()
+        self.ranking_index = RankingIndex(make_profile(), clock=NOW.timestamp)
+        self.job_cache.subscribe(self.search_index)
+        self.job_cache.subscribe(self.ranking_index)
+        self.job_cache.put(make_job("1", title="DevOps Engineer", days_old=30))
+        self.job_cache.put(make_job("2", title="DevOps Engineer", skills_required=["Kubernetes", "AWS"]))
+        self.job_cache.put(make_job("3", title="Data Analyst", location="Paris"))
+        self.patches = [
+            patch("server.job_cache", self.job_cache),
+            patch("server.search_index", self.search_index),
+            patch("server.search_cache", SearchResultCache()),
+            patch("server.ranking_index", self.ranking_index),
+            patch("server._fetch_search_results", return_value=[]),
+            patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()])),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_rank_jobs(self):
+        payload, status = server.dispatch_tool("rank_jobs", {"limit": 2})
+        self.assertEqual(status, 200)
+        self.assertEqual([job["job_id"] for job in payload["jobs"]], ["2", "1"])
+        self.assertEqual(payload["ranked"], 3)
+        self.assertEqual(payload["jobs"][0]["matched_skills"], ["kubernetes", "aws"])
+        self.assertEqual(payload["jobs"][0]["relevance_components"]["skills"], 0.5)
+        self.assertNotIn("full_description", payload["jobs"][0])
+
+        _, status = server.dispatch_tool("rank_jobs", {"limit": 0})
+        self.assertEqual(status, 400)
+
+    def test_search_sorted_by_relevance(self):
+        payload, status = server.dispatch_tool("search_jobs", {"title": "DevOps Engineer", "sort": "relevance"})
+        self.assertEqual(status, 200)
+        self.assertEqual([job["job_id"] for job in payload["jobs"]], ["2", "1"])
+        self.assertGreater(payload["jobs"][0]["relevance"], payload["jobs"][1]["relevance"])
+
+        payload, status = server.dispatch_tool("search_jobs", {"title": "DevOps Engineer"})
+        self.assertNotIn("relevance", payload["jobs"][0])
+
+        _, status = server.dispatch_tool("search_jobs", {"title": "DevOps Engineer", "sort": "salary"})
+        self.assertEqual(status, 400)
+
+    def test_initialize_ranking_reads_config(self):
+        with patch("server.config", ConfigSnapshot({"job_preferences": {"skills": ["Kubernetes"]},
+                                                     "ranking": {"weights": {"skills": 1.0}}})):
+            server.initialize_ranking()
+            self.assertIsNot(server.ranking_index, self.ranking_index)
+            self.assertEqual(server.ranking_index.profile.skills, ("kubernetes",))
+            self.assertEqual(server.ranking_index.weights["skills"], 1.0)
+            self.assertEqual(len(server.ranking_index), 3)
+            self.job_cache.unsubscribe(server.ranking_index)
+
+if __name__ == '__main__':
+    unittest.main()
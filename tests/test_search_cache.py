@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import search_cache
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from search_cache import SearchResultCache, normalize_search_params, search_key
+
+JOBS = [
+    {"job_id": "1", "title": "DevOps Engineer", "experience_level": "Mid-Senior", "job_type": "Full-time", "remote": True},
+    {"job_id": "2", "title": "DevOps Lead", "experience_level": "Director+", "job_type": "Full-time", "remote": False},
+    {"job_id": "3", "title": "DevOps Intern", "experience_level": "Entry", "job_type": "Internship", "remote": True},
+]
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class TestNormalization(unittest.TestCase):
+    def test_equivalent_parameters_share_a_key(self):
+        a = normalize_search_params({"title": "  DevOps   Engineer ", "location": "London, UK"})
+        b = normalize_search_params({"location": "london,united kingdom", "title": "devops engineer", "remote": False})
+        self.assertEqual(search_key(a), search_key(b))
+
+    def test_location_aliases(self):
+        self.assertEqual(normalize_search_params({"location": "NYC"})["location"], "new york")
+        self.assertEqual(normalize_search_params({"location": "WFH"})["location"], "remote")
+
+class TestSearchResultCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SearchResultCache(ttl=60, clock=self.clock)
+
+    def test_exact_hit(self):
+        self.cache.put({"title": "DevOps"}, JOBS)
+        jobs = self.cache.get({"title": "devops "})
+        self.assertEqual([job["job_id"] for job in jobs], ["1", "2", "3"])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_narrower_query_filters_broader_result(self):
+        self.cache.put({"title": "DevOps"}, JOBS)
+        jobs = self.cache.get({"title": "DevOps", "remote": True})
+        self.assertEqual([job["job_id"] for job in jobs], ["1", "3"])
+        jobs = self.cache.get({"title": "DevOps", "remote": True, "experience_level": "entry"})
+        self.assertEqual([job["job_id"] for job in jobs], ["3"])
+        self.assertEqual(self.cache.stats()["filtered_hits"], 2)
+
+    def test_broader_query_is_not_served_from_narrower(self):
+        self.cache.put({"title": "DevOps", "remote": True}, JOBS[:1])
+        self.assertIsNone(self.cache.get({"title": "DevOps"}))
+
+    def test_ttl_expiry(self):
+        self.cache.put({"title": "DevOps"}, JOBS)
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get({"title": "DevOps"}))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_results_are_copies(self):
+        self.cache.put({"title": "DevOps"}, JOBS)
+        self.cache.get({"title": "DevOps"})[0]["full_description"] = "mutated"
+        self.assertNotIn("full_description", self.cache.get({"title": "DevOps"})[0])
+
+if __name__ == '__main__':
+    unittest.main()
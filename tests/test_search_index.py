@@ -0,0 +1,121 @@
+import time
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent directory to path to import search_index
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from job_cache import JobCache
+from search_index import MAX_QUERY_TOKENS, SearchIndex, _Bitset, iter_bits, iter_bits_descending, tokenize
+
+JOBS = [
+    {"job_id": "1", "title": "Senior DevOps Engineer", "company": "Tech Innovations Ltd",
+     "location": "London, United Kingdom", "date_posted": "2025-07-15",
+     "experience_level": "Mid-Senior", "job_type": "Full-time", "remote": True},
+    {"job_id": "2", "title": "DevOps Team Lead", "company": "Global Solutions",
+     "location": "London, UK", "date_posted": "2025-07-17",
+     "experience_level": "Director+", "job_type": "Full-time", "remote": False},
+    {"job_id": "3", "title": "Cloud Engineer", "company": "Fintech Startup", "location": "Remote",
+     "description_snippet": "Kubernetes and DevOps practices", "date_posted": "2025-07-18",
+     "experience_level": "Entry", "job_type": "Contract", "remote": True},
+]
+
+def ids(jobs):
+    return [job["job_id"] for job in jobs]
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        for job in JOBS:
+            self.index.add(job)
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("C++ / CI-CD Engineer"), ["c++", "ci", "cd", "engineer"])
+
+    def test_iter_bits_descending(self):
+        self.assertEqual(list(iter_bits_descending(0b101001)), [5, 3, 0])
+        self.assertEqual(list(iter_bits_descending(0)), [])
+        self.assertEqual(list(iter_bits((1 << 700) | 0b101001)), [0, 3, 5, 700])
+        self.assertEqual(list(iter_bits(0)), [])
+
+    def test_bitset_promotes_to_bitmap(self):
+        bitset = _Bitset()
+        members = set(range(0, 400, 7))
+        for doc in members:
+            bitset.add(doc)
+        bitset.add(7)
+        bitset.discard(14)
+        bitset.discard(15)
+        members.discard(14)
+        self.assertEqual(bitset.count, len(members))
+        self.assertEqual(bitset.to_int(), sum(1 << doc for doc in members))
+
+    def test_ranked_title_search(self):
+        self.assertEqual(ids(self.index.search(title="devops engineer")), ["1", "3", "2"])
+        self.assertEqual(ids(self.index.search(title="devops", limit=2)), ["2", "1"])
+
+    def test_facet_and_location_filters(self):
+        self.assertEqual(ids(self.index.search(title="devops", remote=True)), ["1", "3"])
+        self.assertEqual(ids(self.index.search(title="devops", location="london, united kingdom")), ["2", "1"])
+        self.assertEqual(ids(self.index.search(experience_level="entry")), ["3"])
+        self.assertEqual(ids(self.index.search(job_type="Full-time", remote=True)), ["1"])
+
+    def test_no_title_orders_by_date(self):
+        self.assertEqual(ids(self.index.search()), ["3", "2", "1"])
+
+    def test_incremental_update_and_remove(self):
+        self.index.add(dict(JOBS[2], title="Platform Engineer", description_snippet=""))
+        self.assertEqual(ids(self.index.search(title="devops")), ["2", "1"])
+        self.index.remove("1")
+        self.assertEqual(ids(self.index.search(title="devops")), ["2"])
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.facet_counts("remote"), {True: 1, False: 1})
+
+    def test_follows_job_cache(self):
+        index = SearchIndex()
+        cache = JobCache(max_entries=2)
+        cache.put(JOBS[0])
+        cache.subscribe(index)
+        cache.put(JOBS[1])
+        cache.put(JOBS[2])
+        self.assertNotIn("1", index)
+        self.assertEqual(ids(index.search(title="devops")), ["2", "3"])
+        cache.clear()
+        self.assertEqual(len(index), 0)
+
+    def test_compaction_keeps_results(self):
+        index = SearchIndex()
+        for i in range(3000):
+            index.add({"job_id": str(i), "title": f"Engineer {i}"})
+        for i in range(2000):
+            index.remove(str(i))
+        self.assertEqual(len(index), 1000)
+        self.assertLess(len(index._docs), 3000)
+        self.assertEqual(ids(index.search(title="2500")), ["2500"])
+
+    def test_long_titles_stay_fast(self):
+        # Every token has several score tiers; combining tiers per token used to grow exponentially
+        words = ["senior", "devops", "engineer", "cloud", "platform", "kubernetes", "aws", "terraform",
+                 "python", "linux", "reliability", "site", "remote", "lead"]
+        index = SearchIndex()
+        for i in range(5000):
+            index.add({"job_id": str(i), "title": " ".join(words[(i + k) % len(words)] for k in range(3)),
+                       "company": words[i % 7], "location": words[i % 5],
+                       "description_snippet": " ".join(words[(i * k) % len(words)] for k in range(1, 6)),
+                       "date_posted": f"2025-07-{i % 28 + 1:02d}"})
+        title = " ".join(words)
+        start = time.perf_counter()
+        results = index.search(title=title, limit=10)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(len(results), 10)
+        # Scoring document by document ranks exactly as grouping by score does
+        with patch("search_index.MAX_SCORE_GROUPS", 0):
+            self.assertEqual(ids(index.search(title=title, limit=10)), ids(results))
+        # Tokens past MAX_QUERY_TOKENS are ignored
+        filler = [f"unknown{k}" for k in range(MAX_QUERY_TOKENS)]
+        self.assertEqual(index.search(title=" ".join(filler + ["devops"])), [])
+        self.assertEqual(len(index.search(title=" ".join(filler[1:] + ["devops"]))), 10)
+
+if __name__ == '__main__':
+    unittest.main()
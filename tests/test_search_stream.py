@@ -0,0 +1,138 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import search_stream
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import asgi
+import server
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+from search_stream import (InvalidSearchCursor, decode_search_cursor, encode_search_cursor, iter_pages,
+                           resolve_search)
+
+def make_jobs(count):
+    return [{"job_id": str(i), "title": "DevOps Engineer", "company": f"Company {i}",
+             "full_description": "long text"} for i in range(count)]
+
+class TestSearchStream(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_search_cursor({"title": " DevOps  Engineer", "location": "UK"}, 40)
+        parameters, start = decode_search_cursor(cursor)
+        self.assertEqual(start, 40)
+        self.assertEqual(parameters["title"], "devops engineer")
+        self.assertEqual(parameters["location"], "united kingdom")
+        with self.assertRaises(InvalidSearchCursor):
+            decode_search_cursor("not-a-cursor")
+        for cursor in (42, ["a"], None):
+            with self.assertRaises(InvalidSearchCursor):
+                decode_search_cursor(cursor)
+
+    def test_resolve_search(self):
+        cursor = encode_search_cursor({"title": "SRE"}, 5)
+        self.assertEqual(resolve_search({"title": "SRE"}), ({"title": "SRE"}, 0))
+        self.assertEqual(resolve_search({"cursor": cursor})[1], 5)
+        self.assertEqual(resolve_search({"title": "sre", "cursor": cursor})[1], 5)
+        with self.assertRaises(InvalidSearchCursor):
+            resolve_search({"title": "Data Engineer", "cursor": cursor})
+
+    def test_iter_pages_fetches_lazily_and_stops_on_short_page(self):
+        jobs = make_jobs(7)
+        calls = []
+
+        def fetch_page(parameters, start, count):
+            calls.append((start, count))
+            return jobs[start:start + count]
+
+        pages = iter_pages(fetch_page, {}, limit=100, page_size=3)
+        self.assertEqual(next(pages), (jobs[0], 1))
+        self.assertEqual(calls, [(0, 3)])
+        self.assertEqual([job["job_id"] for job, _ in pages], [str(i) for i in range(1, 7)])
+        self.assertEqual(calls, [(0, 3), (3, 3), (6, 3)])
+
+    def test_iter_pages_respects_limit(self):
+        jobs = make_jobs(10)
+        results = list(iter_pages(lambda parameters, start, count: jobs[start:start + count], {},
+                                  start=2, limit=5, page_size=4))
+        self.assertEqual([job["job_id"] for job, _ in results], ["2", "3", "4", "5", "6"])
+        self.assertEqual(results[-1][1], 7)
+
+    def test_iter_pages_rejects_empty_pages(self):
+        for page_size in (0, -1):
+            with self.assertRaises(ValueError):
+                iter_pages(lambda parameters, start, count: [], {}, page_size=page_size)
+
+class TestStreamingSearchJobs(unittest.TestCase):
+    def setUp(self):
+        self.jobs = make_jobs(60)
+        self.patches = [
+            patch("server.job_cache", JobCache()),
+            patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()], burst=100)),
+            patch("server._search_upstream", lambda client, parameters: self.jobs),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = server.app.test_client()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def stream(self, parameters):
+        response = self.client.post('/mcp/v1/invoke',
+                                    json={'name': 'search_jobs', 'parameters': parameters, 'stream': True})
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        return [json.loads(line) for line in response.data.decode().splitlines()]
+
+    def test_stream_and_resume(self):
+        items = self.stream({'title': 'DevOps Engineer', 'limit': 50})
+        self.assertEqual(len(items), 51)
+        self.assertEqual(items[0]['type'], 'job')
+        self.assertNotIn('full_description', items[0]['job'])
+        self.assertEqual(items[-1]['type'], 'end')
+        self.assertEqual(items[-1]['count'], 50)
+        self.assertIn('49', server.job_cache)
+
+        resumed = self.stream({'cursor': items[-1]['next_cursor']})
+        self.assertEqual([item['job']['job_id'] for item in resumed[:-1]], [str(i) for i in range(50, 60)])
+        self.assertIsNone(resumed[-1]['next_cursor'])
+
+        # Each job's cursor resumes right after it
+        resumed = self.stream({'cursor': items[9]['cursor'], 'limit': 1})
+        self.assertEqual(resumed[0]['job']['job_id'], '10')
+
+    def test_stream_errors_are_reported_in_band(self):
+        items = self.stream({'title': 'DevOps Engineer', 'cursor': 'bogus'})
+        self.assertEqual(items, [{'type': 'error', 'error': 'Invalid cursor: bogus', 'status': 'error'}])
+
+        items = self.stream({'cursor': 42})
+        self.assertEqual(items, [{'type': 'error', 'error': 'Invalid cursor: 42', 'status': 'error'}])
+
+        response = self.client.post('/mcp/v1/invoke',
+                                    json={'name': 'apply_to_job', 'parameters': {}, 'stream': True})
+        self.assertEqual(response.status_code, 400)
+
+    def test_asgi_stream(self):
+        app = asgi.MCPAsgiApp(max_workers=2, run_startup=False)
+        body = json.dumps({'name': 'search_jobs', 'parameters': {'title': 'DevOps', 'limit': 30},
+                           'stream': True}).encode()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(app({"type": "http", "method": "POST", "path": "/mcp/v1/invoke"}, receive, send))
+        self.assertEqual(sent[0]["status"], 200)
+        chunks = [m["body"] for m in sent[1:] if m["body"]]
+        self.assertEqual(len(chunks), 31)
+        self.assertEqual(json.loads(chunks[-1])["count"], 30)
+
+if __name__ == '__main__':
+    unittest.main()
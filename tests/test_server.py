@@ -1,4 +1,6 @@
 import json
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
@@ -7,6 +9,8 @@ import os
 # Add parent directory to path to import server
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import server
+from history_store import HistoryStore
+from linkedin_gateway import LinkedInGateway
 
 class TestLinkedInJobServer(unittest.TestCase):
     def setUp(self):
@@ -20,6 +24,14 @@ class TestLinkedInJobServer(unittest.TestCase):
         self.assertIn('tools', data)
         self.assertTrue(len(data['tools']) > 0)
         
+    def test_invoke_requires_a_json_object(self):
+        for body in ([], "x", 1):
+            response = self.client.post('/mcp/v1/invoke', json=body)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(json.loads(response.data)['status'], 'error')
+        response = self.client.post('/mcp/v1/invoke', data='{not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        
     @patch('server.linkedin_client')
     def test_search_jobs(self, mock_linkedin):
         # Mock the LinkedIn client
@@ -58,17 +70,107 @@ class TestLinkedInJobServer(unittest.TestCase):
         self.assertIn('status', data)
         self.assertEqual(data['status'], 'success')
         
+    @patch('server._search_upstream')
+    def test_search_jobs_served_from_result_cache(self, mock_upstream):
+        mock_upstream.return_value = [
+            {"job_id": "1", "title": "DevOps Engineer", "company": "A", "remote": True},
+            {"job_id": "2", "title": "DevOps Engineer", "company": "B", "remote": False}
+        ]
+        server.linkedin_client = LinkedInGateway.from_clients([MagicMock()])
+        server.search_cache.clear()
+        server.job_cache.clear()
+        
+        for parameters in ({'title': 'DevOps Engineer'}, {'title': ' devops engineer'}):
+            response = self.client.post('/mcp/v1/invoke',
+                                       json={'name': 'search_jobs', 'parameters': parameters})
+            self.assertEqual(json.loads(response.data)['count'], 2)
+        
+        response = self.client.post('/mcp/v1/invoke',
+                                   json={'name': 'search_jobs',
+                                         'parameters': {'title': 'DevOps Engineer', 'remote': True}})
+        data = json.loads(response.data)
+        self.assertEqual([job['job_id'] for job in data['jobs']], ['1'])
+        self.assertEqual(mock_upstream.call_count, 1)
+        
+    def test_apply_to_job_rejects_duplicates(self):
+        server.application_history = HistoryStore()
+        server.linkedin_client = LinkedInGateway.from_clients([MagicMock()], burst=10)
+        server.job_cache.put({"job_id": "j1", "title": "DevOps Engineer", "company": "Acme"})
+        server.job_cache.put({"job_id": "j2", "title": "DevOps Engineer", "company": "Acme Ltd"})
+        
+        response = self.client.post('/mcp/v1/invoke', json={'name': 'apply_to_job', 'parameters': {'job_id': 'j1'}})
+        self.assertEqual(response.status_code, 200)
+        
+        for job_id in ('j1', 'j2'):
+            response = self.client.post('/mcp/v1/invoke',
+                                       json={'name': 'apply_to_job', 'parameters': {'job_id': job_id}})
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(json.loads(response.data)['duplicate_of'], 'j1')
+        
+        response = self.client.post('/mcp/v1/invoke',
+                                   json={'name': 'apply_to_job',
+                                         'parameters': {'job_id': 'j2', 'allow_duplicate': True}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(server.application_history), 2)
+        
+    def test_concurrent_applies_reach_linkedin_once(self):
+        calls = []
+        started = threading.Event()
+
+        def slow_apply(client, job_id, cover_letter, phone_number):
+            calls.append(job_id)
+            started.set()
+            time.sleep(0.2)
+
+        server.job_cache.put({"job_id": "c1", "title": "SRE", "company": "Initech"})
+        server.job_cache.put({"job_id": "c2", "title": "SRE", "company": "Initech Ltd"})
+        statuses = []
+        with patch("server.application_history", HistoryStore()), \
+                patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock(), MagicMock()], burst=10)), \
+                patch("server._apply_upstream", side_effect=slow_apply):
+            first = threading.Thread(
+                target=lambda: statuses.append(server.dispatch_tool("apply_to_job", {"job_id": "c1"})[1]))
+            first.start()
+            started.wait(5)
+            for job_id in ("c1", "c2"):
+                payload, status = server.dispatch_tool("apply_to_job", {"job_id": job_id})
+                statuses.append(status)
+                self.assertEqual(payload["reason"], "application in progress")
+            first.join()
+        self.assertEqual(sorted(statuses), [200, 409, 409])
+        self.assertEqual(calls, ["c1"])
+
+    def test_failed_apply_releases_the_job(self):
+        server.job_cache.put({"job_id": "f1", "title": "SRE", "company": "Hooli"})
+        with patch("server.application_history", HistoryStore()), \
+                patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()], burst=10)):
+            with patch("server._apply_upstream", side_effect=RuntimeError("LinkedIn is down")) as upstream:
+                self.assertEqual(server.dispatch_tool("apply_to_job", {"job_id": "f1"})[1], 500)
+            # A failed submission may have reached LinkedIn, so it is not retried
+            self.assertEqual(upstream.call_count, 1)
+            self.assertEqual(server.dispatch_tool("apply_to_job", {"job_id": "f1"})[1], 200)
+        
+    def test_get_job_details_fetches_once_through_gateway(self):
+        server.linkedin_client = LinkedInGateway.from_clients([MagicMock()])
+        server.job_cache.put({"job_id": "d1", "title": "DevOps Engineer", "company": "Acme"})
+        
+        for _ in range(2):
+            response = self.client.post('/mcp/v1/invoke',
+                                       json={'name': 'get_job_details', 'parameters': {'job_id': 'd1'}})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('skills_required', json.loads(response.data)['job'])
+        self.assertEqual(server.linkedin_client.metrics()['calls'], 1)
+        
     def test_get_application_history(self):
         # Set up some test data
-        server.application_history = [
-            {
-                "job_id": "123456789",
-                "job_title": "DevOps Engineer",
-                "company": "Test Company",
-                "applied_at": "2025-07-19T10:00:00",
-                "status": "applied"
-            }
-        ]
+        server.application_history = HistoryStore()
+        server.application_history.add({
+            "job_id": "123456789",
+            "job_title": "DevOps Engineer",
+            "company": "Test Company",
+            "applied_at": "2025-07-19T10:00:00",
+            "status": "applied"
+        })
         
         # Make the request
         response = self.client.post('/mcp/v1/invoke',
@@ -84,5 +186,45 @@ class TestLinkedInJobServer(unittest.TestCase):
         self.assertEqual(len(data['applications']), 1)
         self.assertEqual(data['applications'][0]['job_id'], "123456789")
         
+    def test_get_application_history_pagination_and_filters(self):
+        server.application_history = HistoryStore()
+        for i in range(5):
+            server.application_history.add({
+                "job_id": str(i),
+                "job_title": "DevOps Engineer",
+                "company": "Acme" if i % 2 == 0 else "Globex",
+                "applied_at": f"2025-07-1{i}T10:00:00",
+                "status": "applied"
+            })
+        
+        response = self.client.post('/mcp/v1/invoke',
+                                   json={'name': 'get_application_history', 'parameters': {'limit': 2}})
+        data = json.loads(response.data)
+        self.assertEqual([a['job_id'] for a in data['applications']], ['4', '3'])
+        self.assertEqual(data['total'], 5)
+        
+        response = self.client.post('/mcp/v1/invoke',
+                                   json={'name': 'get_application_history',
+                                         'parameters': {'limit': 2, 'cursor': data['next_cursor']}})
+        data = json.loads(response.data)
+        self.assertEqual([a['job_id'] for a in data['applications']], ['2', '1'])
+        
+        response = self.client.post('/mcp/v1/invoke',
+                                   json={'name': 'get_application_history',
+                                         'parameters': {'company': 'acme', 'since': '2025-07-11'}})
+        data = json.loads(response.data)
+        self.assertEqual([a['job_id'] for a in data['applications']], ['4', '2'])
+        self.assertIsNone(data['next_cursor'])
+        
+        response = self.client.post('/mcp/v1/invoke',
+                                   json={'name': 'get_application_history', 'parameters': {'cursor': 'garbage'}})
+        self.assertEqual(response.status_code, 400)
+        
+        for name in ('since', 'until', 'company', 'status'):
+            response = self.client.post('/mcp/v1/invoke',
+                                       json={'name': 'get_application_history', 'parameters': {name: 20250711}})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(json.loads(response.data)['error'], f'{name} must be a string')
+        
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,176 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import sys
+
+import requests
+
+# Add parent directory to path to import session_cache
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from requests.cookies import RequestsCookieJar
+from linkedin_gateway import LinkedInGateway
+from session_cache import SessionAuthenticator, SessionCache, SessionRefresher
+
+NOW = 1_000_000.0
+
+
+def session_cookies(expires=NOW + 86400):
+    jar = RequestsCookieJar()
+    jar.set("JSESSIONID", '"ajax:123"', domain=".www.linkedin.com", path="/", expires=expires)
+    jar.set("li_at", "token", domain=".www.linkedin.com", path="/", expires=expires)
+    return jar
+
+
+class FakeLinkedin:
+    """Stands in for linkedin_api.Linkedin and counts full logins"""
+
+    logins = 0
+
+    def __init__(self, username, password, cookies=None, refresh_cookies=False):
+        self.client = MagicMock()
+        if cookies is None:
+            FakeLinkedin.logins += 1
+            cookies = session_cookies()
+        self.client.session.cookies = cookies
+
+
+class TestSessionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "sessions", "linkedin_sessions.json")
+        self.clock = [NOW]
+        self.cache = SessionCache(self.path, max_age=3600, clock=lambda: self.clock[0])
+        FakeLinkedin.logins = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_and_permissions(self):
+        self.cache.save("user@example.com", session_cookies())
+        jar = self.cache.load("user@example.com")
+        self.assertEqual(jar.get("li_at"), "token")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        with open(self.path) as file:
+            self.assertNotIn("user@example.com", file.read())
+
+    def test_expired_or_incomplete_sessions_are_not_loaded(self):
+        self.cache.save("expired", session_cookies(expires=NOW + 10))
+        incomplete = RequestsCookieJar()
+        incomplete.set("JSESSIONID", "x", expires=NOW + 86400)
+        self.cache.save("incomplete", incomplete)
+        self.cache.save("old", session_cookies())
+
+        self.clock[0] = NOW + 60
+        self.assertIsNone(self.cache.load("expired"))
+        self.assertIsNone(self.cache.load("incomplete"))
+        self.assertIsNotNone(self.cache.load("old"))
+        self.clock[0] = NOW + 3601
+        self.assertIsNone(self.cache.load("old"))
+        self.assertIsNone(self.cache.load("missing"))
+
+    def test_world_readable_file_is_ignored(self):
+        self.cache.save("user", session_cookies())
+        os.chmod(self.path, 0o644)
+        self.assertIsNone(self.cache.load("user"))
+
+    def test_authenticator_logs_in_once_and_reuses_cache(self):
+        authenticator = SessionAuthenticator(self.cache, FakeLinkedin)
+        authenticator("user", "secret")
+        self.assertEqual(FakeLinkedin.logins, 1)
+
+        restarted = SessionAuthenticator(SessionCache(self.path, clock=lambda: self.clock[0]), FakeLinkedin)
+        client = restarted("user", "secret")
+        self.assertEqual(FakeLinkedin.logins, 1)
+        self.assertEqual(restarted.reused, 1)
+        self.assertEqual(client.client.session.cookies.get("li_at"), "token")
+
+    def test_rejected_cached_session_falls_back_to_login(self):
+        self.cache.save("user", session_cookies())
+
+        def factory(username, password, cookies=None, refresh_cookies=False):
+            if cookies is not None:
+                raise RuntimeError("session revoked")
+            return FakeLinkedin(username, password)
+
+        SessionAuthenticator(self.cache, factory)("user", "secret")
+        self.assertEqual(FakeLinkedin.logins, 1)
+
+    def test_gateway_from_config_uses_cached_sessions(self):
+        config = {"linkedin": {"username": "user", "password": "secret"},
+                  "gateway": {"sessions_per_account": 3}}
+        LinkedInGateway.from_config(config, SessionAuthenticator(self.cache, FakeLinkedin))
+        LinkedInGateway.from_config(config, SessionAuthenticator(self.cache, FakeLinkedin))
+        self.assertEqual(FakeLinkedin.logins, 1)
+
+    def test_rejected_session_is_invalidated_and_replaced_once(self):
+        authenticator = SessionAuthenticator(self.cache, FakeLinkedin)
+        gateway = LinkedInGateway.from_config(
+            {"linkedin": {"username": "user", "password": "secret"}, "gateway": {"sessions_per_account": 2}},
+            authenticator, reauthenticate=authenticator.reauthenticate)
+        revoked = gateway.sessions[0].client
+        # The cached cookies look valid, but LinkedIn has logged the session out
+        self.assertIsNotNone(self.cache.load("user"))
+        self.assertEqual(FakeLinkedin.logins, 1)
+
+        def unauthorized():
+            response = requests.Response()
+            response.status_code = 401
+            return requests.HTTPError("401 Unauthorized", response=response)
+
+        def search(client):
+            if client is revoked:
+                raise unauthorized()
+            return "ok"
+
+        self.assertEqual(gateway.call(search), "ok")
+        self.assertEqual(FakeLinkedin.logins, 2)
+        self.assertTrue(all(session.client is not revoked for session in gateway.sessions))
+        self.assertEqual(gateway.call(search), "ok")
+        self.assertEqual(FakeLinkedin.logins, 2)
+
+        # A session that is rejected again after logging in is not retried in a loop
+        with self.assertRaises(requests.HTTPError):
+            gateway.call(lambda client: (_ for _ in ()).throw(unauthorized()))
+        self.assertEqual(FakeLinkedin.logins, 3)
+
+    def test_refresher_swaps_clients_of_expiring_sessions(self):
+        authenticator = SessionAuthenticator(self.cache, FakeLinkedin)
+        gateway = LinkedInGateway.from_config(
+            {"linkedin": {"username": "user", "password": "secret"}, "gateway": {"sessions_per_account": 2}},
+            authenticator)
+        old_clients = [session.client for session in gateway.sessions]
+        refresher = SessionRefresher(gateway, authenticator, margin=600, clock=lambda: self.clock[0])
+
+        self.assertEqual(refresher.refresh_due(), 0)
+        self.clock[0] = NOW + 3300
+        self.assertEqual(refresher.refresh_due(), 1)
+        self.assertEqual(FakeLinkedin.logins, 2)
+        new_clients = [session.client for session in gateway.sessions]
+        self.assertTrue(all(new is not old for new, old in zip(new_clients, old_clients)))
+        self.assertIs(new_clients[0], new_clients[1])
+
+    def test_refresher_backs_off_sessions_without_an_expiry(self):
+        def factory(username, password, cookies=None, refresh_cookies=False):
+            client = FakeLinkedin(username, password, cookies=cookies)
+            client.client.session.cookies = RequestsCookieJar()
+            return client
+
+        authenticator = SessionAuthenticator(self.cache, factory)
+        gateway = LinkedInGateway.from_config(
+            {"linkedin": {"username": "user", "password": "secret"}}, authenticator)
+        refresher = SessionRefresher(gateway, authenticator, margin=600, clock=lambda: self.clock[0])
+        self.assertIsNone(self.cache.expires_at("user"))
+
+        self.assertEqual(refresher.refresh_due(), 0)
+        self.clock[0] = NOW + 2000
+        self.assertEqual(refresher.refresh_due(), 0)
+        self.clock[0] = NOW + 3100
+        self.assertEqual(refresher.refresh_due(), 1)
+        self.assertEqual(refresher.refresh_due(), 0)
+        self.assertEqual(FakeLinkedin.logins, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
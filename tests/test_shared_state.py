@@ -0,0 +1,175 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+
+# Add parent directory to path to import shared_state
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from history_store import DuplicateApplication, HistoryStore
+from job_cache import JobCache
+from linkedin_gateway import LinkedInGateway
+from search_cache import SearchResultCache
+from search_index import SearchIndex
+from shared_state import LocalBackend, SQLiteBackend, SQLiteJobStore, backend_from_config
+
+WORKERS = 4
+JOBS_PER_WORKER = 10
+
+def make_job(job_id, **fields):
+    job = {"job_id": job_id, "title": f"DevOps Engineer {job_id}", "company": f"Company {job_id}",
+           "location": "London"}
+    job.update(fields)
+    return job
+
+def worker(index, directory, barrier, results):
+    """One server process: cache its own jobs, then apply to every worker's jobs"""
+    backend = SQLiteBackend(os.path.join(directory, "state.db"))
+    cache = JobCache(shared=backend.job_store())
+    history = backend.open_history(os.path.join(directory, "history.db"))
+    for i in range(JOBS_PER_WORKER):
+        cache.put(make_job(f"{index}-{i}"))
+    barrier.wait()
+    found = applied = 0
+    for other in range(WORKERS):
+        for i in range(JOBS_PER_WORKER):
+            job = cache.get(f"{other}-{i}")
+            if job is None:
+                continue
+            found += 1
+            try:
+                history.add({"job_id": job["job_id"], "job_title": job["title"], "company": job["company"],
+                             "applied_at": "2024-01-01T00:00:00", "status": "applied"}, allow_duplicate=False)
+                applied += 1
+            except DuplicateApplication:
+                pass
+    results.put((index, found, applied, len(history)))
+
+class TestSQLiteJobStore(unittest.TestCase):
+    def test_put_get_and_expiry(self):
+        now = [1000.0]
+        store = SQLiteJobStore(":memory:", clock=lambda: now[0])
+        store.put_job(make_job("1", skills_required=["aws"]), expires_at=1100)
+        job, expires_at = store.get_job("1")
+        self.assertEqual(job["skills_required"], ["aws"])
+        self.assertEqual(expires_at, 1100)
+        self.assertIsNone(store.get_job("2"))
+        now[0] = 1200.0
+        self.assertIsNone(store.get_job("1"))
+        self.assertEqual(store.purge_expired(), 1)
+        self.assertEqual(len(store), 0)
+
+    def test_puts_purge_expired_rows(self):
+        now = [1000.0]
+        store = SQLiteJobStore(":memory:", clock=lambda: now[0], purge_interval=60)
+        for i in range(5):
+            store.put_job(make_job(str(i)), expires_at=1030)
+        now[0] = 1040.0
+        store.put_job(make_job("live"), expires_at=2000)
+        self.assertEqual(len(store), 6)
+        now[0] = 1061.0
+        store.put_job(make_job("later"), expires_at=2000)
+        self.assertEqual(len(store), 2)
+        self.assertIsNotNone(store.get_job("live"))
+
+class TestSharedBackends(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.backend = SQLiteBackend(os.path.join(self.tmp.name, "state.db"))
+        self.history_path = os.path.join(self.tmp.name, "history.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_backend_from_config(self):
+        self.assertIsInstance(backend_from_config(None), LocalBackend)
+        self.assertIsNone(LocalBackend().job_store())
+        self.assertEqual(backend_from_config({"backend": "sqlite", "path": "x.db"}).path, "x.db")
+        with self.assertRaises(ValueError):
+            backend_from_config({"backend": "redis"})
+        with self.assertRaises(ValueError):
+            self.backend.open_history(":memory:")
+
+    def test_jobs_are_visible_across_caches(self):
+        first = JobCache(shared=self.backend.job_store())
+        second = JobCache(shared=self.backend.job_store())
+        first.put(make_job("1", full_description="Build pipelines"))
+        self.assertNotIn("1", second)
+        job = second.get("1")
+        self.assertEqual(job["full_description"], "Build pipelines")
+        self.assertIn("1", second)
+        self.assertEqual(second.stats()["shared_hits"], 1)
+        self.assertIsNone(second.get("missing"))
+        self.assertEqual(second.stats()["misses"], 1)
+
+        # Details fetched later in one worker reach the others
+        record = first.get("1")
+        record.update({"salary_range": "£100,000"})
+        first.put(record)
+        third = JobCache(shared=self.backend.job_store())
+        self.assertEqual(third.peek("1")["salary_range"], "£100,000")
+
+    def test_search_keeps_details_fetched_by_another_worker(self):
+        first = JobCache(shared=self.backend.job_store())
+        second = JobCache(shared=self.backend.job_store())
+        summary = server._search_upstream(MagicMock(), {})[0]
+        first.put(dict(summary, full_description="Build pipelines"))
+        index = SearchIndex()
+        second.subscribe(index)
+        with patch("server.job_cache", second), patch("server.search_index", index), \
+                patch("server.search_cache", SearchResultCache()), \
+                patch("server.linkedin_client", LinkedInGateway.from_clients([MagicMock()])):
+            _, status = server.dispatch_tool("search_jobs", {"title": "DevOps"})
+        self.assertEqual(status, 200)
+        third = JobCache(shared=self.backend.job_store())
+        self.assertEqual(third.peek(summary["job_id"])["full_description"], "Build pipelines")
+
+    def test_history_duplicates_are_detected_across_stores(self):
+        first = self.backend.open_history(self.history_path)
+        second = self.backend.open_history(self.history_path)
+        application = {"job_id": "1", "job_title": "SRE", "company": "Acme", "applied_at": "2024-01-01",
+                       "status": "applied"}
+        first.add(application, allow_duplicate=False)
+        self.assertEqual(second.find_duplicate("1"), ("1", "job_id"))
+        with self.assertRaises(DuplicateApplication):
+            second.add(dict(application, job_id="2"), allow_duplicate=False)
+        self.assertEqual(len(second), 1)
+        second.add(dict(application, job_id="3", company="Globex"), allow_duplicate=False)
+        self.assertEqual(len(first), 2)
+
+    def test_unshared_history_is_unchanged(self):
+        store = HistoryStore(self.history_path)
+        store.add({"job_id": "1", "applied_at": "2024-01-01", "status": "applied"})
+        self.assertFalse(store.shared)
+        self.assertEqual(len(HistoryStore(self.history_path)), 1)
+
+class TestMultipleWorkers(unittest.TestCase):
+    def test_workers_share_jobs_and_history(self):
+        context = multiprocessing.get_context("fork")
+        with tempfile.TemporaryDirectory() as directory:
+            barrier = context.Barrier(WORKERS)
+            results = context.Queue()
+            processes = [context.Process(target=worker, args=(i, directory, barrier, results))
+                         for i in range(WORKERS)]
+            for process in processes:
+                process.start()
+            outcomes = [results.get(timeout=60) for _ in processes]
+            for process in processes:
+                process.join(timeout=60)
+                self.assertEqual(process.exitcode, 0)
+
+            total_jobs = WORKERS * JOBS_PER_WORKER
+            # Every worker found every job, whichever worker cached it
+            self.assertEqual([found for _, found, _, _ in outcomes], [total_jobs] * WORKERS)
+            # Each job was applied to exactly once across all workers
+            self.assertEqual(sum(applied for _, _, applied, _ in outcomes), total_jobs)
+            conn = sqlite3.connect(os.path.join(directory, "history.db"))
+            rows = conn.execute("SELECT COUNT(*), COUNT(DISTINCT job_id) FROM applications").fetchone()
+            conn.close()
+            self.assertEqual(rows, (total_jobs, total_jobs))
+
+if __name__ == '__main__':
+    unittest.main()
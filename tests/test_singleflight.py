@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import singleflight
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from linkedin_gateway import LinkedInGateway
+from singleflight import SingleFlight, SingleFlightTimeout
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+    start = threading.Barrier(count)
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {"value": 42}
+
+        results, errors = run_concurrently(8, lambda: flight.do("k", fetch))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.stats()["coalesced"], 7)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_propagate_to_all_callers(self):
+        flight = SingleFlight()
+
+        def fail():
+            time.sleep(0.05)
+            raise ConnectionError("upstream down")
+
+        _, errors = run_concurrently(4, lambda: flight.do("k", fail))
+        self.assertTrue(all(isinstance(error, ConnectionError) for error in errors))
+        self.assertEqual(flight.stats()["executed"], 1)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("k", lambda: 1), 1)
+        self.assertEqual(flight.do("k", lambda: 2), 2)
+        self.assertEqual(flight.stats()["coalesced"], 0)
+
+    def test_follower_timeout(self):
+        flight = SingleFlight(timeout=0.01)
+        release = threading.Event()
+        leader = threading.Thread(target=flight.do, args=("k", release.wait))
+        leader.start()
+        while not flight.in_flight():
+            time.sleep(0.001)
+        with self.assertRaises(SingleFlightTimeout):
+            flight.do("k", lambda: None)
+        release.set()
+        leader.join()
+
+class TestServerCoalescing(unittest.TestCase):
+    def setUp(self):
+        server.app.testing = True
+        self.client = server.app.test_client()
+        server.linkedin_client = LinkedInGateway.from_clients([MagicMock() for _ in range(8)], burst=100)
+        server.upstream_flight = SingleFlight(timeout=5)
+        server.search_cache.clear()
+        server.job_cache.clear()
+
+    def test_concurrent_job_details_share_upstream_call(self):
+        server.job_cache.put({"job_id": "sf1", "title": "SRE", "company": "Acme"})
+        upstream = server._job_details_upstream
+
+        def slow_details(client, job_id):
+            time.sleep(0.05)
+            return upstream(client, job_id)
+
+        with patch('server._job_details_upstream', slow_details):
+            results, _ = run_concurrently(6, lambda: server.get_job_details({"job_id": "sf1"}))
+        self.assertTrue(all(result["status"] == "success" for result in results))
+        self.assertEqual(server.linkedin_client.metrics()["calls"], 1)
+        self.assertEqual(server.upstream_flight.stats()["coalesced"], 5)
+
+    def test_concurrent_searches_share_upstream_call(self):
+        def slow_search(client, parameters):
+            time.sleep(0.05)
+            return [{"job_id": "sf2", "title": "Coalesced Engineer", "company": "Acme"}]
+
+        with patch('server._search_upstream', slow_search):
+            results, _ = run_concurrently(
+                6, lambda: server.search_jobs({"title": "Coalesced Engineer", "location": None}))
+        self.assertTrue(all(result["count"] == 1 for result in results))
+        self.assertEqual(server.linkedin_client.metrics()["calls"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+import json
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent directory to path to import warmup
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import server
+from config_store import ConfigSnapshot
+from job_cache import JobCache
+from warmup import COLD, FAILED, READY, WarmUp
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous bound on import + startup() + the first /mcp/v1/tools request in a
+# fresh interpreter; lazy startup takes well under a second
+STARTUP_BUDGET_SECONDS = 3.0
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {repo!r})
+import server
+server.startup()
+client = server.app.test_client()
+tools = client.get("/mcp/v1/tools")
+seconds = time.perf_counter() - start
+ready = client.get("/mcp/v1/ready")
+print(json.dumps({{
+    "seconds": seconds,
+    "tools": tools.status_code,
+    "ready": [ready.status_code, ready.get_json()],
+    "loaded": [name for name in ("linkedin_api", "numpy", "selenium") if name in sys.modules],
+}}))
+"""
+
+CONFIG = """
+linkedin:
+  username: user@example.com
+  password: secret
+prefetch:
+  enabled: false
+config_reload:
+  enabled: false
+"""
+
+class FakeLinkedin:
+    created = 0
+
+    def __init__(self, username, password, **kwargs):
+        FakeLinkedin.created += 1
+        self.client = MagicMock()
+
+class TestWarmUp(unittest.TestCase):
+    def test_concurrent_callers_share_one_initialization(self):
+        calls = []
+        release = threading.Event()
+
+        def initialize():
+            calls.append(1)
+            release.wait(5)
+            return True
+
+        warm_up = WarmUp()
+        warm_up.register("slow", initialize)
+        threads = [threading.Thread(target=warm_up.ensure, args=("slow",)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(warm_up.ensure("slow"))
+        self.assertEqual(warm_up.status()["slow"]["state"], READY)
+
+    def test_failures_are_retried_after_the_interval(self):
+        now = [0.0]
+        outcomes = [RuntimeError("login failed"), False, True]
+
+        def initialize():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        warm_up = WarmUp(retry_interval=30, clock=lambda: now[0])
+        warm_up.register("linkedin", initialize)
+        self.assertFalse(warm_up.ensure("linkedin"))
+        self.assertEqual(warm_up.status()["linkedin"], {"state": FAILED, "seconds": 0.0, "error": "login failed"})
+        self.assertFalse(warm_up.ensure("linkedin"))
+        self.assertEqual(len(outcomes), 2)
+        now[0] = 31.0
+        self.assertFalse(warm_up.ensure("linkedin"))
+        now[0] = 62.0
+        self.assertTrue(warm_up.ensure("linkedin"))
+        warm_up.reset("linkedin")
+        self.assertEqual(warm_up.status()["linkedin"], {"state": COLD})
+
+    def test_background(self):
+        warm_up = WarmUp()
+        warm_up.register("a", lambda: True)
+        warm_up.register("b", lambda: True)
+        warm_up.start_background(["a"]).join(5)
+        self.assertTrue(warm_up.is_ready(["a"]))
+        self.assertFalse(warm_up.is_ready(["a", "b"]))
+
+class TestLazyStartup(unittest.TestCase):
+    def setUp(self):
+        FakeLinkedin.created = 0
+        self.warm_up = WarmUp()
+        self.warm_up.register("linkedin", server.initialize_linkedin)
+        self.warm_up.register("ranking", server.build_ranking_index)
+        self.warm_up.register("dedup", server.build_duplicate_index)
+        self.patches = [
+            patch("server.warm_up", self.warm_up),
+            patch("server.server_started", threading.Event()),
+            patch("server.linkedin_client", None),
+            patch("server.upstream_flight", server.upstream_flight),
+            patch("server.job_cache", JobCache()),
+            patch("server.ranking_index", None),
+            patch("server.duplicate_index", None),
+            patch("server.Linkedin", FakeLinkedin),
+            patch("server.config", ConfigSnapshot({"linkedin": {"username": "u", "password": "p"},
+                                                   "session_cache": {"enabled": False}})),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = server.app.test_client()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_linkedin_client_is_created_on_first_use(self):
+        server.initialize_warm_up()
+        self.assertEqual(FakeLinkedin.created, 0)
+        with patch("server._fetch_search_results", return_value=[]):
+            _, status = server.dispatch_tool("search_jobs", {"title": "DevOps"})
+            self.assertEqual(status, 200)
+            server.dispatch_tool("search_jobs", {"title": "SRE"})
+        self.assertEqual(FakeLinkedin.created, 1)
+        self.assertEqual(self.warm_up.status()["linkedin"]["state"], READY)
+
+    def test_ranking_index_is_built_on_first_use(self):
+        payload, status = server.dispatch_tool("rank_jobs", {})
+        self.assertEqual(status, 200)
+        self.assertIsNotNone(server.ranking_index)
+        self.assertEqual(FakeLinkedin.created, 0)
+
+    def test_eager_warm_up(self):
+        with patch("server.config", ConfigSnapshot({"linkedin": {"username": "u", "password": "p"},
+                                                    "session_cache": {"enabled": False},
+                                                    "startup": {"warm_up": "eager"}})):
+            server.initialize_warm_up()
+        self.assertEqual(FakeLinkedin.created, 1)
+        self.assertIsNotNone(server.ranking_index)
+        self.assertIsNotNone(server.duplicate_index)
+
+    def test_readiness(self):
+        response = self.client.get('/mcp/v1/ready')
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.get_json()["started"])
+
+        server.server_started.set()
+        response = self.client.get('/mcp/v1/ready')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["components"]["linkedin"], {"state": COLD})
+        self.assertEqual(self.client.get('/mcp/v1/ready?require=linkedin').status_code, 503)
+        self.assertEqual(self.client.get('/mcp/v1/ready?require=browser').status_code, 400)
+
+        server.require_linkedin()
+        self.assertEqual(self.client.get('/mcp/v1/ready?require=linkedin').status_code, 200)
+
+class TestColdStart(unittest.TestCase):
+    def test_tools_are_served_without_heavy_imports(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "config.yaml"), "w") as file:
+                file.write(CONFIG)
+            result = subprocess.run([sys.executable, "-c", COLD_START.format(repo=REPO)], cwd=directory,
+                                    capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        outcome = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(outcome["tools"], 200)
+        status, ready = outcome["ready"]
+        self.assertEqual(status, 200)
+        self.assertEqual(ready["components"]["linkedin"], {"state": COLD})
+        self.assertEqual(outcome["loaded"], [])
+        self.assertLess(outcome["seconds"], STARTUP_BUDGET_SECONDS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Warm-up
+Tracks the components the server creates on first use instead of at
+startup, such as the LinkedIn client and the NumPy-backed indexes, so the
+server can start serving immediately and report in readiness probes what is
+still warming up. Components can also be warmed in a background thread.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+COLD = "cold"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+DEFAULT_RETRY_INTERVAL = 30.0
+
+
+class _Component:
+    __slots__ = ("initialize", "state", "error", "seconds", "failed_at", "lock")
+
+    def __init__(self, initialize):
+        self.initialize = initialize
+        self.state = COLD
+        self.error = None
+        self.seconds = None
+        self.failed_at = None
+        self.lock = threading.Lock()
+
+
+class WarmUp:
+    """
+    Thread-safe registry of lazily initialized components.
+
+    Each component is initialized at most once at a time: concurrent callers
+    of ensure() wait for the initialization in progress instead of starting
+    another. A failed component is retried on use, but at most once every
+    retry_interval seconds.
+    """
+
+    def __init__(self, retry_interval=DEFAULT_RETRY_INTERVAL, clock=time.monotonic):
+        self.retry_interval = retry_interval
+        self._clock = clock
+        self._components = {}
+
+    def register(self, name, initialize):
+        """Register initialize(), which returns a truthy value once the component is usable"""
+        self._components[name] = _Component(initialize)
+
+    def ensure(self, name):
+        """Initialize a component unless it is ready; return True if it is ready"""
+        component = self._components[name]
+        if component.state == READY:
+            return True
+        with component.lock:
+            if component.state == READY:
+                return True
+            if component.state == FAILED and self._clock() - component.failed_at < self.retry_interval:
+                return False
+            component.state = WARMING
+            start = self._clock()
+            try:
+                ready = component.initialize()
+                error = None if ready else "initialization failed"
+            except Exception as e:
+                ready, error = False, str(e)
+            component.seconds = round(self._clock() - start, 3)
+            component.state = READY if ready else FAILED
+            component.error = error
+            if not ready:
+                component.failed_at = self._clock()
+                logger.error(f"Warm-up of {name} failed: {error}")
+            return bool(ready)
+
+    def reset(self, name):
+        """Mark a component cold, so that its next use initializes it again"""
+        component = self._components[name]
+        with component.lock:
+            component.state = COLD
+            component.error = component.seconds = component.failed_at = None
+
+    def start_background(self, names=None):
+        """Warm the named components, or all of them, one after another in a daemon thread"""
+        names = list(names if names is not None else self._components)
+
+        def run():
+            for name in names:
+                self.ensure(name)
+
+        thread = threading.Thread(target=run, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def is_ready(self, names):
+        """Return True if every named component is ready"""
+        return all(self._components[name].state == READY for name in names)
+
+    def status(self):
+        """Return the state of every component, with its warm-up time or last error"""
+        result = {}
+        for name, component in self._components.items():
+            entry = {"state": component.state}
+            if component.seconds is not None:
+                entry["seconds"] = component.seconds
+            if component.error is not None:
+                entry["error"] = component.error
+            result[name] = entry
+        return result
@@ -0,0 +1,10 @@
+"""
+WSGI Entry Point
+Runs startup() once per worker process and exposes the Flask app, for WSGI
+servers that import the application, e.g. gunicorn -w 4 wsgi:app.
+"""
+
+import server
+
+server.startup()
+app = server.app